@@ -3,17 +3,22 @@ REST API for Schedule Management System
 Using Flask to provide HTTP endpoints for the scheduling system
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from datetime import datetime, time
 from typing import Dict, Any, Tuple
+import atexit
 import json
 import logging
+import os
 from schedule_system import (
     SchedulingService, Room, Schedule, TimeSlot, DayOfWeek, 
     ConflictDetectionEngine, SchedulingSuggestionEngine, DashboardService,
-    StudentObserver, LecturerObserver, AdminObserver, EventType
+    StudentObserver, LecturerObserver, AdminObserver, EventType, BulkResult, AsyncDispatcher
 )
+from schedule_persistence import DurableStore, EventLog
+from notification_channels import EmailChannel, SMSChannel, PushChannel
+from event_stream import EventBroadcaster
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -26,14 +31,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize service
-service = SchedulingService()
+# Optional delivery channels besides the log: SCHEDULE_SMTP_HOST (+ _PORT,
+# _SENDER, SCHEDULE_EMAIL_RATE messages/sec), SCHEDULE_SMS_GATEWAY and
+# SCHEDULE_PUSH_GATEWAY (gateway URLs). Sending happens inside observers, so
+# channels always get background notification workers (see below).
+channels = []
+if os.environ.get('SCHEDULE_SMTP_HOST'):
+    channels.append(EmailChannel(os.environ['SCHEDULE_SMTP_HOST'],
+                                 int(os.environ.get('SCHEDULE_SMTP_PORT', '25')),
+                                 sender=os.environ.get('SCHEDULE_SMTP_SENDER', 'noreply@university.edu'),
+                                 rate=float(os.environ.get('SCHEDULE_EMAIL_RATE', '0')) or None))
+if os.environ.get('SCHEDULE_SMS_GATEWAY'):
+    channels.append(SMSChannel(os.environ['SCHEDULE_SMS_GATEWAY']))
+if os.environ.get('SCHEDULE_PUSH_GATEWAY'):
+    channels.append(PushChannel(os.environ['SCHEDULE_PUSH_GATEWAY']))
+for channel in channels:
+    atexit.register(channel.close)
+
+# Initialize service (shared by all request threads; it does its own locking)
+# Set SCHEDULE_NOTIFY_WORKERS to deliver notifications on background threads
+# (SCHEDULE_NOTIFY_POLICY = spill | drop_oldest | block when the queue is full;
+# block can deadlock with observers that read the service, so it is opt-in).
+# Channels must not send while a request holds the service's write lock, so
+# they get 2 workers when none are configured.
+notify_workers = int(os.environ.get('SCHEDULE_NOTIFY_WORKERS', '0'))
+if channels and notify_workers <= 0:
+    logger.warning("⚠️  Delivery channels configured without SCHEDULE_NOTIFY_WORKERS; "
+                   "using 2 background notification workers")
+    notify_workers = 2
+dispatcher = None
+if notify_workers > 0:
+    dispatcher = AsyncDispatcher(workers=notify_workers,
+                                 policy=os.environ.get('SCHEDULE_NOTIFY_POLICY', 'spill'))
+    atexit.register(dispatcher.close)
+service = SchedulingService(dispatcher=dispatcher)
 dashboard = DashboardService(service)
 
+# Optional persistence: set SCHEDULE_DATA_DIR to keep rooms and schedules
+# across restarts (SCHEDULE_WAL_SYNC_INTERVAL = seconds between fsyncs, 0 = every write)
+store = None
+if os.environ.get('SCHEDULE_DATA_DIR'):
+    store = DurableStore(os.environ['SCHEDULE_DATA_DIR'],
+                         sync_interval=float(os.environ.get('SCHEDULE_WAL_SYNC_INTERVAL', '0.05')))
+    store.open(service)
+    atexit.register(store.close)
+
+# Optional event log: set SCHEDULE_EVENT_LOG_DIR to keep every notification
+# event, so clients that were offline catch up with GET /api/events?offset=N.
+# Installed after recovery, which must not log the replayed changes again.
+event_log = None
+if os.environ.get('SCHEDULE_EVENT_LOG_DIR'):
+    event_log = EventLog(os.environ['SCHEDULE_EVENT_LOG_DIR']).open()
+    service.event_log = event_log
+    atexit.register(event_log.close)
+
 # Add default observers
-admin = AdminObserver("admin", "Administrator", "admin@university.edu")
+admin = AdminObserver("admin", "Administrator", "admin@university.edu", channels=channels)
 service.attach(admin)
 
+# Live feed for GET /api/events/stream (SCHEDULE_STREAM_QUEUE = events a client
+# may fall behind before it is dropped and has to reconnect with Last-Event-ID)
+broadcaster = EventBroadcaster(max_queue=int(os.environ.get('SCHEDULE_STREAM_QUEUE', '1000')))
+service.attach(broadcaster)
+service.event_source = broadcaster
+atexit.register(broadcaster.close)
+
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -75,6 +137,33 @@ def parse_day_string(day_str: str) -> DayOfWeek:
         raise ValueError(f"Invalid day. Use: {', '.join([d.name for d in DayOfWeek])}")
 
 
+def schedule_from_dict(data: Dict) -> Schedule:
+    """Build a Schedule from a request body, raises ValueError on bad input"""
+    required_fields = ['schedule_id', 'course_name', 'course_code',
+                       'lecturer_name', 'day', 'start_time', 'end_time',
+                       'room_id', 'num_students']
+    missing = [field for field in required_fields if field not in data]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    room = service.get_room(data['room_id'])
+    if not room:
+        raise ValueError(f"Room {data['room_id']} not found")
+
+    return Schedule(
+        schedule_id=data['schedule_id'],
+        course_name=data['course_name'],
+        course_code=data['course_code'],
+        lecturer_name=data['lecturer_name'],
+        day=parse_day_string(data['day']),
+        time_slot=TimeSlot(parse_time_string(data['start_time']),
+                           parse_time_string(data['end_time'])),
+        room=room,
+        num_students=int(data['num_students']),
+        krs_id=data.get('krs_id')
+    )
+
+
 def schedule_to_dict(schedule: Schedule) -> Dict:
     """Convert Schedule object to dictionary"""
     return {
@@ -84,8 +173,8 @@ def schedule_to_dict(schedule: Schedule) -> Dict:
         "lecturer_name": schedule.lecturer_name,
         "day": schedule.day.name,
         "time_slot": str(schedule.time_slot),
-        "start_time": schedule.time_slot.start_time.strftime("%H:%M"),
-        "end_time": schedule.time_slot.end_time.strftime("%H:%M"),
+        "start_time": schedule.time_slot.start_label,
+        "end_time": schedule.time_slot.end_label,
         "room_id": schedule.room.room_id,
         "room_name": schedule.room.room_name,
         "capacity": schedule.room.capacity,
@@ -168,13 +257,16 @@ def api_docs():
             },
             "Schedules": {
                 "POST /schedules": "Create a new schedule",
+                "POST /schedules/bulk": "Create many schedules in one request",
                 "GET /schedules": "List all schedules",
                 "GET /schedules/{schedule_id}": "Get schedule details",
                 "PUT /schedules/{schedule_id}": "Update schedule",
                 "DELETE /schedules/{schedule_id}": "Delete schedule",
                 "GET /schedules/lecturer/{lecturer_name}": "Get schedules by lecturer",
                 "GET /schedules/room/{room_id}": "Get schedules by room",
-                "GET /schedules/day/{day}": "Get schedules by day"
+                "GET /schedules/day/{day}": "Get schedules by day",
+                "GET /schedules/course/{course_code}": "Get schedules by course code",
+                "GET /schedules/krs/{krs_id}": "Get schedules by KRS"
             },
             "Conflicts": {
                 "GET /conflicts": "Get all conflicts",
@@ -308,15 +400,56 @@ def create_schedule():
         return error_response(f"Error creating schedule: {str(e)}", 500)
 
 
+@app.route('/api/schedules/bulk', methods=['POST'])
+def create_schedules_bulk():
+    """Create many schedules in one request with a single conflict pass"""
+    try:
+        data = request.get_json()
+        if not isinstance(data, list):
+            return error_response("Request body must be a list of schedules")
+
+        # Rows that cannot be parsed are reported alongside the service results
+        parsed, parse_errors = [], {}
+        for index, row in enumerate(data):
+            try:
+                parsed.append(schedule_from_dict(row))
+            except (ValueError, TypeError) as e:
+                parse_errors[index] = str(e)
+
+        results = iter(service.create_schedules_bulk(parsed))
+        rows = []
+        for index, row in enumerate(data):
+            if index in parse_errors:
+                schedule_id = row.get('schedule_id') if isinstance(row, dict) else None
+                rows.append(BulkResult(index, schedule_id, False, parse_errors[index]).to_dict())
+            else:
+                result = next(results).to_dict()
+                result['index'] = index
+                rows.append(result)
+
+        created = sum(1 for row in rows if row['success'])
+        return success_response(
+            rows, 201 if created else 400,
+            f"Created {created} of {len(rows)} schedules"
+        )
+
+    except Exception as e:
+        logger.error(f"Error creating schedules in bulk: {str(e)}")
+        return error_response(f"Error creating schedules: {str(e)}", 500)
+
+
 @app.route('/api/schedules', methods=['GET'])
 def list_schedules():
-    """List all schedules"""
+    """List all schedules (from the latest snapshot, never waits for writers)"""
     try:
-        schedules = service.list_schedules()
-        return success_response(
+        snapshot = service.snapshot()
+        schedules = snapshot.list_schedules()
+        response, status_code = success_response(
             [schedule_to_dict(schedule) for schedule in schedules],
             message=f"Retrieved {len(schedules)} schedules"
         )
+        response.headers['X-Schedule-Version'] = str(snapshot.version)
+        return response, status_code
     except Exception as e:
         logger.error(f"Error listing schedules: {str(e)}")
         return error_response(f"Error listing schedules: {str(e)}", 500)
@@ -341,36 +474,39 @@ def update_schedule(schedule_id):
     try:
         data = request.get_json()
         
-        # Get existing schedule
-        existing = service.get_schedule(schedule_id)
-        if not existing:
-            return error_response(f"Schedule {schedule_id} not found", 404)
-        
-        # Parse time and day if provided
-        start_time = parse_time_string(data.get('start_time', existing.time_slot.start_time.strftime("%H:%M")))
-        end_time = parse_time_string(data.get('end_time', existing.time_slot.end_time.strftime("%H:%M")))
-        day = parse_day_string(data.get('day', existing.day.name))
-        
-        # Get room if provided
-        room_id = data.get('room_id', existing.room.room_id)
-        room = service.get_room(room_id)
-        if not room:
-            return error_response(f"Room {room_id} not found", 404)
-        
-        # Create updated schedule
-        updated_schedule = Schedule(
-            schedule_id=schedule_id,
-            course_name=data.get('course_name', existing.course_name),
-            course_code=data.get('course_code', existing.course_code),
-            lecturer_name=data.get('lecturer_name', existing.lecturer_name),
-            day=day,
-            time_slot=TimeSlot(start_time, end_time),
-            room=room,
-            num_students=int(data.get('num_students', existing.num_students)),
-            krs_id=data.get('krs_id', existing.krs_id)
-        )
-        
-        service.update_schedule(schedule_id, updated_schedule)
+        # Hold the write lock from read to update so concurrent PUTs cannot
+        # overwrite each other's fields
+        with service.lock.write_locked():
+            # Get existing schedule
+            existing = service.get_schedule(schedule_id)
+            if not existing:
+                return error_response(f"Schedule {schedule_id} not found", 404)
+
+            # Parse time and day if provided
+            start_time = parse_time_string(data.get('start_time', existing.time_slot.start_label))
+            end_time = parse_time_string(data.get('end_time', existing.time_slot.end_label))
+            day = parse_day_string(data.get('day', existing.day.name))
+
+            # Get room if provided
+            room_id = data.get('room_id', existing.room.room_id)
+            room = service.get_room(room_id)
+            if not room:
+                return error_response(f"Room {room_id} not found", 404)
+
+            # Create updated schedule
+            updated_schedule = Schedule(
+                schedule_id=schedule_id,
+                course_name=data.get('course_name', existing.course_name),
+                course_code=data.get('course_code', existing.course_code),
+                lecturer_name=data.get('lecturer_name', existing.lecturer_name),
+                day=day,
+                time_slot=TimeSlot(start_time, end_time),
+                room=room,
+                num_students=int(data.get('num_students', existing.num_students)),
+                krs_id=data.get('krs_id', existing.krs_id)
+            )
+
+            service.update_schedule(schedule_id, updated_schedule)
         logger.info(f"Schedule updated: {schedule_id}")
         
         return success_response(schedule_to_dict(updated_schedule), message="Schedule updated successfully")
@@ -443,6 +579,34 @@ def get_schedules_by_day(day):
         return error_response(f"Error getting schedules: {str(e)}", 500)
 
 
+
+@app.route('/api/schedules/course/<course_code>', methods=['GET'])
+def get_schedules_by_course(course_code):
+    """Get schedules by course code"""
+    try:
+        schedules = service.get_schedules_by_course(course_code)
+        return success_response(
+            [schedule_to_dict(schedule) for schedule in schedules],
+            message=f"Retrieved {len(schedules)} schedules for course {course_code}"
+        )
+    except Exception as e:
+        logger.error(f"Error getting schedules by course: {str(e)}")
+        return error_response(f"Error getting schedules: {str(e)}", 500)
+
+
+@app.route('/api/schedules/krs/<krs_id>', methods=['GET'])
+def get_schedules_by_krs(krs_id):
+    """Get schedules by KRS"""
+    try:
+        schedules = service.get_schedules_by_krs(krs_id)
+        return success_response(
+            [schedule_to_dict(schedule) for schedule in schedules],
+            message=f"Retrieved {len(schedules)} schedules for KRS {krs_id}"
+        )
+    except Exception as e:
+        logger.error(f"Error getting schedules by KRS: {str(e)}")
+        return error_response(f"Error getting schedules: {str(e)}", 500)
+
 # ============================================================================
 # CONFLICT ENDPOINTS
 # ============================================================================
@@ -552,6 +716,8 @@ def get_suggestions():
 def dashboard_summary():
     """Get dashboard summary"""
     try:
+        # Read from one snapshot, whose event_id was recorded when it was
+        # published, so /api/events/stream?last_event_id=<event_id> misses nothing
         summary = dashboard.get_dashboard_summary()
         return success_response(summary, message="Dashboard summary retrieved")
     except Exception as e:
@@ -611,17 +777,26 @@ def attach_observer():
         observer_id = data.get('id', 'obs_1')
         name = data.get('name', 'Observer')
         email = data.get('email', 'observer@university.edu')
+        contacts = {'phone': data.get('phone'), 'device_token': data.get('device_token'),
+                    'channels': channels}
         
         if observer_type == 'student':
-            observer = StudentObserver(observer_id, name, email)
+            observer = StudentObserver(observer_id, name, email, **contacts)
         elif observer_type == 'lecturer':
-            observer = LecturerObserver(observer_id, name, email)
+            observer = LecturerObserver(observer_id, name, email, **contacts)
         elif observer_type == 'admin':
-            observer = AdminObserver(observer_id, name, email)
+            observer = AdminObserver(observer_id, name, email, **contacts)
         else:
             return error_response(f"Invalid observer type: {observer_type}", 400)
         
-        service.attach(observer)
+        if not service.attach(observer):
+            logger.info(f"Observer re-attached: {observer_type} - {observer_id}")
+            return success_response({
+                "type": observer_type,
+                "id": observer_id,
+                "name": name,
+                "email": email
+            }, 200, "Observer already attached, details updated")
         logger.info(f"Observer attached: {observer_type} - {observer_id}")
         
         return success_response({
@@ -636,6 +811,63 @@ def attach_observer():
         return error_response(f"Error attaching observer: {str(e)}", 500)
 
 
+# ============================================================================
+# EVENT LOG ENDPOINTS
+# ============================================================================
+
+@app.route('/api/events', methods=['GET'])
+def get_events():
+    """Read logged events from an offset: ?offset=0&limit=100&types=A,B"""
+    if event_log is None:
+        return error_response("Event log is not enabled (set SCHEDULE_EVENT_LOG_DIR)", 404)
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        types = request.args.get('types')
+        event_types = [EventType(name) for name in types.split(',')] if types else None
+        if offset < 0 or limit < 1:
+            raise ValueError("offset must be >= 0 and limit >= 1")
+    except ValueError as e:
+        return error_response(f"Invalid query: {str(e)}", 400)
+    try:
+        # next_offset is where this read stopped, not the live head, which
+        # may already include events appended while it ran
+        page, next_offset = event_log.read_page(offset, limit, event_types)
+        events = [{
+            "offset": event.offset,
+            "timestamp": datetime.fromtimestamp(event.timestamp).isoformat(),
+            "event_type": event.event_type.value,
+            "data": event.data
+        } for event in page]
+        return success_response({
+            "events": events,
+            "next_offset": next_offset,
+            "first_offset": event_log.first_offset
+        }, message=f"Retrieved {len(events)} events")
+    except Exception as e:
+        logger.error(f"Error reading events: {str(e)}")
+        return error_response(f"Error reading events: {str(e)}", 500)
+
+
+@app.route('/api/events/stream', methods=['GET'])
+def stream_events():
+    """Server-Sent Events feed: ?types=A,B&room_id=R101&lecturer=Dr.%20X&course_code=CS101"""
+    try:
+        types = request.args.get('types')
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        client = broadcaster.connect(
+            event_types=[EventType(name) for name in types.split(',')] if types else None,
+            lecturer=request.args.get('lecturer'),
+            room_id=request.args.get('room_id'),
+            course_code=request.args.get('course_code'),
+            last_event_id=last_event_id or None
+        )
+    except ValueError as e:
+        return error_response(f"Invalid query: {str(e)}", 400)
+    return Response(broadcaster.stream(client), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -676,6 +908,8 @@ if __name__ == '__main__':
     print("  Conflicts: GET /api/conflicts")
     print("  Dashboard: GET /api/dashboard/...")
     print("  Suggestions: POST /api/suggestions")
+    print("  Events:    GET /api/events?offset=N")
+    print("  Live:      GET /api/events/stream (Server-Sent Events)")
     print("\n" + "="*80 + "\n")
     
     # Run the Flask app
@@ -683,5 +917,6 @@ if __name__ == '__main__':
         host='0.0.0.0',
         port=5000,
         debug=True,
-        use_reloader=False
+        use_reloader=False,
+        threaded=True  # every open event stream holds a thread
     )
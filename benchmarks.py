@@ -0,0 +1,1133 @@
+"""
+PERFORMANCE BENCHMARKS
+Benchmark untuk engine deteksi bentrok dan SchedulingService
+
+Usage:
+    python benchmarks.py                # run all benchmarks
+    python benchmarks.py conflicts      # run a single benchmark
+"""
+
+import logging
+import os
+import random
+import re
+import selectors
+import shutil
+import smtplib
+import socket
+import sys
+import tempfile
+import threading
+import time as timer
+import tracemalloc
+from datetime import datetime, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+from schedule_system import (
+    AsyncDispatcher, ConflictDetectionEngine, DashboardService, DayOfWeek, DigestObserver, EventType, Observer,
+    Room, Schedule,
+    SchedulingService, StudentObserver, TimeSlot
+)
+from schedule_persistence import (
+    ColumnarSnapshot, DurableStore, EventLog, SQLiteScheduleRepository, write_columnar_snapshot
+)
+from event_stream import EventBroadcaster
+from notification_channels import (
+    EmailChannel, LocalHTTPGateway, LocalSMTPServer, PushChannel, SMSChannel
+)
+
+# Keep the notification and conflict logs out of the timings
+logging.disable(logging.WARNING)
+
+
+def print_header(title):
+    """Print formatted header"""
+    print(f"\n{'='*80}")
+    print(f"  {title}")
+    print(f"{'='*80}\n")
+
+
+def measure(func: Callable, repeat: int = 1) -> float:
+    """Return the best wall-clock time of func() in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        func()
+        best = min(best, timer.perf_counter() - started)
+    return best
+
+
+def generate_rooms(count: int) -> List[Room]:
+    """Generate rooms spread over a few buildings"""
+    return [Room(f"R{i:05d}", f"Ruang {i}", 40 + (i % 5) * 10, f"Building {i % 8}")
+            for i in range(count)]
+
+
+def generate_schedules(count: int, seed: int = 42, rooms: List[Room] = None) -> List[Schedule]:
+    """
+    Generate a realistic term: roughly one room per 12 sections and one
+    lecturer per 4 sections, 50-150 minute classes between 07:00 and 19:00.
+    """
+    rng = random.Random(seed)
+    rooms = rooms or generate_rooms(max(1, count // 12))
+    num_lecturers = max(1, count // 4)
+    days = list(DayOfWeek)[:6]
+    schedules = []
+    for i in range(count):
+        start = rng.randrange(7 * 60, 17 * 60, 10)
+        end = start + rng.choice([50, 100, 150])
+        room = rng.choice(rooms)
+        schedules.append(Schedule(
+            schedule_id=f"SCH{i:06d}",
+            course_name=f"Course {i % 900}",
+            course_code=f"CS{i % 900:03d}",
+            lecturer_name=f"Dr. Lecturer {rng.randrange(num_lecturers)}",
+            day=rng.choice(days),
+            time_slot=TimeSlot(time(start // 60, start % 60), time(end // 60, end % 60)),
+            room=room,
+            num_students=rng.randrange(10, room.capacity + 1)
+        ))
+    return schedules
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_conflict_detection() -> None:
+    """Sweep line vs the O(n²) pairwise loop"""
+    print_header("CONFLICT DETECTION: SWEEP LINE vs PAIRWISE")
+    engine = ConflictDetectionEngine()
+
+    print(f"{'Schedules':>10} {'Conflicts':>10} {'Pairwise (s)':>14} {'Sweep (s)':>12} {'Speedup':>9}")
+    for count in (1000, 2000, 5000):
+        schedules = generate_schedules(count)
+        conflicts = engine.detect_schedule_conflicts(schedules)
+        pairwise = measure(lambda: engine.detect_schedule_conflicts_pairwise(schedules))
+        sweep = measure(lambda: engine.detect_schedule_conflicts(schedules), repeat=3)
+        print(f"{count:>10} {len(conflicts):>10} {pairwise:>14.4f} {sweep:>12.4f} {pairwise / sweep:>8.1f}x")
+
+    for count in (20000, 100000):
+        schedules = generate_schedules(count)
+        sweep = measure(lambda: engine.detect_schedule_conflicts(schedules))
+        print(f"{count:>10} {'':>10} {'-':>14} {sweep:>12.4f}")
+
+
+def bench_vectorized_detection() -> None:
+    """NumPy vectorized strategy vs the pure Python sweep line"""
+    print_header("CONFLICT DETECTION: VECTORIZED (NUMPY) vs SWEEP LINE")
+    sweep_engine = ConflictDetectionEngine()
+    vector_engine = ConflictDetectionEngine(strategy="vectorized")
+    if vector_engine.strategy != "vectorized":
+        print("NumPy is not installed, skipping.")
+        return
+
+    print(f"{'Schedules':>10} {'Conflicts':>10} {'Sweep (s)':>12} {'Vectorized (s)':>16} {'Speedup':>9}")
+    for count in (10000, 50000, 200000):
+        schedules = generate_schedules(count)
+        conflicts = vector_engine.detect_conflicts(schedules)
+        sweep = measure(lambda: sweep_engine.detect_schedule_conflicts(schedules), repeat=2)
+        vector = measure(lambda: vector_engine.detect_conflicts(schedules), repeat=2)
+        print(f"{count:>10} {len(conflicts):>10} {sweep:>12.4f} {vector:>16.4f} {sweep / vector:>8.1f}x")
+
+
+def bench_parallel_detection() -> None:
+    """Process pool partitioned by day vs the in-process sweep line"""
+    print_header("CONFLICT DETECTION: PARALLEL (PER DAY) vs SWEEP LINE")
+    sweep_engine = ConflictDetectionEngine()
+
+    with ConflictDetectionEngine(strategy="parallel") as parallel_engine:
+        # Warm up the worker processes so pool start-up is not timed
+        parallel_engine.detect_conflicts(generate_schedules(100))
+
+        print(f"{'Schedules':>10} {'Sweep (s)':>12} {'Parallel (s)':>14} {'Speedup':>9}")
+        for count in (20000, 100000, 300000):
+            schedules = generate_schedules(count)
+            sweep = measure(lambda: sweep_engine.detect_schedule_conflicts(schedules))
+            parallel = measure(lambda: parallel_engine.detect_conflicts(schedules))
+            print(f"{count:>10} {sweep:>12.4f} {parallel:>14.4f} {sweep / parallel:>8.2f}x")
+
+        print("\nPer-partition sweep time of the last parallel run:")
+        for day, elapsed in parallel_engine.last_partition_timings.items():
+            print(f"  {day:<10} {elapsed:.4f}s")
+
+        # Wall time of executor.map vs the work it distributed: the gap is
+        # pickling rows out and pairs back plus worker scheduling
+        print(f"\n{'Schedules':>10} {'Worker sum (s)':>15} {'Sweep wall (s)':>15} "
+              f"{'Parallel wall (s)':>18} {'Overhead (s)':>13}")
+        for count in (20000, 100000, 300000):
+            schedules = generate_schedules(count)
+            sweep_engine.detect_conflicts(schedules)
+            parallel_engine.detect_conflicts(schedules)
+            worker_sum = sum(parallel_engine.last_partition_timings.values())
+            wall = parallel_engine.last_partition_wall_time
+            print(f"{count:>10} {worker_sum:>15.4f} {sweep_engine.last_partition_wall_time:>15.4f} "
+                  f"{wall:>18.4f} {wall - worker_sum:>13.4f}")
+
+
+def bench_lazy_iteration() -> None:
+    """First-N / any-conflict queries through iter_conflicts vs a full list"""
+    print_header("CONFLICT DETECTION: LAZY iter_conflicts vs FULL LIST")
+    engine = ConflictDetectionEngine()
+    schedules = generate_schedules(100000)
+    room_id = schedules[0].room.room_id
+
+    full = measure(lambda: engine.detect_schedule_conflicts(schedules))
+    first_20 = measure(lambda: list(engine.iter_conflicts(schedules, limit=20)))
+    any_room = measure(lambda: next(engine.iter_conflicts(
+        schedules, room_id=room_id, day=DayOfWeek.MONDAY), None))
+    print(f"{'100000 schedules, full detect_schedule_conflicts:':<52} {full:.4f}s")
+    print(f"{'first 20 conflicts:':<52} {first_20:.4f}s")
+    print(f"{f'any conflict in {room_id} on MONDAY:':<52} {any_room:.4f}s")
+
+
+def bench_time_encoding() -> None:
+    """Integer minute comparisons vs datetime.time, cached labels vs strftime"""
+    print_header("TIMESLOT: INTEGER MINUTES vs datetime.time")
+    slots = [s.time_slot for s in generate_schedules(2000)]
+    pairs = list(zip(slots, slots[1:] + slots[:1])) * 50
+
+    def time_compare():
+        for a, b in pairs:
+            a.start_time < b.end_time and b.start_time < a.end_time
+
+    def minute_compare():
+        for a, b in pairs:
+            a.start_minute < b.end_minute and b.start_minute < a.end_minute
+
+    def overlaps():
+        for a, b in pairs:
+            a.overlaps_with(b)
+
+    def strftime_labels():
+        for slot in slots * 50:
+            f"{slot.start_time.strftime('%H:%M')}-{slot.end_time.strftime('%H:%M')}"
+
+    def cached_labels():
+        for slot in slots * 50:
+            str(slot)
+
+    count = len(pairs)
+    results = [
+        ("datetime.time comparison", measure(time_compare, 3)),
+        ("integer minute comparison", measure(minute_compare, 3)),
+        ("TimeSlot.overlaps_with", measure(overlaps, 3)),
+        ("strftime label", measure(strftime_labels, 3)),
+        ("cached TimeSlot label", measure(cached_labels, 3)),
+    ]
+    for label, elapsed in results:
+        print(f"{label + ':':<30} {elapsed / count * 1e9:>8.1f} ns/op")
+
+    sweep = ConflictDetectionEngine()
+    schedules = generate_schedules(100000)
+    by_time = measure(lambda: sorted(schedules, key=lambda s: (s.day.value, s.time_slot.start_time)))
+    by_minute = measure(lambda: sorted(schedules, key=lambda s: s.minute_of_week))
+    print(f"\nsort 100k schedules by (day, start_time): {by_time:.4f}s, by minute_of_week: {by_minute:.4f}s")
+    print(f"sweep line over 100k schedules: {measure(lambda: sweep.detect_schedule_conflicts(schedules)):.4f}s")
+
+
+def load_service(schedules: List[Schedule]) -> SchedulingService:
+    """Build a service by creating the schedules one at a time"""
+    service = SchedulingService()
+    for room in {schedule.room.room_id: schedule.room for schedule in schedules}.values():
+        service.add_room(room)
+    for schedule in schedules:
+        service.create_schedule(schedule)
+    return service
+
+
+def bench_service_load() -> None:
+    """Row-by-row create_schedule with incremental conflict maintenance"""
+    print_header("SCHEDULING SERVICE: ROW-BY-ROW LOAD")
+
+    print(f"{'Schedules':>10} {'Conflicts':>10} {'Load (s)':>10} {'Per row (us)':>14}")
+    for count in (1000, 5000, 10000):
+        schedules = generate_schedules(count)
+        started = timer.perf_counter()
+        service = load_service(schedules)
+        elapsed = timer.perf_counter() - started
+        print(f"{count:>10} {len(service.get_conflicts()):>10} {elapsed:>10.3f} "
+              f"{elapsed / count * 1e6:>14.1f}")
+
+
+def bench_occupancy() -> None:
+    """Bitmap availability checks and their memory footprint"""
+    print_header("OCCUPANCY BITMAPS: AVAILABILITY CHECKS & MEMORY")
+    rooms = generate_rooms(1000)
+    service = load_service(generate_schedules(12000, rooms=rooms))
+    rng = random.Random(1)
+    queries = []
+    for _ in range(20000):
+        start = rng.randrange(7 * 12, 18 * 12) * 5
+        queries.append((rng.choice(rooms).room_id, rng.choice(list(DayOfWeek)[:6]),
+                        time(start // 60, start % 60), time(start // 60 + 2, start % 60)))
+
+    def bitmap_checks():
+        for room_id, day, start, end in queries:
+            service.is_room_free(room_id, day, start, end)
+
+    def index_checks():
+        for room_id, day, start, end in queries:
+            service.find_overlapping_schedules(day, start, end, room_id=room_id)
+
+    def linear_checks():
+        for room_id, day, start, end in queries[:2000]:
+            slot = TimeSlot(start, end)
+            any(s.room.room_id == room_id and s.day == day and s.time_slot.overlaps_with(slot)
+                for s in service.schedules.values())
+
+    bitmap = measure(bitmap_checks) / len(queries)
+    index = measure(index_checks) / len(queries)
+    linear = measure(linear_checks) / 2000
+    print(f"1000 rooms, 12000 schedules, 5-minute slots")
+    print(f"{'is_room_free (bitmap AND):':<40} {bitmap * 1e6:>8.2f} us/query")
+    print(f"{'find_overlapping_schedules (index):':<40} {index * 1e6:>8.2f} us/query")
+    print(f"{'linear scan of all schedules:':<40} {linear * 1e6:>8.2f} us/query")
+    print(f"{'room bitmaps per 1000 rooms:':<40} {service.room_occupancy.memory_bytes() / 1024:>8.1f} KiB")
+    lecturers = len(service.lecturer_occupancy)
+    print(f"{f'lecturer bitmaps ({lecturers} lecturers):':<40} "
+          f"{service.lecturer_occupancy.memory_bytes() / 1024:>8.1f} KiB")
+
+
+def bench_secondary_indexes() -> None:
+    """get_schedules_by_* through the hash indexes vs a linear scan"""
+    print_header("SECONDARY INDEXES: LOOKUPS BY LECTURER / ROOM / DAY / COURSE")
+    schedules = generate_schedules(20000)
+    service = load_service(schedules)
+    rng = random.Random(3)
+    sample = [rng.choice(schedules) for _ in range(2000)]
+    everything = list(service.schedules.values())
+
+    lookups = {
+        'lecturer': (lambda s: service.get_schedules_by_lecturer(s.lecturer_name),
+                     lambda s: [x for x in everything if x.lecturer_name.lower() == s.lecturer_name.lower()]),
+        'room': (lambda s: service.get_schedules_by_room(s.room.room_id),
+                 lambda s: [x for x in everything if x.room.room_id == s.room.room_id]),
+        'day': (lambda s: service.get_schedules_by_day(s.day),
+                lambda s: [x for x in everything if x.day == s.day]),
+        'course_code': (lambda s: service.get_schedules_by_course(s.course_code),
+                        lambda s: [x for x in everything if x.course_code == s.course_code]),
+    }
+    print(f"20000 schedules, {len(sample)} lookups per key")
+    print(f"{'Key':<12} {'Index (us)':>12} {'Scan (us)':>12} {'Speedup':>9}")
+    for name, (indexed, scan) in lookups.items():
+        index_time = measure(lambda: [indexed(s) for s in sample]) / len(sample)
+        scan_time = measure(lambda: [scan(s) for s in sample[:200]]) / 200
+        print(f"{name:<12} {index_time * 1e6:>12.2f} {scan_time * 1e6:>12.2f} "
+              f"{scan_time / index_time:>8.0f}x")
+
+
+class CountingObserver(Observer):
+    """Observer that only counts deliveries"""
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, event_type: EventType, data: Dict) -> None:
+        self.count += 1
+
+
+def bench_bulk_load() -> None:
+    """create_schedules_bulk vs the row-by-row create_schedule loop"""
+    print_header("BULK IMPORT: create_schedules_bulk vs ROW-BY-ROW")
+    count = 10000
+    schedules = generate_schedules(count)
+    rooms = {schedule.room.room_id: schedule.room for schedule in schedules}.values()
+
+    def run(bulk: bool):
+        service = SchedulingService()
+        observer = CountingObserver()
+        service.attach(observer)
+        for room in rooms:
+            service.add_room(room)
+        started = timer.perf_counter()
+        if bulk:
+            service.create_schedules_bulk(schedules)
+        else:
+            for schedule in schedules:
+                service.create_schedule(schedule)
+        return timer.perf_counter() - started, observer.count, len(service.get_conflicts())
+
+    print(f"{count} schedules, 1 observer attached")
+    print(f"{'Path':<14} {'Load (s)':>10} {'Events':>8} {'Conflicts':>10}")
+    row_time, row_events, row_conflicts = run(bulk=False)
+    bulk_time, bulk_events, bulk_conflicts = run(bulk=True)
+    print(f"{'row-by-row':<14} {row_time:>10.3f} {row_events:>8} {row_conflicts:>10}")
+    print(f"{'bulk':<14} {bulk_time:>10.3f} {bulk_events:>8} {bulk_conflicts:>10}")
+    print(f"Speedup: {row_time / bulk_time:.1f}x")
+
+
+def bench_batch_moves() -> None:
+    """Moving a block of classes inside service.batch() vs one update at a time"""
+    print_header("BATCHED MUTATIONS: MOVE A BLOCK OF CLASSES")
+    schedules = generate_schedules(10000)
+    print(f"10000 schedules, 1 observer attached")
+    print(f"{'Moved':>8} {'One by one (s)':>15} {'Events':>8} {'Batch (s)':>10} {'Events':>8}")
+    for moved in (100, 1000, 5000):
+        timings = []
+        for batched in (False, True):
+            service = SchedulingService()
+            for room in {schedule.room.room_id: schedule.room for schedule in schedules}.values():
+                service.add_room(room)
+            service.create_schedules_bulk(schedules)
+            observer = CountingObserver()
+            service.attach(observer)
+            updates = [Schedule(s.schedule_id, s.course_name, s.course_code, s.lecturer_name,
+                                DayOfWeek.SATURDAY, s.time_slot, s.room, s.num_students)
+                       for s in schedules[:moved]]
+
+            def move():
+                for schedule in updates:
+                    service.update_schedule(schedule.schedule_id, schedule)
+
+            if batched:
+                def move_batched():
+                    with service.batch():
+                        move()
+                timings.append((measure(move_batched), observer.count))
+            else:
+                timings.append((measure(move), observer.count))
+        (single, single_events), (batch, batch_events) = timings
+        print(f"{moved:>8} {single:>15.3f} {single_events:>8} {batch:>10.3f} {batch_events:>8}")
+
+
+def bench_snapshot_reads() -> None:
+    """Reader latency under a write-heavy stream: locked reads vs snapshots"""
+    print_header("SNAPSHOT READS UNDER CONCURRENT WRITES")
+    schedules = generate_schedules(10000)
+    service = load_service(schedules[:9000])
+    print(f"9000 schedules, one writer thread doing create/delete batches of 50")
+
+    def writer(stop: threading.Event):
+        rng = random.Random(5)
+        while not stop.is_set():
+            chunk = rng.sample(schedules[9000:], 50)
+            with service.batch():
+                for schedule in chunk:
+                    service.create_schedule(schedule)
+            with service.batch():
+                for schedule in chunk:
+                    service.delete_schedule(schedule.schedule_id)
+
+    def snapshot_read():
+        snapshot = service.snapshot()
+        snapshot.list_schedules()
+        return snapshot.version
+
+    print(f"{'Read path':<28} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'versions':>9}")
+    for name, read in (('lock: list_schedules()', lambda: (service.list_schedules(), None)[1]),
+                       ('snapshot().list_schedules()', lambda: snapshot_read())):
+        stop = threading.Event()
+        thread = threading.Thread(target=writer, args=(stop,))
+        thread.start()
+        latencies, versions = [], set()
+        try:
+            for _ in range(300):
+                started = timer.perf_counter()
+                versions.add(read())
+                latencies.append(timer.perf_counter() - started)
+        finally:
+            stop.set()
+            thread.join()
+        latencies.sort()
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        seen = len(versions - {None}) or '-'
+        print(f"{name:<28} {p50 * 1e3:>9.3f} {p99 * 1e3:>9.3f} {latencies[-1] * 1e3:>9.3f} "
+              f"{seen:>9}")
+
+    # Every commit publishes its snapshot before releasing the write lock;
+    # copy-on-write blocks keep that cost flat as the store grows
+    print(f"\n{'Schedules':>10} {'create + snapshot lookup (us)':>31}")
+    for count in (10000, 50000):
+        rows = generate_schedules(count + 500)
+        bulk_service = SchedulingService()
+        for room in {schedule.room.room_id: schedule.room for schedule in rows}.values():
+            bulk_service.add_room(room)
+        bulk_service.create_schedules_bulk(rows[:count])
+        # Build the per-block room indexes once; later snapshots carry them over
+        bulk_service.snapshot().get_schedules_by_room(rows[0].room.room_id)
+
+        def commit_and_read():
+            for schedule in rows[count:]:
+                bulk_service.create_schedule(schedule)
+                bulk_service.snapshot().get_schedules_by_room(schedule.room.room_id)
+
+        elapsed = measure(commit_and_read)
+        print(f"{count:>10} {elapsed / 500 * 1e6:>31.1f}")
+
+
+def generate_archive_rows(count: int, rooms: List[Room]) -> List[Schedule]:
+    """
+    Build schedules the way a loader parsing an archive would: every row gets
+    its own strings, TimeSlot and timestamps, rooms are looked up by id.
+    """
+    rng = random.Random(11)
+    num_lecturers = max(1, count // 40)
+    rows = []
+    for i in range(count):
+        start = rng.randrange(7 * 60, 17 * 60, 10)
+        end = start + rng.choice([50, 100, 150])
+        course = i % 900
+        rows.append(Schedule(
+            schedule_id=f"SCH{i:07d}",
+            course_name=f"Course {course}",
+            course_code=f"CS{course:03d}",
+            lecturer_name=f"Dr. Lecturer {rng.randrange(num_lecturers)}",
+            day=DayOfWeek(rng.randrange(6)),
+            time_slot=TimeSlot(time(start // 60, start % 60), time(end // 60, end % 60)),
+            room=rooms[rng.randrange(len(rooms))],
+            num_students=rng.randrange(10, 40),
+            created_at=datetime.now(),
+        ))
+    return rows
+
+
+def bench_memory() -> None:
+    """tracemalloc bytes per schedule for an archive-sized load"""
+    print_header("MEMORY: BYTES PER SCHEDULE (tracemalloc)")
+    rooms = generate_rooms(2000)
+    print(f"{'Rows':>10} {'Total (MiB)':>12} {'Bytes/row':>10}")
+    for count in (100_000, 1_000_000):
+        tracemalloc.start()
+        rows = generate_archive_rows(count, rooms)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{count:>10} {current / 2**20:>12.1f} {current / count:>10.0f}")
+        del rows
+
+
+def bench_recovery() -> None:
+    """Write-ahead log cost per write and recovery time at 100k schedules"""
+    print_header("PERSISTENCE: WAL WRITES AND RECOVERY")
+    directory = tempfile.mkdtemp(prefix='schedule-wal-')
+    try:
+        def open_store(sync_interval: float = 0.05):
+            service = SchedulingService()
+            store = DurableStore(directory, sync_interval=sync_interval, checkpoint_every=None)
+            stats = store.open(service)
+            return service, store, stats
+
+        def disk_usage() -> float:
+            return sum(os.path.getsize(os.path.join(directory, name))
+                       for name in os.listdir(directory)) / 2**20
+
+        # Single writes: no journal vs batched fsync vs fsync per write
+        writes = generate_schedules(2000, seed=5)
+        rooms = {schedule.room.room_id: schedule.room for schedule in writes}.values()
+        print(f"{'Journal':<22} {'us/create':>10} {'fsyncs':>8}")
+        for label, sync_interval in (('none', None), ('sync_interval=0.05', 0.05),
+                                     ('sync_interval=0', 0.0)):
+            shutil.rmtree(directory, ignore_errors=True)
+            service = SchedulingService()
+            store = None
+            if sync_interval is not None:
+                service, store, _ = open_store(sync_interval)
+            for room in rooms:
+                service.add_room(room)
+            started = timer.perf_counter()
+            for schedule in writes:
+                service.create_schedule(schedule)
+            elapsed = timer.perf_counter() - started
+            syncs = '-'
+            if store is not None:
+                store.close()
+                syncs = store.wal.syncs
+            print(f"{label:<22} {elapsed / len(writes) * 1e6:>10.1f} {syncs:>8}")
+
+        # Recovery of 100k schedules written in bulk chunks
+        count = 100_000
+        schedules = generate_schedules(count)
+        rooms = {schedule.room.room_id: schedule.room for schedule in schedules}.values()
+        shutil.rmtree(directory, ignore_errors=True)
+        service, store, _ = open_store()
+        for room in rooms:
+            service.add_room(room)
+        for start in range(0, count, 1000):
+            service.create_schedules_bulk(schedules[start:start + 1000])
+        store.close()
+        del service
+
+        print(f"\n{count} schedules")
+        print(f"{'Recover from':<26} {'Disk (MiB)':>10} {'Groups':>8} {'Recovery (s)':>13}")
+        service, store, stats = open_store()
+        print(f"{'log only':<26} {disk_usage():>10.1f} {stats['replayed_groups']:>8} "
+              f"{stats['seconds']:>13.2f}")
+        store.checkpoint()
+        store.close()
+
+        service, store, stats = open_store()
+        print(f"{'snapshot':<26} {disk_usage():>10.1f} {stats['replayed_groups']:>8} "
+              f"{stats['seconds']:>13.2f}")
+        rng = random.Random(3)
+        for schedule in rng.sample(list(service.schedules.values()), 10000):
+            moved = Schedule(schedule.schedule_id, schedule.course_name, schedule.course_code,
+                             schedule.lecturer_name, DayOfWeek.SATURDAY, schedule.time_slot,
+                             schedule.room, schedule.num_students)
+            service.update_schedule(schedule.schedule_id, moved)
+        store.close()
+        del service
+
+        service, store, stats = open_store()
+        print(f"{'snapshot + 10k updates':<26} {disk_usage():>10.1f} "
+              f"{stats['replayed_groups']:>8} {stats['seconds']:>13.2f}")
+        store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_sqlite() -> None:
+    """SQLite repository: SQL self-join conflicts vs the sweep line, cold start"""
+    print_header("SQLITE REPOSITORY: SQL CONFLICT DETECTION AND COLD START")
+    directory = tempfile.mkdtemp(prefix='schedule-sqlite-')
+    try:
+        print(f"{'Schedules':>10} {'Save (s)':>9} {'SQL (s)':>8} {'Sweep (s)':>10} "
+              f"{'Conflicts':>10} {'Cold open (s)':>14} {'Lookup (ms)':>12}")
+        for count in (10_000, 100_000):
+            path = os.path.join(directory, f'schedules-{count}.db')
+            schedules = generate_schedules(count)
+            rooms = {schedule.room.room_id: schedule.room for schedule in schedules}.values()
+            with SQLiteScheduleRepository(path) as repository:
+                for room in rooms:
+                    repository.add_room(room)
+                save_time = measure(lambda: repository.save_schedules(schedules))
+
+            sweep_time = measure(
+                lambda: ConflictDetectionEngine.detect_schedule_conflicts(schedules))
+            del schedules
+
+            started = timer.perf_counter()
+            repository = SQLiteScheduleRepository(path)
+            open_time = timer.perf_counter() - started
+            lookup_time = measure(lambda: repository.get_schedules_by_room('R00007'), repeat=20)
+            conflicts = []
+            sql_time = measure(lambda: conflicts.append(len(repository.detect_conflicts())))
+            repository.close()
+            print(f"{count:>10} {save_time:>9.2f} {sql_time:>8.2f} {sweep_time:>10.2f} "
+                  f"{conflicts[0]:>10} {open_time:>14.3f} {lookup_time * 1000:>12.2f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_columnar() -> None:
+    """Cold start: mmap columnar snapshot vs rebuilding the service from JSON"""
+    print_header("COLUMNAR SNAPSHOT: COLD START VS JSON REBUILD")
+    directory = tempfile.mkdtemp(prefix='schedule-columnar-')
+    try:
+        count = 100_000
+        service = SchedulingService()
+        store = DurableStore(directory, checkpoint_every=None)
+        store.open(service)
+        schedules = generate_schedules(count)
+        for room in {schedule.room.room_id: schedule.room for schedule in schedules}.values():
+            service.add_room(room)
+        service.create_schedules_bulk(schedules)
+        store.checkpoint()
+        store.close()
+        columnar_path = os.path.join(directory, 'schedules.col')
+        export_time = measure(lambda: write_columnar_snapshot(columnar_path, service.snapshot()))
+        del service, schedules, store
+
+        started = timer.perf_counter()
+        service = SchedulingService()
+        DurableStore(directory).open(service)
+        json_open = timer.perf_counter() - started
+        json_summary = measure(lambda: DashboardService(service).get_dashboard_summary())
+        json_conflicts = measure(lambda: service.get_conflicts())
+        json_size = os.path.getsize(os.path.join(directory, DurableStore.SNAPSHOT_FILE))
+        del service
+
+        started = timer.perf_counter()
+        columnar = ColumnarSnapshot(columnar_path)
+        columnar_open = timer.perf_counter() - started
+        columnar_summary = measure(columnar.get_dashboard_summary)
+        columnar_conflicts = measure(columnar.detect_conflicts)
+        columnar.close()
+        columnar_size = os.path.getsize(columnar_path)
+
+        print(f"{count} schedules, columnar export {export_time:.2f}s")
+        print(f"{'Format':<10} {'Size (MiB)':>11} {'Open (s)':>9} {'Summary (s)':>12} "
+              f"{'Conflicts (s)':>14} {'Total (s)':>10}")
+        for label, size, opened, summary, conflicts in (
+                ('JSON', json_size, json_open, json_summary, json_conflicts),
+                ('columnar', columnar_size, columnar_open, columnar_summary, columnar_conflicts)):
+            print(f"{label:<10} {size / 2**20:>11.1f} {opened:>9.4f} {summary:>12.3f} "
+                  f"{conflicts:>14.3f} {opened + summary:>10.2f}")
+        print("Total = open + dashboard summary. JSON rebuilds the service (indexes and "
+              "conflict detection)\nat open; the columnar file runs detection on demand.")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class SlowObserver(Observer):
+    """Observer that simulates a blocking delivery (e.g. an SMTP round trip)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.count = 0
+
+    def update(self, event_type: EventType, data: Dict) -> None:
+        timer.sleep(self.delay)
+        self.count += 1
+
+
+def bench_async_dispatch() -> None:
+    """Write latency with slow observers: inline notify vs AsyncDispatcher"""
+    print_header("OBSERVER DISPATCH: INLINE VS ASYNC WORKERS")
+    schedules = generate_schedules(300, seed=13)
+    rooms = {schedule.room.room_id: schedule.room for schedule in schedules}.values()
+    delay, num_observers = 0.002, 4
+    print(f"{len(schedules)} creates, {num_observers} observers sleeping {delay * 1000:.0f}ms each")
+    print(f"{'Mode':<28} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Writes (s)':>11} {'Drained (s)':>12}")
+
+    modes = [('inline', None)]
+    for workers, max_queue, policy in ((4, 10000, 'block'), (4, 50, 'block'),
+                                       (4, 50, 'drop_oldest'), (4, 50, 'spill')):
+        modes.append((f"{workers}w q={max_queue} {policy}",
+                      lambda w=workers, q=max_queue, p=policy: AsyncDispatcher(w, q, p)))
+    for label, make_dispatcher in modes:
+        dispatcher = make_dispatcher() if make_dispatcher else None
+        service = SchedulingService(dispatcher=dispatcher)
+        for _ in range(num_observers):
+            service.attach(SlowObserver(delay))
+        for room in rooms:
+            service.add_room(room)
+        latencies = []
+        started = timer.perf_counter()
+        for schedule in schedules:
+            begin = timer.perf_counter()
+            service.create_schedule(schedule)
+            latencies.append(timer.perf_counter() - begin)
+        writes = timer.perf_counter() - started
+        service.flush()
+        drained = timer.perf_counter() - started
+        if dispatcher is not None:
+            dispatcher.close()
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{label:<28} {p50:>9.2f} {p99:>9.2f} {writes:>11.2f} {drained:>12.2f}")
+
+
+def bench_subscriptions() -> None:
+    """Fan-out to 50k student observers: broadcast attach() vs topic subscriptions"""
+    print_header("OBSERVER FAN-OUT: BROADCAST VS TOPIC SUBSCRIPTIONS")
+    num_students, courses_per_student = 50_000, 5
+    schedules = generate_schedules(1000, seed=17)
+    rooms = {schedule.room.room_id: schedule.room for schedule in schedules}.values()
+    course_codes = sorted({schedule.course_code for schedule in schedules})
+    rng = random.Random(5)
+    students = [StudentObserver(f"STU{i:05d}", f"Student {i}", f"stu{i}@university.edu")
+                for i in range(num_students)]
+
+    class CountingStudent(StudentObserver):
+        deliveries = 0
+
+        def update(self, event_type, data):
+            CountingStudent.deliveries += 1
+            super().update(event_type, data)
+
+    for student in students:
+        student.__class__ = CountingStudent
+
+    def run(mode: str, events: int):
+        service = SchedulingService()
+        for room in rooms:
+            service.add_room(room)
+        started = timer.perf_counter()
+        for student in students:
+            if mode == 'broadcast':
+                service.attach(student)
+            else:
+                for course_code in rng.sample(course_codes, courses_per_student):
+                    service.subscribe(student, course_code=course_code)
+        setup = timer.perf_counter() - started
+        CountingStudent.deliveries = 0
+        started = timer.perf_counter()
+        for schedule in schedules[:events]:
+            service.create_schedule(schedule)
+        elapsed = timer.perf_counter() - started
+        return setup, elapsed / events, CountingStudent.deliveries / events
+
+    print(f"{num_students} StudentObservers, {courses_per_student} course subscriptions each, "
+          f"{len(course_codes)} courses")
+    print(f"{'Mode':<14} {'Setup (s)':>10} {'ms/create':>10} {'Deliveries/create':>18}")
+    for mode, events in (('broadcast', 20), ('subscriptions', 1000)):
+        setup, per_event, deliveries = run(mode, events)
+        print(f"{mode:<14} {setup:>10.2f} {per_event * 1000:>10.3f} {deliveries:>18.1f}")
+
+
+def bench_registry() -> None:
+    """Term-start registration: keyed ObserverRegistry vs the old copy-on-write list"""
+    print_header("OBSERVER REGISTRY: ATTACH / DETACH AT TERM START")
+    num_students = 50_000
+    students = [StudentObserver(f"STU{i:05d}", f"Student {i}", f"stu{i}@university.edu")
+                for i in range(num_students)]
+
+    def legacy_attach(count: int) -> float:
+        """The previous list-based attach: membership test + list copy per call"""
+        observers: List = []
+        started = timer.perf_counter()
+        for observer in students[:count]:
+            if observer not in observers:
+                observers = observers + [observer]
+        return timer.perf_counter() - started
+
+    def timed(action: Callable[[], object]) -> float:
+        started = timer.perf_counter()
+        action()
+        return timer.perf_counter() - started
+
+    print(f"{'Operation':<44} {'Seconds':>9}")
+    print(f"{'legacy list attach, 10k students':<44} {legacy_attach(10_000):>9.3f}")
+
+    service = SchedulingService()
+    one_by_one = timed(lambda: [service.attach(student) for student in students])
+    print(f"{f'attach() one by one, {num_students} students':<44} {one_by_one:>9.3f}")
+    duplicates = [StudentObserver(s.student_id, s.student_name, s.email) for s in students]
+    repeat = timed(lambda: service.attach_many(duplicates))
+    print(f"{'attach_many() same ids again (no-op)':<44} {repeat:>9.3f}")
+    detach = timed(lambda: service.detach_many(students))
+    print(f"{'detach_many() all':<44} {detach:>9.3f}")
+    bulk = timed(lambda: service.attach_many(students))
+    print(f"{f'attach_many() {num_students} students':<44} {bulk:>9.3f}")
+    print(f"Registered: {len(service._observers)}")
+
+
+def bench_digest() -> None:
+    """Deliveries per lecturer during rescheduling sessions, plain vs digested"""
+    print_header("NOTIFICATION DIGESTS: REPLAYED RESCHEDULING SESSIONS")
+    base = generate_schedules(800, seed=22)
+    rng = random.Random(9)
+    lecturers = sorted({schedule.lecturer_name for schedule in base})
+    editing = rng.sample(lecturers, 40)
+
+    # 40 lecturers, each a ~5 minute session of 15 edits a few seconds apart
+    steps = []
+    for lecturer in editing:
+        moment = rng.uniform(0, 1800)
+        for _ in range(15):
+            moment += rng.uniform(5, 40)
+            steps.append((moment, lecturer, rng.random(), rng.randrange(7 * 60, 17 * 60, 10)))
+    steps.sort()
+
+    class Counting(Observer):
+        def __init__(self, name):
+            self.name, self.messages = name, 0
+
+        @property
+        def observer_id(self):
+            return self.name
+
+        def update(self, event_type, data):
+            self.messages += 1
+
+    def replay(window):
+        clock = [0.0]
+        service = SchedulingService()
+        for room in {schedule.room.room_id: schedule.room for schedule in base}.values():
+            service.add_room(room)
+        service.create_schedules_bulk(base)
+        recipients = [Counting(lecturer) for lecturer in lecturers]
+        digests = [] if window is None else [
+            DigestObserver(recipient, window=window, max_events=50, auto_flush=False,
+                           clock=lambda: clock[0]) for recipient in recipients]
+        for lecturer, observer in zip(lecturers, digests or recipients):
+            service.subscribe(observer, lecturer=lecturer)
+        pick = random.Random(3)
+        created = 0
+        for moment, lecturer, roll, start in steps:
+            clock[0] = moment
+            own = service.get_schedules_by_lecturer(lecturer)
+            slot = TimeSlot(time(start // 60, start % 60), time((start + 100) // 60, (start + 100) % 60))
+            if own and roll < 0.8:
+                target = pick.choice(own)
+                service.update_schedule(target.schedule_id, Schedule(
+                    target.schedule_id, target.course_name, target.course_code, lecturer,
+                    target.day, slot, target.room, target.num_students))
+            elif own and roll < 0.9:
+                service.delete_schedule(pick.choice(own).schedule_id)
+            else:
+                created += 1
+                service.create_schedule(Schedule(
+                    f"NEW{created:05d}", "Extra Section", "CS999", lecturer,
+                    pick.choice(list(DayOfWeek)[:6]), slot, pick.choice(base).room, 10))
+        for digest in digests:
+            digest.flush()
+        return sum(recipient.messages for recipient in recipients)
+
+    print(f"{len(steps)} edits by {len(editing)} lecturers over "
+          f"{steps[-1][0] / 60:.0f} simulated minutes")
+    print(f"{'Delivery':<22} {'Messages':>9} {'Reduction':>10}")
+    plain = replay(None)
+    print(f"{'every event':<22} {plain:>9}")
+    for window in (60, 300, 900):
+        digested = replay(window)
+        print(f"{f'digest, {window}s window':<22} {digested:>9} {1 - digested / plain:>10.0%}")
+
+
+def bench_channels() -> None:
+    """Messages/sec through observers and email/SMS/push channels to local stand-ins"""
+    print_header("DELIVERY CHANNELS: SMTP / SMS / PUSH THROUGHPUT")
+    smtp, gateway = LocalSMTPServer().start(), LocalHTTPGateway().start()
+    count = 500
+    print(f"{'Path':<46} {'Messages':>9} {'Msgs/sec':>10}")
+
+    def report(label: str, messages: int, elapsed: float) -> None:
+        print(f"{label:<46} {messages:>9} {messages / elapsed:>10.0f}")
+
+    def connect_per_message():
+        for i in range(count):
+            with smtplib.SMTP("127.0.0.1", smtp.port) as client:
+                client.sendmail("noreply@university.edu", [f"stu{i}@university.edu"],
+                                "Subject: Schedule\r\n\r\nchanged")
+    report("smtplib, new connection per message", count, measure(connect_per_message))
+
+    with EmailChannel("127.0.0.1", smtp.port, pool_size=1) as email:
+        report("EmailChannel, pooled connection",
+               count, measure(lambda: [email.send(f"stu{i}@university.edu", "Schedule", "changed")
+                                       for i in range(count)]))
+    with EmailChannel("127.0.0.1", smtp.port, rate=200, burst=10) as email:
+        report("EmailChannel, rate limit 200/s",
+               count, measure(lambda: [email.send(f"stu{i}@university.edu", "Schedule", "changed")
+                                       for i in range(count)]))
+
+    # Full pipeline: create -> notify -> AsyncDispatcher -> observers -> 3 channels each
+    schedules = generate_schedules(20, seed=23)
+    channels = [EmailChannel("127.0.0.1", smtp.port, pool_size=4),
+                SMSChannel(gateway.url + "/sms", pool_size=4),
+                PushChannel(gateway.url + "/push", pool_size=4)]
+    with AsyncDispatcher(workers=4, max_queue=10_000) as dispatcher:
+        service = SchedulingService(dispatcher=dispatcher)
+        for schedule in schedules:
+            service.add_room(schedule.room)
+        service.attach_many(
+            StudentObserver(f"STU{i:04d}", f"Student {i}", f"stu{i}@university.edu",
+                            phone=f"+62811{i:06d}", device_token=f"token-{i}", channels=channels)
+            for i in range(100))
+        started = timer.perf_counter()
+        for schedule in schedules:
+            service.create_schedule(schedule)
+        service.flush()
+        elapsed = timer.perf_counter() - started
+    sent = sum(channel.stats['sent'] for channel in channels)
+    report("service -> 4 dispatch workers -> 3 channels", sent, elapsed)
+    print(f"Connections opened: SMTP {channels[0].pool.opened}, "
+          f"SMS {channels[1].pool.opened}, push {channels[2].pool.opened}")
+    for channel in channels:
+        channel.close()
+    smtp.stop()
+    gateway.stop()
+
+
+def bench_event_log() -> None:
+    """Event log: append overhead, scan/replay throughput, offset seeks, compaction"""
+    print_header("EVENT LOG: APPEND, SCAN, REPLAY, COMPACT")
+    schedules = generate_schedules(20_000, seed=24)
+    directory = tempfile.mkdtemp(prefix='event-log-bench-')
+
+    class CountingObserver(Observer):
+        count = 0
+
+        def update(self, event_type, data):
+            self.count += 1
+
+    def populate(event_log) -> float:
+        service = SchedulingService()
+        service.attach(CountingObserver())
+        for schedule in schedules:
+            service.add_room(schedule.room)
+        service.event_log = event_log
+        started = timer.perf_counter()
+        for schedule in schedules:
+            service.create_schedule(schedule)
+        for schedule in schedules[:5000]:
+            service.update_schedule(schedule.schedule_id, Schedule(
+                schedule.schedule_id, schedule.course_name, schedule.course_code,
+                schedule.lecturer_name, DayOfWeek.SATURDAY, schedule.time_slot,
+                schedule.room, schedule.num_students))
+        return timer.perf_counter() - started
+
+    try:
+        baseline = populate(None)
+        log = EventLog(directory, segment_bytes=8 * 1024 * 1024).open()
+        logged = populate(log)
+        events = log.next_offset
+        size = sum(os.path.getsize(path) for path in log.segments())
+        print(f"{events} events, {len(log.segments())} segments, {size / 2**20:.1f} MiB")
+        print(f"{'Operation':<40} {'Seconds':>9} {'Events/sec':>12}")
+
+        def row(label: str, seconds: float, count: int = events) -> None:
+            print(f"{label:<40} {seconds:>9.3f} {count / seconds:>12.0f}")
+
+        row("25k mutations, no event log", baseline, 25_000)
+        row("25k mutations, event log", logged, 25_000)
+        row("scan headers + payload views", measure(lambda: sum(1 for _ in log.read())))
+        row("scan CONFLICT_DETECTED only", measure(
+            lambda: sum(1 for _ in log.read(event_types=[EventType.CONFLICT_DETECTED]))))
+        row("read + decode every event", measure(lambda: [event.data for event in log.read()]))
+        replayer = CountingObserver()
+        row("replay to observer (consumer commit)", measure(
+            lambda: log.replay(replayer, from_offset=0, consumer='bench')))
+
+        rng = random.Random(4)
+        seeks = [rng.randrange(events) for _ in range(2000)]
+        seek_time = measure(lambda: [next(log.read(offset)) for offset in seeks])
+        print(f"{'random seek to offset':<40} {seek_time / len(seeks) * 1e6:>8.1f}µs")
+
+        started = timer.perf_counter()
+        stats = log.compact()
+        compact_time = timer.perf_counter() - started
+        print(f"compact(): {compact_time:.2f}s, {stats['events_removed']} superseded events removed, "
+              f"sealed segments {stats['bytes_before'] / 2**20:.1f} -> "
+              f"{stats['bytes_after'] / 2**20:.1f} MiB")
+        log.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_sse() -> None:
+    """Concurrent SSE subscribers one process sustains: delivery latency and completeness"""
+    print_header("EVENT STREAM: CONCURRENT SSE SUBSCRIBERS")
+    events = 20
+    broadcaster = EventBroadcaster(max_queue=events * 2, heartbeat=5.0)
+
+    # Same shape as GET /api/events/stream: one server thread per open stream
+    class StreamHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            try:
+                for chunk in broadcaster.stream(broadcaster.connect()):
+                    self.wfile.write(chunk)
+            except OSError:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    class StreamServer(ThreadingHTTPServer):
+        request_queue_size = 1024
+        daemon_threads = True
+
+    threading.stack_size(256 * 1024)
+    server = StreamServer(("127.0.0.1", 0), StreamHandler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    frame_id = re.compile(rb"^id: (\d+)$", re.MULTILINE)
+    print(f"{'Subscribers':>11} {'Connect s':>10} {'Complete':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'Max ms':>8} {'RSS MiB':>8}")
+
+    for subscribers in (250, 1000, 2000, 4000):
+        service = SchedulingService()
+        service.attach(broadcaster)
+        room = Room("R001", "Room 1", 40)
+        service.add_room(room)
+        selector = selectors.DefaultSelector()
+        started = timer.perf_counter()
+        for i in range(subscribers):
+            sock = socket.create_connection(("127.0.0.1", server.server_address[1]))
+            sock.sendall(b"GET /api/events/stream HTTP/1.1\r\nHost: bench\r\n\r\n")
+            sock.setblocking(False)
+            selector.register(sock, selectors.EVENT_READ, {'ids': 0, 'tail': b""})
+        while broadcaster.clients < subscribers:
+            timer.sleep(0.01)
+        connect_time = timer.perf_counter() - started
+
+        base = broadcaster.sequence
+        sent_at, latencies = {}, []
+
+        def publish():
+            for i in range(events):
+                sent_at[base + i + 1] = timer.perf_counter()
+                slot = TimeSlot(time(7 + i // 5, 0), time(8 + i // 5, 0))
+                service.create_schedule(Schedule(f"SCH{i:03d}", "Course", f"CS{i:03d}", f"Dr. {i}",
+                                                 DayOfWeek(i % 5), slot, room, 30))
+                timer.sleep(0.02)
+
+        publisher = threading.Thread(target=publish)
+        publisher.start()
+        deadline = timer.perf_counter() + 60
+        pending = subscribers
+        while pending and timer.perf_counter() < deadline:
+            for key, _ in selector.select(0.5):
+                state = key.data
+                chunk = key.fileobj.recv(65536)
+                now = timer.perf_counter()
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    pending -= 1
+                    continue
+                # Frames may be split across reads: only parse whole lines
+                text, _, state['tail'] = (state['tail'] + chunk).rpartition(b"\n")
+                for match in frame_id.finditer(text):
+                    latencies.append(now - sent_at[int(match.group(1))])
+                    state['ids'] += 1
+                    if state['ids'] == events:
+                        pending -= 1
+        publisher.join()
+        complete = sum(1 for key in selector.get_map().values() if key.data['ids'] == events)
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+        while broadcaster.clients:
+            broadcaster.close()
+            timer.sleep(0.05)
+        service.detach(broadcaster)
+
+        latencies.sort()
+        def percentile(q: float) -> float:
+            return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000 if latencies else 0.0
+        with open('/proc/self/status') as status:
+            rss = next((int(line.split()[1]) / 1024 for line in status if line.startswith('VmRSS')), 0.0)
+        print(f"{subscribers:>11} {connect_time:>10.2f} {complete:>9} {percentile(0.5):>8.1f} "
+              f"{percentile(0.99):>8.1f} {latencies[-1] * 1000 if latencies else 0:>8.1f} {rss:>8.0f}")
+
+    server.shutdown()
+    server.server_close()
+    threading.stack_size(0)
+    print(f"Each of {events} events encoded once and fanned out; "
+          f"{broadcaster.stats['overflowed']} subscriber(s) dropped for falling behind")
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    'conflicts': bench_conflict_detection,
+    'vectorized': bench_vectorized_detection,
+    'parallel': bench_parallel_detection,
+    'lazy': bench_lazy_iteration,
+    'time_encoding': bench_time_encoding,
+    'service_load': bench_service_load,
+    'occupancy': bench_occupancy,
+    'indexes': bench_secondary_indexes,
+    'bulk_load': bench_bulk_load,
+    'batch': bench_batch_moves,
+    'snapshots': bench_snapshot_reads,
+    'memory': bench_memory,
+    'recovery': bench_recovery,
+    'sqlite': bench_sqlite,
+    'columnar': bench_columnar,
+    'async_notify': bench_async_dispatch,
+    'subscriptions': bench_subscriptions,
+    'registry': bench_registry,
+    'digest': bench_digest,
+    'channels': bench_channels,
+    'event_log': bench_event_log,
+    'sse': bench_sse,
+}
+
+
+def main(argv: List[str]) -> int:
+    """Run the selected benchmarks (all by default)"""
+    names = argv or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(BENCHMARKS)}")
+        return 1
+    for name in names:
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
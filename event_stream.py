@@ -0,0 +1,225 @@
+"""
+Server-Sent Events (SSE) fan-out of schedule notifications
+
+EventBroadcaster is a single observer attached to the SchedulingService.
+It encodes each event once as an SSE frame. The frame goes to every
+connected StreamClient whose filters match. Matching uses the same
+SubscriptionIndex as ScheduleSubject.subscribe(), so per-event cost
+depends on the number of matching clients, not on how many are connected.
+Every client has a bounded queue. A client that falls more than max_queue
+frames behind is disconnected. Its EventSource then reconnects with
+Last-Event-ID and catches up from the broadcaster's history.
+
+Usage (see GET /api/events/stream in api.py):
+    broadcaster = EventBroadcaster()
+    service.attach(broadcaster)
+    ...
+    client = broadcaster.connect(room_id="R101", last_event_id=last_id)
+    return Response(broadcaster.stream(client), mimetype="text/event-stream")
+"""
+
+from collections import deque
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+import itertools
+import json
+import logging
+import secrets
+import threading
+
+from schedule_system import EventType, Observer, Subscription, SubscriptionIndex
+
+logger = logging.getLogger(__name__)
+
+
+def parse_event_id(event_id: str) -> Tuple[Optional[str], int]:
+    """(epoch, sequence) of an event id; ids without an epoch give None"""
+    epoch, _, sequence = event_id.rpartition('-')
+    if not (sequence.isascii() and sequence.isdigit()):
+        raise ValueError(f"Invalid event id: {event_id!r}")
+    return epoch or None, int(sequence)
+
+
+def encode_frame(event_id: Optional[str], event: str, data: Dict) -> bytes:
+    """One SSE frame; compact JSON has no raw newlines, so data is a single line"""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+class StreamClient(Observer):
+    """One connected SSE client: a bounded queue of encoded frames"""
+
+    def __init__(self, client_id: str, max_queue: int = 1000):
+        self.client_id = client_id
+        self.max_queue = max_queue
+        self.subscription: Optional[Subscription] = None
+        self.closed = False
+        self.overflowed = False
+        self.delivered = 0
+        self._frames: deque = deque()
+        self._condition = threading.Condition()
+
+    @property
+    def observer_id(self) -> str:
+        return self.client_id
+
+    def update(self, event_type: EventType, data: Dict) -> None:
+        """Queue an event outside the broadcaster (no id, not replayable)"""
+        self.push(encode_frame(None, event_type.value, data))
+
+    def push(self, frame: bytes) -> bool:
+        """Queue a frame; a full queue closes the client (it must reconnect)"""
+        with self._condition:
+            if self.closed:
+                return False
+            if len(self._frames) >= self.max_queue:
+                self.overflowed = self.closed = True
+                self._condition.notify_all()
+                return False
+            self._frames.append(frame)
+            self._condition.notify()
+            return True
+
+    def take(self, timeout: Optional[float] = None) -> List[bytes]:
+        """Every queued frame, waiting up to timeout for one"""
+        with self._condition:
+            if not self._frames and not self.closed:
+                self._condition.wait(timeout)
+            frames = list(self._frames)
+            self._frames.clear()
+            self.delivered += len(frames)
+            return frames
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class EventBroadcaster(Observer):
+    """
+    Observer that streams every event to the matching SSE clients.
+
+    Event ids are `<epoch>-<n>`: n counts the events, and the epoch is
+    random per broadcaster, so ids from an earlier server process never
+    match. The last `history` events are kept so a client reconnecting with
+    Last-Event-ID receives what it missed. If that id is from another epoch
+    (or has none) or no longer in the history, the client gets a `resync`
+    event and should reload its state.
+
+    update() only queues frames, so it runs inline even behind an
+    AsyncDispatcher. Set as the service's event_source, its last_event_id is
+    recorded in every snapshot the service publishes, so a client that
+    loads a snapshot resumes from exactly the events that came after it.
+    """
+
+    inline = True
+
+    def __init__(self, history: int = 1000, max_queue: int = 1000, heartbeat: float = 15.0,
+                 retry_ms: int = 3000):
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self.retry_ms = retry_ms
+        self.epoch = secrets.token_hex(4)
+        self.sequence = 0
+        self.stats = {'events': 0, 'frames': 0, 'overflowed': 0}
+        self._history: deque = deque(maxlen=history)
+        self._index = SubscriptionIndex()
+        self._clients: Dict[str, StreamClient] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def last_event_id(self) -> str:
+        """Id of the latest event (`<epoch>-0` before the first)"""
+        return f"{self.epoch}-{self.sequence}"
+
+    @property
+    def clients(self) -> int:
+        """Connected clients"""
+        return len(self._clients)
+
+    def connect(self, event_types: Optional[Iterable[EventType]] = None,
+                lecturer: Optional[str] = None, room_id: Optional[str] = None,
+                course_code: Optional[str] = None, krs_id: Optional[str] = None,
+                last_event_id: Optional[str] = None) -> StreamClient:
+        """Register a client with its filters, replaying what it missed after last_event_id"""
+        resume_from = None if last_event_id is None else parse_event_id(last_event_id)
+        client = StreamClient(f"sse-{next(self._ids)}", self.max_queue)
+        client.subscription = Subscription(client, event_types, lecturer, room_id,
+                                           course_code, krs_id)
+        # Under the lock, so no event falls between the replay and the live feed
+        with self._lock:
+            if resume_from is not None:
+                self._replay(client, *resume_from)
+            self._index.add(client.subscription)
+            self._clients[client.client_id] = client
+        logger.info(f"📡 SSE client {client.client_id} connected ({self.clients} open)")
+        return client
+
+    def disconnect(self, client: StreamClient) -> None:
+        with self._lock:
+            if self._clients.pop(client.client_id, None) is None:
+                return
+            self._index.remove_observer(client)
+        client.close()
+        if client.overflowed:
+            self.stats['overflowed'] += 1
+            logger.warning(f"⚠️  SSE client {client.client_id} fell {client.max_queue} events "
+                           f"behind and was disconnected")
+        logger.info(f"📡 SSE client {client.client_id} disconnected ({self.clients} open)")
+
+    def update(self, event_type: EventType, data: Dict) -> None:
+        """Encode the event once and queue it for every matching client"""
+        overflowed = []
+        with self._lock:
+            self.sequence += 1
+            frame = encode_frame(f"{self.epoch}-{self.sequence}", event_type.value, data)
+            self._history.append((self.sequence, event_type, data, frame))
+            clients = self._index.match(event_type, data)
+            for client in clients:
+                if not client.push(frame) and client.overflowed:
+                    overflowed.append(client)
+            self.stats['events'] += 1
+            self.stats['frames'] += len(clients) - len(overflowed)
+        for client in overflowed:
+            self.disconnect(client)
+
+    def stream(self, client: StreamClient) -> Iterator[bytes]:
+        """
+        Body of the text/event-stream response: frames as they arrive and a
+        comment line every `heartbeat` seconds so proxies keep the connection
+        (and a vanished client is noticed on the next write)
+        """
+        try:
+            yield f"retry: {self.retry_ms}\n\n".encode('ascii')
+            while True:
+                frames = client.take(self.heartbeat)
+                if frames:
+                    yield b"".join(frames)
+                elif client.closed:
+                    return
+                else:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.disconnect(client)
+
+    def close(self) -> None:
+        """Disconnect every client (their streams end)"""
+        for client in list(self._clients.values()):
+            self.disconnect(client)
+
+    def _replay(self, client: StreamClient, epoch: Optional[str], last_sequence: int) -> None:
+        if epoch != self.epoch:
+            client.push(encode_frame(self.last_event_id, 'resync', {'reason': 'server restarted'}))
+            return
+        oldest = self._history[0][0] if self._history else self.sequence + 1
+        if last_sequence > self.sequence or last_sequence + 1 < oldest:
+            client.push(encode_frame(self.last_event_id, 'resync', {'reason': 'history unavailable'}))
+            return
+        for sequence, event_type, data, frame in self._history:
+            if sequence > last_sequence and client.subscription.accepts(event_type, data):
+                client.push(frame)
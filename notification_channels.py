@@ -0,0 +1,551 @@
+"""
+Delivery channels for schedule notifications
+
+Observers log every notification; give them channels to also deliver it by
+email (SMTP), SMS or push. Every channel retries transient failures with
+jittered exponential backoff and can be rate limited with a token bucket;
+the SMTP and HTTP channels keep a pool of open connections instead of
+connecting per message.
+
+Usage:
+    email = EmailChannel("smtp.university.edu", 25, rate=20)
+    student = StudentObserver("STU001", "John", "john@university.edu", channels=[email])
+    service.attach(student)
+    ...
+    email.close()
+
+Delivery is synchronous inside Observer.update(), which SchedulingService
+calls while it holds its write lock: pair channels with an AsyncDispatcher
+so a slow relay never stalls other requests (api.py does this). LocalSMTPServer and
+LocalHTTPGateway are small in-process stand-ins for an SMTP relay and an
+SMS/push HTTP gateway, for tests and local runs.
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from email.header import Header
+from email.mime.text import MIMEText
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Callable, Iterator
+from urllib.parse import urlsplit
+import http.client
+import json
+import logging
+import random
+import smtplib
+import socketserver
+import threading
+import time as timer
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# RATE LIMITS AND RETRIES
+# ============================================================================
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, at most `capacity` stored, so
+    bursts of up to `capacity` go out at once and the long-run rate is `rate`
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = timer.monotonic,
+                 sleep: Callable[[float], None] = timer.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        if self.capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available, else return seconds until one is"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token without waiting"""
+        return self._reserve() == 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a token; False if none is available within timeout"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self._reserve()
+            if wait == 0.0:
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                return False
+            self.sleep(wait)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: before retry n (0-based) wait a
+    random time in [0, min(max_delay, base_delay * 2**n)], so clients that
+    failed together do not retry in lockstep
+    """
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.05, max_delay: float = 2.0,
+                 rng: Optional[random.Random] = None):
+        if attempts < 1:
+            raise ValueError("attempts must be >= 1")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, retry: int) -> float:
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class DeliveryError(Exception):
+    """A failed send; retryable for transient errors (timeouts, 4xx SMTP, 5xx/429 HTTP)"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class _ConnectionPool:
+    """
+    At most `size` connections open at once; idle ones are reused (LIFO, so
+    the warmest connection goes first). A connection that raised is closed
+    instead of being returned to the pool.
+    """
+
+    def __init__(self, connect: Callable[[], object], disconnect: Callable[[object], None],
+                 size: int):
+        if size < 1:
+            raise ValueError("pool_size must be >= 1")
+        self._connect = connect
+        self._disconnect = disconnect
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[object] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    @contextmanager
+    def lease(self) -> Iterator[object]:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+                with self._lock:
+                    self.opened += 1
+            try:
+                yield connection
+            except BaseException:
+                self._close(connection)
+                raise
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def _close(self, connection: object) -> None:
+        try:
+            self._disconnect(connection)
+        except Exception:
+            pass
+
+
+# ============================================================================
+# CHANNELS
+# ============================================================================
+
+class DeliveryChannel(ABC):
+    """
+    Base channel: deliver() looks up the observer's address attribute, then
+    send() applies the rate limit and retry policy around _send()
+    """
+
+    name = "channel"
+    address_attribute = "email"
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 retry: Optional[RetryPolicy] = None, rate_timeout: float = 5.0,
+                 sleep: Callable[[float], None] = timer.sleep):
+        self.rate_limit = TokenBucket(rate, burst, sleep=sleep) if rate else None
+        self.rate_timeout = rate_timeout
+        self.retry = retry or RetryPolicy()
+        self.sleep = sleep
+        self.stats = {'sent': 0, 'failed': 0, 'retried': 0, 'skipped': 0}
+        self._stats_lock = threading.Lock()
+
+    def deliver(self, observer: object, subject: str, body: str) -> bool:
+        """Send to the observer's address; False (skipped) if it has none"""
+        address = getattr(observer, self.address_attribute, None)
+        if not address:
+            self._count('skipped')
+            return False
+        return self.send(address, subject, body)
+
+    def send(self, address: str, subject: str, body: str) -> bool:
+        """
+        Send one message, retrying transient failures; False if it failed for
+        good. Never raises: a notification must not fail the change behind it.
+        """
+        error = None
+        for attempt in range(self.retry.attempts):
+            if attempt:
+                self._count('retried')
+                self.sleep(self.retry.delay(attempt - 1))
+            if self.rate_limit is not None and not self.rate_limit.acquire(self.rate_timeout):
+                error = DeliveryError(f"rate limit: no slot within {self.rate_timeout}s", False)
+                break
+            try:
+                self._send(address, subject, body)
+            except DeliveryError as e:
+                error = e
+                if not e.retryable:
+                    break
+                continue
+            except Exception as e:
+                # Building the message (encoding, headers) failed: retrying won't help
+                error = DeliveryError(f"{e.__class__.__name__}: {e}", retryable=False)
+                break
+            self._count('sent')
+            return True
+        self._count('failed')
+        logger.error(f"❌ {self.name} delivery to {address} failed: {error}")
+        return False
+
+    @abstractmethod
+    def _send(self, address: str, subject: str, body: str) -> None:
+        """Send once, raising DeliveryError on failure"""
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def _count(self, outcome: str) -> None:
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def __enter__(self) -> 'DeliveryChannel':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EmailChannel(DeliveryChannel):
+    """Email through an SMTP relay, over a pool of kept-open smtplib connections"""
+
+    name = "email"
+    address_attribute = "email"
+
+    def __init__(self, host: str = "localhost", port: int = 25,
+                 sender: str = "noreply@university.edu", pool_size: int = 4,
+                 timeout: float = 10.0, starttls: bool = False,
+                 username: Optional[str] = None, password: Optional[str] = None, **limits):
+        super().__init__(**limits)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.pool = _ConnectionPool(self._connect, self._disconnect, pool_size)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    @staticmethod
+    def _disconnect(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except smtplib.SMTPException:
+            smtp.close()
+
+    def _send(self, address: str, subject: str, body: str) -> None:
+        # compat32 MIMEText formats ~5x faster than email.message.EmailMessage
+        message = MIMEText(body, 'plain', 'utf-8')
+        message['From'] = self.sender
+        message['To'] = address
+        message['Subject'] = Header(subject, 'utf-8')
+        try:
+            with self.pool.lease() as smtp:
+                smtp.sendmail(self.sender, [address], message.as_bytes())
+        except smtplib.SMTPRecipientsRefused as e:
+            codes = [code for code, _ in e.recipients.values()]
+            raise DeliveryError(f"recipient refused {codes}",
+                                retryable=all(400 <= code < 500 for code in codes))
+        except smtplib.SMTPResponseException as e:
+            raise DeliveryError(f"{e.smtp_code} {e.smtp_error!r}",
+                                retryable=400 <= e.smtp_code < 500)
+        except (smtplib.SMTPException, OSError) as e:
+            raise DeliveryError(str(e) or e.__class__.__name__)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class _HTTPChannel(DeliveryChannel):
+    """JSON POST to a provider gateway over pooled keep-alive connections"""
+
+    def __init__(self, url: str, pool_size: int = 4, timeout: float = 10.0,
+                 headers: Optional[Dict[str, str]] = None, **limits):
+        super().__init__(**limits)
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported gateway URL: {url}")
+        self.url = url
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self._connection_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                                  else http.client.HTTPConnection)
+        self._netloc = parts.netloc
+        self._path = parts.path or "/"
+        self.pool = _ConnectionPool(self._connect, lambda connection: connection.close(),
+                                    pool_size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return self._connection_class(self._netloc, timeout=self.timeout)
+
+    @abstractmethod
+    def _payload(self, address: str, subject: str, body: str) -> Dict:
+        pass
+
+    def _send(self, address: str, subject: str, body: str) -> None:
+        payload = json.dumps(self._payload(address, subject, body)).encode('utf-8')
+        try:
+            with self.pool.lease() as connection:
+                connection.request("POST", self._path, payload, self.headers)
+                response = connection.getresponse()
+                response.read()
+                if not 200 <= response.status < 300:
+                    raise DeliveryError(f"HTTP {response.status} {response.reason}",
+                                        retryable=response.status == 429 or response.status >= 500)
+        except (http.client.HTTPException, OSError) as e:
+            raise DeliveryError(str(e) or e.__class__.__name__)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class SMSChannel(_HTTPChannel):
+    """SMS through an HTTP gateway: POST {"to", "message"}"""
+
+    name = "sms"
+    address_attribute = "phone"
+
+    def _payload(self, address: str, subject: str, body: str) -> Dict:
+        return {'to': address, 'message': body}
+
+
+class PushChannel(_HTTPChannel):
+    """Push notifications through an HTTP gateway: POST {"token", "title", "body"}"""
+
+    name = "push"
+    address_attribute = "device_token"
+
+    def _payload(self, address: str, subject: str, body: str) -> Dict:
+        return {'token': address, 'title': subject, 'body': body}
+
+
+# ============================================================================
+# LOCAL STAND-INS (tests and local runs)
+# ============================================================================
+
+class _StandIn:
+    """Shared plumbing of the stand-in servers: thread, counters, failure injection"""
+
+    DEFAULT_FAILURE = 0
+
+    def _init_stand_in(self) -> None:
+        self.connections = 0
+        self._failures: List[int] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def fail_next(self, count: int, code: Optional[int] = None) -> None:
+        """Answer the next `count` sends with an error `code`"""
+        with self._lock:
+            self._failures.extend([code or self.DEFAULT_FAILURE] * count)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,),
+                                        name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def _count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def _take_failure(self) -> Optional[int]:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """The subset of SMTP that smtplib needs to send a message"""
+
+    disable_nagle_algorithm = True
+
+    def handle(self) -> None:
+        server = self.server
+        server._count_connection()
+        self._reply("220 localhost SMTP stand-in")
+        envelope: Dict = {}
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').rstrip("\r\n")
+            verb = command[:4].upper()
+            if verb in ("HELO", "EHLO"):
+                self._reply("250 localhost")
+            elif verb == "MAIL":
+                failure = server._take_failure()
+                if failure:
+                    self._reply(f"{failure} Try again later")
+                    continue
+                envelope = {'from': command[10:].strip(), 'to': []}
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                envelope.setdefault('to', []).append(command[8:].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data_line in iter(self.rfile.readline, b""):
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line)
+                server._store(dict(envelope, data=b"".join(lines)))
+                envelope = {}
+                self._reply("250 OK queued")
+            elif verb == "RSET":
+                envelope = {}
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+
+class LocalSMTPServer(_StandIn, socketserver.ThreadingTCPServer):
+    """
+    In-process SMTP sink on 127.0.0.1 (port 0 = any free port). Received
+    messages are kept in `messages`; fail_next(n) answers the next n MAIL
+    commands with 451 (or the given code) to exercise retries.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+    DEFAULT_FAILURE = 451
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _SMTPHandler)
+        self._init_stand_in()
+        self.messages: List[Dict] = []
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def _store(self, message: Dict) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so the client pool is exercised
+    # Headers and body are separate writes; with Nagle on, the body waits
+    # for the client's delayed ACK (~40ms per request)
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        self.server._count_connection()
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        failure = self.server._take_failure()
+        if failure:
+            self._respond(failure, {'error': 'unavailable'})
+            return
+        self.server._store({'path': self.path, 'body': json.loads(body or b"{}")})
+        self._respond(202, {'status': 'queued'})
+
+    def _respond(self, status: int, payload: Dict) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class LocalHTTPGateway(_StandIn, ThreadingHTTPServer):
+    """
+    In-process SMS/push gateway: records JSON POST bodies in `requests` and
+    answers 202; fail_next(n) answers the next n posts with 503 (or the
+    given status)
+    """
+
+    daemon_threads = True
+    DEFAULT_FAILURE = 503
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _GatewayHandler)
+        self._init_stand_in()
+        self.requests: List[Dict] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _store(self, request: Dict) -> None:
+        with self._lock:
+            self.requests.append(request)
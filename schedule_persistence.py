@@ -0,0 +1,1568 @@
+"""
+Durable persistence for SchedulingService
+
+Every committed room and schedule change is appended to a write-ahead log
+(WAL) and a compacted snapshot of the whole store is written periodically.
+On startup the snapshot is loaded and the log tail after it is replayed.
+SQLiteScheduleRepository is a queryable alternative that keeps rooms and
+schedules in SQLite and detects conflicts in SQL. write_columnar_snapshot /
+ColumnarSnapshot export a read-only, memory-mapped columnar file for
+replicas and analytics. EventLog keeps every emitted event in mmap-read
+segments so offline observers can replay from an offset.
+
+Usage:
+    service = SchedulingService()
+    store = DurableStore("data", sync_interval=0.05)
+    store.open(service)     # recover, then journal every change
+    ...
+    store.close()
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import List, Dict, Set, Tuple, Optional, Iterable, Iterator
+import glob
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time as timer
+import zlib
+
+from schedule_system import (
+    SchedulingService, Schedule, Room, TimeSlot, DayOfWeek, ScheduleConflict,
+    ScheduleSnapshot, ConflictType, ConflictDetectionEngine, BulkResult, EventType, Observer,
+    event_key, _iter_partition_pairs
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# RECORD FORMAT
+# ============================================================================
+
+def room_to_record(room: Room) -> Dict:
+    """Persisted form of a Room"""
+    return {
+        'room_id': room.room_id,
+        'room_name': room.room_name,
+        'capacity': room.capacity,
+        'building': room.building,
+    }
+
+
+def room_from_record(record: Dict) -> Room:
+    """Rebuild a Room from its persisted form"""
+    return Room(record['room_id'], record['room_name'], record['capacity'], record['building'])
+
+
+def schedule_to_record(schedule: Schedule) -> Dict:
+    """Persisted form of a Schedule; the room is stored by id"""
+    return {
+        'schedule_id': schedule.schedule_id,
+        'course_name': schedule.course_name,
+        'course_code': schedule.course_code,
+        'lecturer_name': schedule.lecturer_name,
+        'day': schedule.day.name,
+        'start_time': schedule.time_slot.start_time.isoformat(),
+        'end_time': schedule.time_slot.end_time.isoformat(),
+        'room_id': schedule.room.room_id,
+        'num_students': schedule.num_students,
+        'krs_id': schedule.krs_id,
+        'created_at': schedule.created_at.isoformat(),
+        'updated_at': schedule.updated_at.isoformat(),
+    }
+
+
+def schedule_from_record(record: Dict, rooms: Dict[str, Room]) -> Schedule:
+    """Rebuild a Schedule from its persisted form, raises ValueError for unknown rooms"""
+    room = rooms.get(record['room_id'])
+    if room is None:
+        raise ValueError(f"Room {record['room_id']} not found")
+    created_at = datetime.fromisoformat(record['created_at'])
+    return Schedule(
+        schedule_id=record['schedule_id'],
+        course_name=record['course_name'],
+        course_code=record['course_code'],
+        lecturer_name=record['lecturer_name'],
+        day=DayOfWeek[record['day']],
+        time_slot=TimeSlot(time.fromisoformat(record['start_time']),
+                           time.fromisoformat(record['end_time'])),
+        room=room,
+        num_students=record['num_students'],
+        krs_id=record['krs_id'],
+        created_at=created_at,
+        # Never-updated schedules share their creation timestamp
+        updated_at=(created_at if record['updated_at'] == record['created_at']
+                    else datetime.fromisoformat(record['updated_at'])),
+    )
+
+
+def entry_to_record(entry: Tuple) -> List:
+    """Persisted form of a SchedulingService journal entry"""
+    action, value = entry
+    if action == 'room':
+        return ['room', room_to_record(value)]
+    if action == 'put':
+        return ['put', schedule_to_record(value)]
+    return ['delete', value]
+
+
+def fsync_directory(directory: str) -> None:
+    """Make renames and new files in directory durable (no-op where unsupported)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ============================================================================
+# WRITE-AHEAD LOG
+# ============================================================================
+
+class WriteAheadLog:
+    """
+    Append-only log of journal groups, one JSON line per group:
+        {"seq": 42, "ops": [["put", {...}], ["delete", "SCH001"]]}
+
+    The log is split into segment files named after the first sequence
+    number they may hold; every open() and rotate() starts a new segment.
+    A line torn by a crash is therefore the last line of its segment: read()
+    cuts it off, so a whole group is either replayed or dropped.
+
+    Each append reaches the OS before it returns, so a process crash loses
+    nothing. fsync is batched (group commit): with sync_interval > 0 a
+    background thread syncs at most every sync_interval seconds, bounding
+    what a power loss can take; with sync_interval == 0 every append is
+    synced before it returns.
+    """
+
+    SEGMENT_FORMAT = 'wal-{:020d}.log'
+
+    def __init__(self, directory: str, sync_interval: float = 0.05):
+        if sync_interval < 0:
+            raise ValueError("sync_interval must be >= 0")
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.sequence = 0
+        self.syncs = 0
+        self._file = None
+        self._dirty = False
+        self._mutex = threading.Lock()       # guards the open segment
+        self._sync_lock = threading.Lock()   # keeps the segment open during fsync
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def segments(self) -> List[str]:
+        """Segment files, oldest first"""
+        return sorted(glob.glob(os.path.join(self.directory, 'wal-*.log')))
+
+    def read(self, after: int = 0) -> Iterator[Tuple[int, List]]:
+        """Yield (seq, ops) for every complete group with seq > after"""
+        for path in self.segments():
+            torn_at = None
+            with open(path, 'rb') as segment:
+                offset = 0
+                for line in segment:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("unterminated record")
+                        group = json.loads(line)
+                    except ValueError:
+                        torn_at = offset
+                        break
+                    offset += len(line)
+                    self.sequence = max(self.sequence, group['seq'])
+                    if group['seq'] > after:
+                        yield group['seq'], group['ops']
+            if torn_at is not None:
+                # Cut the partial write so later appends to this segment stay readable
+                logger.warning(f"⚠️  Torn WAL record in {path} at byte {torn_at}, truncating")
+                os.truncate(path, torn_at)
+
+    def open(self) -> None:
+        """Start a fresh segment and the background flusher"""
+        with self._mutex:
+            self._open_segment()
+        if self.sync_interval > 0 and self._flusher is None:
+            self._stopped.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name='wal-flusher',
+                                             daemon=True)
+            self._flusher.start()
+
+    def append(self, ops: List) -> int:
+        """Write one group and return its sequence number"""
+        with self._mutex:
+            if self._file is None:
+                raise RuntimeError("Write-ahead log is not open")
+            self.sequence += 1
+            line = json.dumps({'seq': self.sequence, 'ops': ops}, separators=(',', ':'))
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._dirty = True
+            sequence = self.sequence
+        if self.sync_interval == 0:
+            self.sync()
+        return sequence
+
+    def sync(self) -> None:
+        """fsync everything appended so far"""
+        with self._sync_lock:
+            with self._mutex:
+                if not self._dirty or self._file is None:
+                    return
+                self._dirty = False
+                fd = self._file.fileno()
+            # Appends go on while the disk syncs; the next sync picks them up
+            os.fsync(fd)
+            self.syncs += 1
+
+    def rotate(self) -> List[str]:
+        """Sync and close the current segment, start a new one; returns the older segments"""
+        with self._sync_lock, self._mutex:
+            older = self.segments()
+            self._close_segment()
+            current = self._open_segment()
+        return [path for path in older if path != current]
+
+    def close(self) -> None:
+        """Stop the flusher, sync and close the open segment"""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._sync_lock, self._mutex:
+            self._close_segment()
+
+    def _open_segment(self) -> str:
+        path = os.path.join(self.directory, self.SEGMENT_FORMAT.format(self.sequence + 1))
+        self._file = open(path, 'a', encoding='utf-8')
+        fsync_directory(self.directory)
+        return path
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        if self._dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self.syncs += 1
+        self._file.close()
+        self._file = None
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.wait(self.sync_interval):
+            try:
+                self.sync()
+            except OSError as e:
+                logger.error(f"❌ WAL sync failed: {e}")
+
+
+# ============================================================================
+# DURABLE STORE
+# ============================================================================
+
+class DurableStore:
+    """
+    Snapshot + write-ahead log persistence for one SchedulingService.
+
+    open() recovers the service from disk and then installs the store as
+    its journal. After checkpoint_every journaled groups a compacted
+    snapshot is written in the background; checkpoint() forces one. The
+    snapshot records the last sequence number it contains, so a crash
+    between writing it and deleting the old segments replays nothing twice.
+    """
+
+    SNAPSHOT_FILE = 'snapshot.json'
+
+    def __init__(self, directory: str, sync_interval: float = 0.05,
+                 checkpoint_every: Optional[int] = 10000):
+        if checkpoint_every is not None and checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be >= 1 or None")
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.wal = WriteAheadLog(directory, sync_interval)
+        self.service: Optional[SchedulingService] = None
+        self._since_checkpoint = 0
+        self._checkpoint_lock = threading.Lock()
+        self._checkpointer: Optional[threading.Thread] = None
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT_FILE)
+
+    def open(self, service: SchedulingService) -> Dict:
+        """
+        Load the snapshot and replay the log into an empty service, then
+        journal its changes. Returns recovery statistics.
+        """
+        if self.service is not None:
+            raise RuntimeError("DurableStore is already open")
+        if service.schedules or service.rooms:
+            raise ValueError("DurableStore.open() needs an empty SchedulingService")
+        os.makedirs(self.directory, exist_ok=True)
+
+        start = timer.perf_counter()
+        sequence, rooms, schedules = self._load_snapshot(service)
+        groups, operations = self._replay(service, sequence)
+        stats = {
+            'snapshot_rooms': rooms,
+            'snapshot_schedules': schedules,
+            'replayed_groups': groups,
+            'replayed_operations': operations,
+            'sequence': self.wal.sequence,
+            'seconds': timer.perf_counter() - start,
+        }
+        self._since_checkpoint = groups
+
+        self.wal.open()
+        self.service = service
+        service.journal = self
+        logger.info(f"✅ Recovered {len(service.rooms)} room(s) and "
+                    f"{len(service.schedules)} schedule(s) from {self.directory} "
+                    f"({groups} log group(s) replayed, {stats['seconds']:.2f}s)")
+        return stats
+
+    def append(self, entries: List[Tuple]) -> None:
+        """SchedulingService journal hook: log one committed change"""
+        self.wal.append([entry_to_record(entry) for entry in entries])
+        self._since_checkpoint += 1
+        if (self.checkpoint_every is not None and self._since_checkpoint >= self.checkpoint_every
+                and self._checkpointer is None):
+            # The caller holds the service's write lock; checkpoint() waits for it
+            self._checkpointer = threading.Thread(target=self._background_checkpoint,
+                                                  name='schedule-checkpoint', daemon=True)
+            self._checkpointer.start()
+
+    def checkpoint(self) -> int:
+        """Write a compacted snapshot and drop the log it covers; returns its sequence"""
+        if self.service is None:
+            raise RuntimeError("DurableStore is not open")
+        # Appends happen under the write lock, so the read lock freezes the log
+        # position together with the state. It is taken before the checkpoint
+        # lock so a writer calling checkpoint() cannot deadlock with the
+        # background checkpoint.
+        lock = self.service.lock
+        lock.acquire_read()
+        try:
+            self._checkpoint_lock.acquire()
+            rooms = list(self.service.rooms.values())
+            schedules = list(self.service.schedules.values())
+            sequence = self.wal.sequence
+            covered = self.wal.rotate()
+            self._since_checkpoint = 0
+        finally:
+            lock.release_read()
+
+        try:
+            snapshot = {
+                'sequence': sequence,
+                'rooms': [room_to_record(room) for room in rooms],
+                'schedules': [schedule_to_record(schedule) for schedule in schedules],
+            }
+            temporary = self.snapshot_path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as handle:
+                json.dump(snapshot, handle, separators=(',', ':'))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.snapshot_path)
+            fsync_directory(self.directory)
+
+            for path in covered:
+                os.remove(path)
+        finally:
+            self._checkpoint_lock.release()
+        logger.info(f"✅ Checkpoint at seq {sequence}: {len(rooms)} room(s), "
+                    f"{len(schedules)} schedule(s)")
+        return sequence
+
+    def close(self, checkpoint: bool = False) -> None:
+        """Detach from the service and sync the log (optionally checkpoint first)"""
+        if self.service is None:
+            return
+        checkpointer = self._checkpointer
+        if checkpointer is not None:
+            checkpointer.join()
+        if checkpoint:
+            self.checkpoint()
+        self.service.journal = None
+        self.service = None
+        self.wal.close()
+
+    def _background_checkpoint(self) -> None:
+        try:
+            self.checkpoint()
+        except (OSError, RuntimeError) as e:
+            logger.error(f"❌ Checkpoint failed: {e}")
+        finally:
+            self._checkpointer = None
+
+    def _load_snapshot(self, service: SchedulingService) -> Tuple[int, int, int]:
+        """Load snapshot.json into the service; returns (sequence, rooms, schedules)"""
+        if not os.path.exists(self.snapshot_path):
+            return 0, 0, 0
+        with open(self.snapshot_path, encoding='utf-8') as handle:
+            snapshot = json.load(handle)
+        for record in snapshot['rooms']:
+            service.add_room(room_from_record(record))
+        schedules = [schedule_from_record(record, service.rooms)
+                     for record in snapshot['schedules']]
+        # A rejected row would be lost for good at the next checkpoint
+        rejected = [result for result in service.create_schedules_bulk(schedules)
+                    if not result.success]
+        if rejected:
+            for result in rejected:
+                logger.error(f"❌ Snapshot row {result.index} ({result.schedule_id}) "
+                             f"rejected: {result.error}")
+            raise RuntimeError(f"Snapshot load failed: {len(rejected)} schedule(s) rejected")
+        self.wal.sequence = snapshot['sequence']
+        return snapshot['sequence'], len(snapshot['rooms']), len(schedules)
+
+    def _replay(self, service: SchedulingService, after: int) -> Tuple[int, int]:
+        """Re-apply the logged groups after the snapshot as one batch"""
+        pending = [ops for _, ops in self.wal.read(after)]
+        if not pending:
+            return 0, 0
+        with service.batch() as batch:
+            for ops in pending:
+                for action, value in ops:
+                    self._apply(service, action, value)
+        if not batch.committed:
+            raise RuntimeError(f"WAL replay failed: {'; '.join(batch.errors[:5])}")
+        return len(pending), sum(len(ops) for ops in pending)
+
+    @staticmethod
+    def _apply(service: SchedulingService, action: str, value) -> None:
+        if action == 'room':
+            service.add_room(room_from_record(value))
+        elif action == 'delete':
+            service.delete_schedule(value)
+        else:
+            schedule = schedule_from_record(value, service.rooms)
+            if schedule.schedule_id in service.schedules:
+                service.update_schedule(schedule.schedule_id, schedule)
+                # update_schedule stamps the current time; keep the logged one
+                schedule.created_at = datetime.fromisoformat(value['created_at'])
+                schedule.updated_at = datetime.fromisoformat(value['updated_at'])
+            else:
+                service.create_schedule(schedule)
+
+
+# ============================================================================
+# SQLITE REPOSITORY
+# ============================================================================
+
+class SQLiteScheduleRepository:
+    """
+    Rooms and schedules in a SQLite database, for datasets that do not fit in
+    memory and for cold starts that should not rebuild every index.
+
+    Schedules are stored with integer day/minute columns and a normalized
+    lecturer_key, indexed on (day, room_id, start_min) and
+    (day, lecturer_key, start_min). detect_conflicts() finds room and
+    lecturer conflicts with a range self-join on those indexes and returns
+    the same ScheduleConflict list, in the same order, as
+    ConflictDetectionEngine over list_schedules().
+
+    The repository can also be set as SchedulingService.journal to mirror
+    an in-memory service; load_into() fills a service from it.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rooms (
+            room_id TEXT PRIMARY KEY,
+            room_name TEXT NOT NULL,
+            capacity INTEGER NOT NULL,
+            building TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS schedules (
+            schedule_id TEXT PRIMARY KEY,
+            position INTEGER NOT NULL UNIQUE,
+            course_name TEXT NOT NULL,
+            course_code TEXT NOT NULL,
+            lecturer_name TEXT NOT NULL,
+            lecturer_key TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            start_min INTEGER NOT NULL,
+            end_min INTEGER NOT NULL,
+            whole_minutes INTEGER NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            room_id TEXT NOT NULL REFERENCES rooms(room_id),
+            num_students INTEGER NOT NULL,
+            krs_id TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_schedules_room ON schedules(day, room_id, start_min);
+        CREATE INDEX IF NOT EXISTS idx_schedules_lecturer ON schedules(day, lecturer_key, start_min);
+        CREATE INDEX IF NOT EXISTS idx_schedules_course ON schedules(course_code);
+    """
+
+    COLUMNS = ('schedule_id, position, course_name, course_code, lecturer_name, lecturer_key, '
+               'day, start_min, end_min, whole_minutes, start_time, end_time, room_id, '
+               'num_students, krs_id, created_at, updated_at')
+
+    # Upserts keep the original position, like an update in SchedulingService
+    UPSERT = (f"INSERT INTO schedules ({COLUMNS}) "
+              f"VALUES ({', '.join('?' * 17)}) "
+              "ON CONFLICT(schedule_id) DO UPDATE SET "
+              "course_name = excluded.course_name, course_code = excluded.course_code, "
+              "lecturer_name = excluded.lecturer_name, lecturer_key = excluded.lecturer_key, "
+              "day = excluded.day, start_min = excluded.start_min, end_min = excluded.end_min, "
+              "whole_minutes = excluded.whole_minutes, start_time = excluded.start_time, "
+              "end_time = excluded.end_time, room_id = excluded.room_id, "
+              "num_students = excluded.num_students, krs_id = excluded.krs_id, "
+              "created_at = excluded.created_at, updated_at = excluded.updated_at")
+
+    # Every overlapping pair once: b is the booking that starts later (or at
+    # the same minute but was inserted later) and starts before a ends, so
+    # b is found with a range scan of the (day, <key>, start_min) index
+    PAIRS = """
+        SELECT a.position, b.position, a.schedule_id, b.schedule_id,
+               a.whole_minutes AND b.whole_minutes
+        FROM schedules a
+        JOIN schedules b
+          ON b.day = a.day AND b.{key} = a.{key}
+         AND b.start_min >= a.start_min AND b.start_min < a.end_min
+        WHERE a.start_min < b.end_min
+          AND (b.start_min > a.start_min OR b.position > a.position)
+          {day_filter}
+    """
+
+    # Listing every day lets room and lecturer lookups use the (day, ...) indexes
+    ALL_DAYS = str(tuple(day.value for day in DayOfWeek))
+
+    # SQLite's default limit on host parameters is 999
+    CHUNK_SIZE = 500
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(self.SCHEMA)
+        self._lock = threading.RLock()
+        self._rooms: Dict[str, Room] = {
+            row[0]: Room(*row) for row in self._connection.execute(
+                "SELECT room_id, room_name, capacity, building FROM rooms")
+        }
+        self._next_position = self._connection.execute(
+            "SELECT COALESCE(MAX(position), 0) + 1 FROM schedules").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> 'SQLiteScheduleRepository':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Rooms
+    def add_room(self, room: Room) -> bool:
+        """Store a room, returns False if its id is taken"""
+        with self._lock, self._connection:
+            if room.room_id in self._rooms:
+                logger.warning(f"Room {room.room_id} already exists")
+                return False
+            self._connection.execute(
+                "INSERT INTO rooms (room_id, room_name, capacity, building) VALUES (?, ?, ?, ?)",
+                (room.room_id, room.room_name, room.capacity, room.building))
+            self._rooms[room.room_id] = room
+        return True
+
+    def get_room(self, room_id: str) -> Optional[Room]:
+        """Get room by ID"""
+        return self._rooms.get(room_id)
+
+    def list_rooms(self) -> List[Room]:
+        """List all rooms"""
+        return list(self._rooms.values())
+
+    # Schedules
+    def save_schedule(self, schedule: Schedule) -> None:
+        """Insert or replace a schedule; raises ValueError for unknown rooms"""
+        self.save_schedules([schedule])
+
+    def save_schedules(self, schedules: Iterable[Schedule]) -> int:
+        """Insert or replace many schedules in one transaction, returns the count"""
+        with self._lock, self._connection:
+            rows = [self._schedule_row(schedule) for schedule in schedules]
+            self._connection.executemany(self.UPSERT, rows)
+        return len(rows)
+
+    def delete_schedule(self, schedule_id: str) -> bool:
+        """Delete a schedule, returns False if it did not exist"""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM schedules WHERE schedule_id = ?", (schedule_id,))
+        return cursor.rowcount > 0
+
+    def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        """Get schedule by ID"""
+        schedules = self._query("WHERE schedule_id = ?", (schedule_id,))
+        return schedules[0] if schedules else None
+
+    def list_schedules(self) -> List[Schedule]:
+        """All schedules in insertion order"""
+        return self._query("ORDER BY position")
+
+    def get_schedules_by_lecturer(self, lecturer_name: str) -> List[Schedule]:
+        """Get all schedules for a lecturer (case-insensitive)"""
+        return self._query(f"WHERE day IN {self.ALL_DAYS} AND lecturer_key = ? ORDER BY position",
+                           (lecturer_name.lower(),))
+
+    def get_schedules_by_room(self, room_id: str) -> List[Schedule]:
+        """Get all schedules for a room"""
+        return self._query(f"WHERE day IN {self.ALL_DAYS} AND room_id = ? ORDER BY position",
+                           (room_id,))
+
+    def get_schedules_by_day(self, day: DayOfWeek) -> List[Schedule]:
+        """Get all schedules for a day"""
+        return self._query("WHERE day = ? ORDER BY position", (day.value,))
+
+    def count_schedules(self) -> int:
+        """Number of stored schedules"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+
+    # Conflicts
+    def detect_conflicts(self, day: Optional[DayOfWeek] = None) -> List[ScheduleConflict]:
+        """
+        Capacity, room and lecturer conflicts computed in SQL (optionally for
+        one day). Only the schedules involved are loaded into memory.
+        """
+        params: Tuple = () if day is None else (day.value,)
+        with self._lock:
+            capacity_ids = [row[0] for row in self._connection.execute(
+                "SELECT s.schedule_id FROM schedules s JOIN rooms r USING (room_id) "
+                "WHERE s.num_students > r.capacity "
+                f"{'' if day is None else 'AND s.day = ?'} ORDER BY s.position", params)]
+            pairs = []
+            for kind, key in enumerate(('room_id', 'lecturer_key')):
+                query = self.PAIRS.format(key=key,
+                                          day_filter='' if day is None else 'AND a.day = ?')
+                for position_a, position_b, id_a, id_b, whole in self._connection.execute(
+                        query, params):
+                    if position_a < position_b:
+                        pairs.append((position_a, position_b, kind, id_a, id_b, whole))
+                    else:
+                        pairs.append((position_b, position_a, kind, id_b, id_a, whole))
+            pairs.sort()
+            needed = set(capacity_ids)
+            needed.update(pair[3] for pair in pairs)
+            needed.update(pair[4] for pair in pairs)
+            schedules = self._load_by_id(needed)
+
+        conflicts = ConflictDetectionEngine._capacity_conflicts(
+            [schedules[schedule_id] for schedule_id in capacity_ids])
+        pair_types = ConflictDetectionEngine._PAIR_TYPES
+        for _, _, kind, id_a, id_b, whole in pairs:
+            first, second = schedules[id_a], schedules[id_b]
+            # Minutes are rounded outwards for times with seconds; confirm exactly
+            if not whole and not first.time_slot.overlaps_with(second.time_slot):
+                continue
+            conflicts.append(ConflictDetectionEngine._pair_conflict(
+                pair_types[kind], first, second))
+        return conflicts
+
+    # SchedulingService integration
+    def append(self, entries: List[Tuple]) -> None:
+        """SchedulingService journal hook: mirror one committed change"""
+        with self._lock, self._connection:
+            for action, value in entries:
+                if action == 'room':
+                    if value.room_id not in self._rooms:
+                        self._connection.execute(
+                            "INSERT INTO rooms (room_id, room_name, capacity, building) "
+                            "VALUES (?, ?, ?, ?)",
+                            (value.room_id, value.room_name, value.capacity, value.building))
+                        self._rooms[value.room_id] = value
+                elif action == 'put':
+                    self._connection.execute(self.UPSERT, self._schedule_row(value))
+                else:
+                    self._connection.execute(
+                        "DELETE FROM schedules WHERE schedule_id = ?", (value,))
+
+    def load_into(self, service: SchedulingService) -> List[BulkResult]:
+        """Fill a service with every stored room and schedule"""
+        for room in self.list_rooms():
+            service.add_room(room)
+        return service.create_schedules_bulk(self.list_schedules())
+
+    def _schedule_row(self, schedule: Schedule) -> Tuple:
+        if schedule.room.room_id not in self._rooms:
+            raise ValueError(f"Room {schedule.room.room_id} not found")
+        slot = schedule.time_slot
+        position = self._next_position
+        self._next_position += 1
+        return (schedule.schedule_id, position, schedule.course_name, schedule.course_code,
+                schedule.lecturer_name, schedule.lecturer_key, schedule.day.value,
+                slot.start_minute, slot.end_minute, int(slot.whole_minutes),
+                slot.start_time.isoformat(), slot.end_time.isoformat(), schedule.room.room_id,
+                schedule.num_students, schedule.krs_id, schedule.created_at.isoformat(),
+                schedule.updated_at.isoformat())
+
+    def _query(self, clause: str, params: Tuple = ()) -> List[Schedule]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT schedule_id, course_name, course_code, lecturer_name, day, start_time, "
+                "end_time, room_id, num_students, krs_id, created_at, updated_at "
+                f"FROM schedules {clause}", params).fetchall()
+        return [self._schedule_from_row(row) for row in rows]
+
+    def _load_by_id(self, schedule_ids: Set[str]) -> Dict[str, Schedule]:
+        ids = list(schedule_ids)
+        schedules: Dict[str, Schedule] = {}
+        for start in range(0, len(ids), self.CHUNK_SIZE):
+            chunk = ids[start:start + self.CHUNK_SIZE]
+            for schedule in self._query(
+                    f"WHERE schedule_id IN ({', '.join('?' * len(chunk))})", tuple(chunk)):
+                schedules[schedule.schedule_id] = schedule
+        return schedules
+
+    def _schedule_from_row(self, row: Tuple) -> Schedule:
+        (schedule_id, course_name, course_code, lecturer_name, day, start_time, end_time,
+         room_id, num_students, krs_id, created_at, updated_at) = row
+        created = datetime.fromisoformat(created_at)
+        return Schedule(
+            schedule_id=schedule_id,
+            course_name=course_name,
+            course_code=course_code,
+            lecturer_name=lecturer_name,
+            day=DayOfWeek(day),
+            time_slot=TimeSlot(time.fromisoformat(start_time), time.fromisoformat(end_time)),
+            room=self._rooms[room_id],
+            num_students=num_students,
+            krs_id=krs_id,
+            created_at=created,
+            updated_at=created if updated_at == created_at else datetime.fromisoformat(updated_at),
+        )
+
+
+# ============================================================================
+# COLUMNAR SNAPSHOT (MMAP)
+# ============================================================================
+
+COLUMNAR_MAGIC = b'SCHCOL01'
+COLUMNAR_FORMAT_VERSION = 1
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Integer columns, one value per schedule ('i' = int32, 'q' = int64)
+COLUMNAR_COLUMNS = {
+    'day': 'i', 'start': 'i', 'end': 'i', 'room': 'i', 'lecturer': 'i',
+    'num_students': 'i', 'lecturer_name': 'i', 'course_name': 'i', 'course_code': 'i',
+    'krs_id': 'i', 'created_at': 'q', 'updated_at': 'q',
+}
+
+
+def _seconds_of_day(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _columnar_data_start(header_length: int) -> int:
+    """Offset of the first section: after magic, length and header, 8-byte aligned"""
+    return -(-(len(COLUMNAR_MAGIC) + 8 + header_length) // 8) * 8
+
+
+class _StringDictionary:
+    """Assigns dense integer codes to strings while writing a columnar snapshot"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        return self.codes.setdefault(value, len(self.codes))
+
+    @property
+    def values(self) -> List[str]:
+        return list(self.codes)
+
+
+def _string_sections(values: List[str]) -> Tuple[bytes, bytes]:
+    """Offsets (int64, len + 1 entries) and UTF-8 data of a string list"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array('q', [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    return offsets.tobytes(), b''.join(encoded)
+
+
+def write_columnar_snapshot(path: str, snapshot: ScheduleSnapshot) -> int:
+    """
+    Export a ScheduleSnapshot (e.g. service.snapshot()) as a columnar binary
+    file for ColumnarSnapshot; returns its size in bytes.
+
+    Times are stored as seconds of the day, so sub-second parts are dropped.
+    Strings are dictionary-encoded; schedule ids are stored as one string
+    column. The file is written to a temporary name and renamed into place.
+    """
+    schedules = snapshot.list_schedules()
+    rooms: Dict[str, Room] = {room.room_id: room for room in snapshot.list_rooms()}
+    for schedule in schedules:
+        rooms.setdefault(schedule.room.room_id, schedule.room)
+    room_codes = {room_id: code for code, room_id in enumerate(rooms)}
+
+    dictionaries = {name: _StringDictionary() for name in
+                    ('lecturer', 'lecturer_name', 'course_name', 'course_code', 'krs_id')}
+    columns = {name: array(typecode) for name, typecode in COLUMNAR_COLUMNS.items()}
+    for schedule in schedules:
+        slot = schedule.time_slot
+        columns['day'].append(schedule.day.value)
+        columns['start'].append(_seconds_of_day(slot.start_time))
+        columns['end'].append(_seconds_of_day(slot.end_time))
+        columns['room'].append(room_codes[schedule.room.room_id])
+        columns['lecturer'].append(dictionaries['lecturer'].code(schedule.lecturer_key))
+        columns['num_students'].append(schedule.num_students)
+        for name in ('lecturer_name', 'course_name', 'course_code', 'krs_id'):
+            columns[name].append(dictionaries[name].code(getattr(schedule, name)))
+        columns['created_at'].append((schedule.created_at - _EPOCH) // _MICROSECOND)
+        columns['updated_at'].append((schedule.updated_at - _EPOCH) // _MICROSECOND)
+
+    sections: Dict[str, Tuple[str, bytes]] = {
+        name: (column.typecode, column.tobytes()) for name, column in columns.items()}
+    sections['room_capacity'] = ('i', array('i', [room.capacity for room in rooms.values()])
+                                 .tobytes())
+    strings = {f'dict.{name}': dictionary.values for name, dictionary in dictionaries.items()}
+    strings['schedule_id'] = [schedule.schedule_id for schedule in schedules]
+    strings['room_id'] = list(rooms)
+    strings['room_name'] = [room.room_name for room in rooms.values()]
+    strings['building'] = [room.building for room in rooms.values()]
+    for name, values in strings.items():
+        offsets, data = _string_sections(values)
+        sections[f'{name}.offsets'] = ('q', offsets)
+        sections[f'{name}.data'] = ('B', data)
+
+    # Magic, header length, JSON header, then the sections, each 8-byte
+    # aligned; section offsets are relative to the end of the padded header
+    layout, offset = {}, 0
+    for name, (typecode, data) in sections.items():
+        layout[name] = [typecode, offset, len(data)]
+        offset += -(-len(data) // 8) * 8
+    header = {
+        'format_version': COLUMNAR_FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'snapshot_version': snapshot.version,
+        'event_id': snapshot.event_id,
+        'rows': len(schedules),
+        'rooms': len(rooms),
+        'time_unit': 'second',
+        'sections': layout,
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = _columnar_data_start(len(header_bytes))
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(COLUMNAR_MAGIC)
+        handle.write(struct.pack('<Q', len(header_bytes)))
+        handle.write(header_bytes)
+        handle.write(b'\0' * (data_start - handle.tell()))
+        for typecode, data in sections.values():
+            handle.write(data)
+            handle.write(b'\0' * (-len(data) % 8))
+        size = handle.tell()
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return size
+
+
+class ColumnarSnapshot:
+    """
+    Read-only, memory-mapped view of a file written by write_columnar_snapshot.
+
+    Opening maps the file and parses a small header; integer columns are
+    zero-copy memoryviews over the mapping and string dictionaries are
+    decoded on first use. Conflict detection and the dashboard aggregates
+    work on the columns directly; Schedule objects are only built for rows
+    that are returned (e.g. the schedules of a conflict).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a columnar schedule snapshot")
+        (header_length,) = struct.unpack_from('<Q', self._map, len(COLUMNAR_MAGIC))
+        start = len(COLUMNAR_MAGIC) + 8
+        header = json.loads(self._map[start:start + header_length])
+        if header['format_version'] != COLUMNAR_FORMAT_VERSION or \
+                header['byteorder'] != sys.byteorder:
+            self._map.close()
+            raise ValueError(f"Unsupported columnar snapshot: version "
+                             f"{header['format_version']}, {header['byteorder']}-endian")
+        self._data_start = _columnar_data_start(header_length)
+        self.version: int = header['snapshot_version']
+        self.event_id = header.get('event_id')
+        self.rows: int = header['rows']
+        self.room_count: int = header['rooms']
+        self._sections = header['sections']
+        self._buffer = memoryview(self._map)
+        self._views: List[memoryview] = [self._buffer]
+        self._strings: Dict[str, List[str]] = {}
+        self._offsets: Dict[str, memoryview] = {}
+        # The file never changes, so detection results are computed once
+        self._capacity_rows: Optional[List[int]] = None
+        self._pairs: Optional[List[Tuple[int, int, int]]] = None
+        self._rooms: Optional[List[Room]] = None
+
+        for name in COLUMNAR_COLUMNS:
+            setattr(self, name, self.column(name))
+        self.room_capacity = self.column('room_capacity')
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """Release the column views and unmap the file"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self) -> 'ColumnarSnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a section"""
+        typecode, offset, length = self._sections[name]
+        offset += self._data_start
+        view = self._buffer[offset:offset + length].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def strings(self, name: str) -> List[str]:
+        """Decoded string section (cached)"""
+        values = self._strings.get(name)
+        if values is None:
+            count = len(self._string_offsets(name)) - 1
+            values = self._strings[name] = [self._string_at(name, index)
+                                            for index in range(count)]
+        return values
+
+    def schedule_id(self, row: int) -> str:
+        """Id of one row, without decoding the whole id column"""
+        return self._string_at('schedule_id', row)
+
+    # Rows as objects
+    def list_rooms(self) -> List[Room]:
+        """All rooms, in room code order"""
+        if self._rooms is None:
+            self._rooms = [Room(room_id, room_name, capacity, building) for
+                           room_id, room_name, capacity, building in zip(
+                               self.strings('room_id'), self.strings('room_name'),
+                               self.room_capacity, self.strings('building'))]
+        return self._rooms
+
+    def schedule(self, row: int) -> Schedule:
+        """Materialize one row as a Schedule"""
+        start, end = self.start[row], self.end[row]
+        krs_code = self.krs_id[row]
+        created_at = _EPOCH + self.created_at[row] * _MICROSECOND
+        updated_at = created_at if self.updated_at[row] == self.created_at[row] else \
+            _EPOCH + self.updated_at[row] * _MICROSECOND
+        return Schedule(
+            schedule_id=self.schedule_id(row),
+            course_name=self.strings('dict.course_name')[self.course_name[row]],
+            course_code=self.strings('dict.course_code')[self.course_code[row]],
+            lecturer_name=self.strings('dict.lecturer_name')[self.lecturer_name[row]],
+            day=DayOfWeek(self.day[row]),
+            time_slot=TimeSlot(time(start // 3600, start // 60 % 60, start % 60),
+                               time(end // 3600, end // 60 % 60, end % 60)),
+            room=self.list_rooms()[self.room[row]],
+            num_students=self.num_students[row],
+            krs_id=None if krs_code < 0 else self.strings('dict.krs_id')[krs_code],
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+    def iter_schedules(self) -> Iterator[Schedule]:
+        """Materialize every row lazily, in export order"""
+        return (self.schedule(row) for row in range(self.rows))
+
+    # Conflicts
+    def capacity_violations(self) -> List[int]:
+        """Rows whose num_students exceeds the room capacity"""
+        if self._capacity_rows is None:
+            capacity = self.room_capacity
+            self._capacity_rows = [row for row, (students, room)
+                                   in enumerate(zip(self.num_students, self.room))
+                                   if students > capacity[room]]
+        return self._capacity_rows
+
+    def conflict_pairs(self) -> List[Tuple[int, int, int]]:
+        """
+        Sorted (i, j, kind) row pairs with kind 0 = room and 1 = lecturer,
+        found with the same per-day sweep line as ConflictDetectionEngine
+        """
+        if self._pairs is not None:
+            return self._pairs
+        partitions: Dict[int, List] = defaultdict(list)
+        rows = zip(self.start, self.end, range(self.rows), self.room, self.lecturer)
+        for day, partition_row in zip(self.day, rows):
+            partitions[day].append(partition_row)
+        pairs = [pair for day in sorted(partitions)
+                 for pair in _iter_partition_pairs(partitions[day])]
+        pairs.sort()
+        self._pairs = pairs
+        return pairs
+
+    def detect_conflicts(self) -> List[ScheduleConflict]:
+        """
+        The ScheduleConflict list ConflictDetectionEngine returns for the
+        exported schedules; only the rows involved are materialized.
+        """
+        cache: Dict[int, Schedule] = {}
+
+        def row_schedule(row: int) -> Schedule:
+            schedule = cache.get(row)
+            if schedule is None:
+                schedule = cache[row] = self.schedule(row)
+            return schedule
+
+        conflicts = ConflictDetectionEngine._capacity_conflicts(
+            [row_schedule(row) for row in self.capacity_violations()])
+        pair_types = ConflictDetectionEngine._PAIR_TYPES
+        conflicts.extend(ConflictDetectionEngine._pair_conflict(
+            pair_types[kind], row_schedule(i), row_schedule(j))
+            for i, j, kind in self.conflict_pairs())
+        return conflicts
+
+    def get_conflict_summary(self) -> Dict:
+        """ConflictDetectionEngine.get_conflict_summary, computed from the columns"""
+        capacity_rows = self.capacity_violations()
+        pairs = self.conflict_pairs()
+        by_type: Dict[str, int] = defaultdict(int)
+        affected: Set[int] = set(capacity_rows)
+        if capacity_rows:
+            by_type[ConflictType.CAPACITY_EXCEEDED.value] = len(capacity_rows)
+        for i, j, kind in pairs:
+            by_type[ConflictDetectionEngine._PAIR_TYPES[kind].value] += 1
+            affected.add(i)
+            affected.add(j)
+        by_severity = {}
+        if capacity_rows:
+            by_severity['high'] = len(capacity_rows)
+        if pairs:
+            by_severity['critical'] = len(pairs)
+        return {
+            'total_conflicts': len(capacity_rows) + len(pairs),
+            'by_type': dict(by_type),
+            'by_severity': by_severity,
+            'affected_schedules': [self.schedule_id(row) for row in affected],
+        }
+
+    # Dashboard aggregates
+    def count_schedules_by_day(self) -> Dict[str, int]:
+        """Count schedules by day of week"""
+        counts = Counter(self.day)
+        return {day.name: counts.get(day.value, 0) for day in DayOfWeek}
+
+    def count_schedules_by_room(self) -> Dict[str, int]:
+        """Number of schedules per room_id"""
+        counts = Counter(self.room)
+        return {room_id: counts.get(code, 0)
+                for code, room_id in enumerate(self.strings('room_id'))}
+
+    def get_dashboard_summary(self) -> Dict:
+        """DashboardService.get_dashboard_summary, computed from the columns"""
+        conflict_summary = self.get_conflict_summary()
+        counts = Counter(self.room)
+        room_utilization = {}
+        for code, room_name in enumerate(self.strings('room_name')):
+            # Same 10 slots x 5 days assumption as DashboardService
+            used_slots = counts.get(code, 0)
+            room_utilization[room_name] = {
+                'total_slots': 10 * 5,
+                'used_slots': used_slots,
+                'utilization_percent': round((used_slots / (10 * 5)) * 100, 2)
+            }
+        return {
+            'version': self.version,
+            'event_id': self.event_id,
+            'total_schedules': self.rows,
+            'total_rooms': self.room_count,
+            'total_conflicts': conflict_summary['total_conflicts'],
+            'conflict_summary': conflict_summary,
+            'schedules_by_day': self.count_schedules_by_day(),
+            'room_utilization': room_utilization,
+        }
+
+    def _string_offsets(self, name: str) -> memoryview:
+        view = self._offsets.get(name)
+        if view is None:
+            view = self._offsets[name] = self.column(f'{name}.offsets')
+        return view
+
+    def _string_at(self, name: str, index: int) -> str:
+        offsets = self._string_offsets(name)
+        start = self._sections[f'{name}.data'][1] + self._data_start
+        return self._map[start + offsets[index]:start + offsets[index + 1]].decode('utf-8')
+
+
+# ============================================================================
+# EVENT LOG (SEGMENTED, MMAP)
+# ============================================================================
+
+# One byte per record; EventType members are only ever appended, so the
+# codes of existing types never change
+EVENT_TYPE_CODES: Dict[EventType, int] = {event_type: code for code, event_type in enumerate(EventType)}
+EVENT_TYPES_BY_CODE: List[EventType] = list(EventType)
+
+
+@dataclass
+class LoggedEvent:
+    """One event read back from an EventLog; payload is a zero-copy view of the segment"""
+    offset: int
+    timestamp: float
+    event_type: EventType
+    payload: memoryview = field(repr=False)
+
+    @property
+    def data(self) -> Dict:
+        """The event data, decoded from the payload on each access"""
+        return json.loads(self.payload.tobytes())
+
+
+class _EventSegment:
+    """One segment file: its offset index and a read-only mapping, remapped as it grows"""
+
+    def __init__(self, path: str, base_offset: int):
+        self.path = path
+        self.base_offset = base_offset
+        self.offsets = array('Q')      # offset of each record
+        self.positions = array('Q')    # byte position of each record
+        self.size = 0                  # bytes of complete records
+        self._map: Optional[mmap.mmap] = None
+
+    def buffer(self, size: int) -> memoryview:
+        """A view covering at least the first `size` bytes of the file"""
+        if self._map is None or len(self._map) < size:
+            with open(self.path, 'rb') as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)
+
+    def scan(self) -> Optional[int]:
+        """Index every complete record; returns where a torn or corrupt tail starts"""
+        header = EventLog.HEADER
+        file_size = os.path.getsize(self.path)
+        position = 0
+        if file_size:
+            buffer = self.buffer(file_size)
+            while position + header.size <= file_size:
+                crc, length, offset, _, _ = header.unpack_from(buffer, position)
+                end = position + header.size + length
+                if end > file_size or zlib.crc32(buffer[position + 4:end]) != crc:
+                    break
+                self.offsets.append(offset)
+                self.positions.append(position)
+                position = end
+            buffer.release()
+        self.size = position
+        return position if position < file_size else None
+
+    def release(self) -> None:
+        """Drop the mapping (it stays alive while views handed out still use it)"""
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+
+
+class EventLog:
+    """
+    Append-only log of every event a ScheduleSubject emits, so an observer
+    or downstream system that was offline resumes from its last offset
+    instead of missing notifications. Install with service.event_log = log.
+
+    Each event gets the next offset (0, 1, 2, ...) and one binary record:
+    crc32, payload length, offset, timestamp, event type code, then the
+    event data as JSON. Records go to segment files named after their first
+    offset; a new segment starts once the active one reaches segment_bytes.
+    Reads mmap the segments and return memoryviews of the payloads, so
+    scanning and filtering by event type copy nothing; only data decodes.
+
+    replay() delivers to an observer from a consumer's committed offset and
+    commits as it goes. compact() rewrites sealed segments keeping only the
+    latest event per schedule and per conflict (offsets are kept, so they
+    become sparse); truncate() deletes sealed segments every consumer has
+    read. Durability follows WriteAheadLog: appends reach the OS at once,
+    fsync is batched every sync_interval seconds (0 = every append).
+    """
+
+    SEGMENT_FORMAT = 'events-{:020d}.log'
+    HEADER = struct.Struct('<IIQdB')    # crc32, payload length, offset, timestamp, type
+    CONSUMERS_FILE = 'consumers.json'
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024,
+                 sync_interval: float = 0.05):
+        if segment_bytes < self.HEADER.size:
+            raise ValueError(f"segment_bytes must be >= {self.HEADER.size}")
+        if sync_interval < 0:
+            raise ValueError("sync_interval must be >= 0")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.sync_interval = sync_interval
+        self.next_offset = 0
+        self.syncs = 0
+        self._segments: List[_EventSegment] = []
+        self._consumers: Dict[str, int] = {}
+        self._file = None
+        self._dirty = False
+        self._mutex = threading.Lock()           # guards appends and the segment list
+        self._sync_lock = threading.Lock()       # keeps the segment open during fsync
+        self._maintenance_lock = threading.Lock()  # one compact()/truncate() at a time
+        self._consumers_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    @property
+    def first_offset(self) -> int:
+        """Oldest offset still stored (next_offset when the log is empty)"""
+        for segment in self._segments:
+            if segment.offsets:
+                return segment.offsets[0]
+        return self.next_offset
+
+    def segments(self) -> List[str]:
+        """Segment files, oldest first"""
+        return [segment.path for segment in self._segments]
+
+    def open(self) -> 'EventLog':
+        """Index the existing segments (cutting a torn tail) and start appending"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._mutex:
+            self._segments = []
+            for path in sorted(glob.glob(os.path.join(self.directory, 'events-*.log'))):
+                segment = _EventSegment(path, int(os.path.basename(path)[7:-4]))
+                torn_at = segment.scan()
+                if torn_at is not None:
+                    logger.warning(f"⚠️  Torn event record in {path} at byte {torn_at}, truncating")
+                    segment.release()
+                    os.truncate(path, torn_at)
+                self._segments.append(segment)
+                if segment.offsets:
+                    self.next_offset = segment.offsets[-1] + 1
+            if not self._segments or self._segments[-1].size >= self.segment_bytes:
+                self._segments.append(self._new_segment())
+            self._file = open(self._segments[-1].path, 'ab')
+        consumers_path = os.path.join(self.directory, self.CONSUMERS_FILE)
+        if os.path.exists(consumers_path):
+            with open(consumers_path, encoding='utf-8') as handle:
+                self._consumers = json.load(handle)
+        if self.sync_interval > 0 and self._flusher is None:
+            self._stopped.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name='event-log-flusher',
+                                             daemon=True)
+            self._flusher.start()
+        logger.info(f"📜 Event log opened: {len(self._segments)} segment(s), "
+                    f"offsets {self.first_offset}..{self.next_offset - 1}")
+        return self
+
+    def append(self, event_type: EventType, data: Dict) -> int:
+        """Write one event and return its offset"""
+        payload = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+        record = bytearray(self.HEADER.size + len(payload))
+        record[self.HEADER.size:] = payload
+        with self._mutex:
+            if self._file is None:
+                raise RuntimeError("Event log is not open")
+            segment = self._segments[-1]
+            if segment.size >= self.segment_bytes:
+                segment = self._roll()
+            offset = self.next_offset
+            self.HEADER.pack_into(record, 0, 0, len(payload), offset, timer.time(),
+                                  EVENT_TYPE_CODES[event_type])
+            struct.pack_into('<I', record, 0, zlib.crc32(memoryview(record)[4:]))
+            self._file.write(record)
+            self._file.flush()
+            segment.offsets.append(offset)
+            segment.positions.append(segment.size)
+            segment.size += len(record)
+            self.next_offset = offset + 1
+            self._dirty = True
+        if self.sync_interval == 0:
+            self.sync()
+        return offset
+
+    def read(self, from_offset: int = 0, limit: Optional[int] = None,
+             event_types: Optional[Iterable[EventType]] = None) -> Iterator[LoggedEvent]:
+        """Yield the stored events with offset >= from_offset, oldest first"""
+        remaining = limit
+        for _, event in self._scan(from_offset, event_types):
+            if event is None:
+                continue
+            yield event
+            if remaining is not None:
+                remaining -= 1
+                if remaining <= 0:
+                    return
+
+    def read_page(self, from_offset: int, limit: int,
+                  event_types: Optional[Iterable[EventType]] = None
+                  ) -> Tuple[List[LoggedEvent], int]:
+        """
+        Up to limit events with offset >= from_offset, and the offset to read
+        the next page from: just past the last record scanned, filtered out or
+        not. Records appended during the read are left for the next page.
+        """
+        events, next_offset = [], from_offset
+        for offset, event in self._scan(from_offset, event_types):
+            next_offset = offset + 1
+            if event is not None:
+                events.append(event)
+                if len(events) >= limit:
+                    break
+        return events, next_offset
+
+    def _scan(self, from_offset: int, event_types: Optional[Iterable[EventType]]
+              ) -> Iterator[Tuple[int, Optional[LoggedEvent]]]:
+        """
+        (offset, event) of every record with offset >= from_offset in the
+        segments as they are now; event is None when event_types filters it out
+        """
+        codes = None if event_types is None else {EVENT_TYPE_CODES[t] for t in event_types}
+        with self._mutex:
+            segments = [(segment, segment.size) for segment in self._segments]
+        start = max(0, bisect_right([segment.base_offset for segment, _ in segments],
+                                    from_offset) - 1)
+        header = self.HEADER
+        for segment, size in segments[start:]:
+            if not size:
+                continue
+            buffer = segment.buffer(size)
+            offsets, positions = segment.offsets, segment.positions
+            for index in range(bisect_left(offsets, from_offset), len(offsets)):
+                position = positions[index]
+                if position >= size:
+                    break
+                _, length, offset, timestamp, code = header.unpack_from(buffer, position)
+                if codes is not None and code not in codes:
+                    yield offset, None
+                    continue
+                payload_start = position + header.size
+                yield offset, LoggedEvent(offset, timestamp, EVENT_TYPES_BY_CODE[code],
+                                          buffer[payload_start:payload_start + length])
+
+    def replay(self, observer: Observer, from_offset: Optional[int] = None,
+               consumer: Optional[str] = None, event_types: Optional[Iterable[EventType]] = None,
+               limit: Optional[int] = None, commit_every: int = 1000) -> int:
+        """
+        Deliver stored events to observer.update(), starting at from_offset or
+        else the consumer's committed offset. With a consumer, progress is
+        committed every commit_every events and at the end. Returns the offset
+        to resume from.
+        """
+        if from_offset is None:
+            from_offset = self.committed(consumer) if consumer is not None else 0
+        head = self.next_offset
+        resume_at, delivered = from_offset, 0
+        for event in self.read(from_offset, limit, event_types):
+            observer.update(event.event_type, event.data)
+            resume_at = event.offset + 1
+            delivered += 1
+            if consumer is not None and delivered % commit_every == 0:
+                self.commit(consumer, resume_at)
+        if limit is None or delivered < limit:
+            # Everything up to head was seen, including events filtered out
+            resume_at = max(resume_at, head)
+        if consumer is not None:
+            self.commit(consumer, resume_at)
+        logger.info(f"⏪ Replayed {delivered} events from offset {from_offset}"
+                    + (f" for consumer '{consumer}'" if consumer is not None else ""))
+        return resume_at
+
+    def commit(self, consumer: str, offset: int) -> None:
+        """Durably record the offset a consumer resumes from"""
+        with self._consumers_lock:
+            self._consumers[consumer] = offset
+            path = os.path.join(self.directory, self.CONSUMERS_FILE)
+            with open(path + '.tmp', 'w', encoding='utf-8') as handle:
+                json.dump(self._consumers, handle)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(path + '.tmp', path)
+
+    def committed(self, consumer: str) -> int:
+        """The consumer's committed offset (0 if it never committed)"""
+        return self._consumers.get(consumer, 0)
+
+    @property
+    def consumers(self) -> Dict[str, int]:
+        return dict(self._consumers)
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Rewrite sealed segments keeping only the latest event per schedule and
+        per conflict (batch events are kept). The active segment is not touched.
+        """
+        stats = dict.fromkeys(('segments_rewritten', 'segments_removed',
+                               'events_removed', 'bytes_before', 'bytes_after'), 0)
+        with self._maintenance_lock:
+            with self._mutex:
+                sealed = self._segments[:-1]
+            latest: Dict[Tuple, int] = {}
+            superseded: Set[int] = set()
+            for event in self.read(0):
+                key = event_key(event.data)
+                if key is None:
+                    continue
+                if key in latest:
+                    superseded.add(latest[key])
+                latest[key] = event.offset
+
+            for segment in sealed:
+                stats['bytes_before'] += segment.size
+                kept = [index for index, offset in enumerate(segment.offsets)
+                        if offset not in superseded]
+                stats['events_removed'] += len(segment.offsets) - len(kept)
+                if len(kept) == len(segment.offsets):
+                    stats['bytes_after'] += segment.size
+                    continue
+                replacement = self._rewrite(segment, kept) if kept else None
+                with self._mutex:
+                    index = self._segments.index(segment)
+                    if replacement is None:
+                        del self._segments[index]
+                    else:
+                        self._segments[index] = replacement
+                segment.release()
+                if replacement is None:
+                    os.remove(segment.path)
+                    stats['segments_removed'] += 1
+                else:
+                    stats['segments_rewritten'] += 1
+                    stats['bytes_after'] += replacement.size
+            fsync_directory(self.directory)
+        logger.info(f"🗜️  Event log compacted: {stats['events_removed']} superseded events removed, "
+                    f"{stats['bytes_before']} -> {stats['bytes_after']} bytes in sealed segments")
+        return stats
+
+    def truncate(self, before_offset: Optional[int] = None) -> int:
+        """
+        Delete sealed segments whose events are all older than before_offset
+        (default: the lowest committed consumer offset). Returns how many.
+        """
+        if before_offset is None:
+            if not self._consumers:
+                return 0
+            before_offset = min(self._consumers.values())
+        with self._maintenance_lock:
+            with self._mutex:
+                removable = [segment for segment, following in
+                             zip(self._segments, self._segments[1:])
+                             if following.base_offset <= before_offset]
+                self._segments = self._segments[len(removable):]
+            for segment in removable:
+                segment.release()
+                os.remove(segment.path)
+            if removable:
+                fsync_directory(self.directory)
+                logger.info(f"🧹 Event log truncated: {len(removable)} segment(s) "
+                            f"before offset {before_offset} removed")
+        return len(removable)
+
+    def sync(self) -> None:
+        """fsync everything appended so far"""
+        with self._sync_lock:
+            with self._mutex:
+                if not self._dirty or self._file is None:
+                    return
+                self._dirty = False
+                fd = self._file.fileno()
+            os.fsync(fd)
+            self.syncs += 1
+
+    def close(self) -> None:
+        """Stop the flusher, sync and close the active segment, unmap the segments"""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._sync_lock, self._mutex:
+            self._close_file()
+            for segment in self._segments:
+                segment.release()
+
+    def __enter__(self) -> 'EventLog':
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _new_segment(self) -> _EventSegment:
+        path = os.path.join(self.directory, self.SEGMENT_FORMAT.format(self.next_offset))
+        open(path, 'ab').close()
+        fsync_directory(self.directory)
+        return _EventSegment(path, self.next_offset)
+
+    def _roll(self) -> _EventSegment:
+        """Seal the active segment and start the next one (under _mutex)"""
+        self._close_file()
+        segment = self._new_segment()
+        self._segments.append(segment)
+        self._file = open(segment.path, 'ab')
+        return segment
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        if self._dirty:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+            self.syncs += 1
+        self._file.close()
+        self._file = None
+
+    def _rewrite(self, segment: _EventSegment, kept: List[int]) -> _EventSegment:
+        """Copy the kept records of a sealed segment to a new file that replaces it"""
+        buffer = segment.buffer(segment.size)
+        ends = list(segment.positions[1:]) + [segment.size]
+        temporary = segment.path + '.compact'
+        with open(temporary, 'wb') as handle:
+            for index in kept:
+                handle.write(buffer[segment.positions[index]:ends[index]])
+            handle.flush()
+            os.fsync(handle.fileno())
+        buffer.release()
+        os.replace(temporary, segment.path)
+        replacement = _EventSegment(segment.path, segment.base_offset)
+        replacement.scan()
+        return replacement
+
+    def _flush_loop(self) -> None:
+        while not self._stopped.wait(self.sync_interval):
+            try:
+                self.sync()
+            except OSError as e:
+                logger.error(f"❌ Event log sync failed: {e}")
@@ -6,13 +6,31 @@ Sistem penjadwalan kuliah dengan deteksi otomatis bentrok jadwal dan notifikasi
 """
 
 from datetime import datetime, time, timedelta
-from typing import List, Dict, Set, Tuple, Optional
+from typing import (List, Dict, Set, FrozenSet, Tuple, Optional, Iterable, Iterator, Callable,
+                    Hashable)
 from enum import Enum
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 import json
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from itertools import chain
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
 import logging
+import sys
+import tempfile
+import threading
+import time as timer
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the vectorized strategy needs it
+    np = None
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +62,8 @@ class EventType(Enum):
     SCHEDULE_DELETED = "SCHEDULE_DELETED"
     CONFLICT_DETECTED = "CONFLICT_DETECTED"
     SCHEDULE_RESOLVED = "SCHEDULE_RESOLVED"
+    BATCH_APPLIED = "BATCH_APPLIED"
+    NOTIFICATION_DIGEST = "NOTIFICATION_DIGEST"
 
 
 class ConflictType(Enum):
@@ -54,21 +74,102 @@ class ConflictType(Enum):
     CAPACITY_EXCEEDED = "capacity_exceeded"
 
 
-@dataclass
+MINUTES_PER_DAY = 24 * 60
+
+# Shared objects for values that repeat across thousands of schedules: one int
+# per minute of the day (CPython only caches ints up to 256) and one time per
+# whole minute. Both are immutable, so sharing them is safe.
+_MINUTE_INTS = tuple(range(MINUTES_PER_DAY + 1))
+_WHOLE_MINUTE_TIMES: Dict[int, time] = {}
+
+
+def _intern(value):
+    """sys.intern for strings, anything else is returned unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _shared_time(value: time, minute: int) -> time:
+    """The shared time object for a whole-minute, timezone-naive time"""
+    if value.second or value.microsecond or value.tzinfo is not None:
+        return value
+    shared = _WHOLE_MINUTE_TIMES.get(minute)
+    if shared is None:
+        shared = _WHOLE_MINUTE_TIMES[minute] = value
+    return shared
+
+
+@dataclass(slots=True)
 class TimeSlot:
-    """Represents a time slot (start_time and end_time)"""
+    """
+    Represents a time slot (start_time and end_time)
+
+    start_minute / end_minute are the slot as integer minutes of the day,
+    kept in sync with start_time / end_time. Times with seconds are rounded
+    outwards (start down, end up) and whole_minutes is False; comparisons then
+    fall back to the exact datetime.time values.
+    """
     start_time: time
     end_time: time
+    start_minute: int = field(init=False, repr=False, compare=False, default=0)
+    end_minute: int = field(init=False, repr=False, compare=False, default=0)
+    whole_minutes: bool = field(init=False, repr=False, compare=False, default=True)
+    _label: Optional[str] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._encode()
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        # Before __post_init__ the _label slot is still empty
+        if name in ('start_time', 'end_time') and hasattr(self, '_label'):
+            self._encode()
+
+    def _encode(self) -> None:
+        """Precompute the integer minutes, share common objects, drop the cached label"""
+        start, end = self.start_time, self.end_time
+        start_minute = start.hour * 60 + start.minute
+        end_minute = end.hour * 60 + end.minute
+        whole_minutes = not (start.second or start.microsecond)
+        if end.second or end.microsecond:
+            end_minute += 1
+            whole_minutes = False
+        set_slot = object.__setattr__
+        set_slot(self, 'start_time', _shared_time(start, start_minute))
+        set_slot(self, 'end_time', _shared_time(end, end_minute))
+        set_slot(self, 'start_minute', _MINUTE_INTS[start_minute])
+        set_slot(self, 'end_minute', _MINUTE_INTS[end_minute])
+        set_slot(self, 'whole_minutes', whole_minutes)
+        set_slot(self, '_label', None)
 
     def overlaps_with(self, other: 'TimeSlot') -> bool:
         """Check if this time slot overlaps with another"""
+        if self.whole_minutes and other.whole_minutes:
+            return self.start_minute < other.end_minute and other.start_minute < self.end_minute
         return self.start_time < other.end_time and other.start_time < self.end_time
 
+    def minute_of_week(self, day: 'DayOfWeek') -> Tuple[int, int]:
+        """(start, end) as minutes since Monday 00:00"""
+        offset = day.value * MINUTES_PER_DAY
+        return offset + self.start_minute, offset + self.end_minute
+
+    @property
+    def start_label(self) -> str:
+        """Start time as HH:MM"""
+        return str(self)[:5]
+
+    @property
+    def end_label(self) -> str:
+        """End time as HH:MM"""
+        return str(self)[6:]
+
     def __str__(self) -> str:
-        return f"{self.start_time.strftime('%H:%M')}-{self.end_time.strftime('%H:%M')}"
+        if self._label is None:
+            start, end = self.start_time, self.end_time
+            self._label = f"{start.hour:02d}:{start.minute:02d}-{end.hour:02d}:{end.minute:02d}"
+        return self._label
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Represents a classroom/room"""
     room_id: str
@@ -76,6 +177,11 @@ class Room:
     capacity: int
     building: str = "Main Building"
 
+    def __post_init__(self) -> None:
+        self.room_id = _intern(self.room_id)
+        self.room_name = _intern(self.room_name)
+        self.building = _intern(self.building)
+
     def can_accommodate(self, num_students: int) -> bool:
         """Check if room can accommodate the number of students"""
         return num_students <= self.capacity
@@ -84,9 +190,15 @@ class Room:
         return f"{self.room_name} (Cap: {self.capacity})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Schedule:
-    """Represents a course schedule"""
+    """
+    Represents a course schedule
+
+    Slotted, with the strings that repeat across a term (course, lecturer)
+    interned. updated_at defaults to created_at, so a fresh schedule holds a
+    single timestamp.
+    """
     schedule_id: str
     course_name: str
     course_code: str
@@ -97,7 +209,14 @@ class Schedule:
     num_students: int
     krs_id: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        self.course_name = _intern(self.course_name)
+        self.course_code = _intern(self.course_code)
+        self.lecturer_name = _intern(self.lecturer_name)
+        if self.updated_at is None:
+            self.updated_at = self.created_at
 
     def to_dict(self) -> Dict:
         """Convert schedule to dictionary"""
@@ -109,23 +228,58 @@ class Schedule:
             'day': self.day.name,
             'time_slot': str(self.time_slot),
             'room': str(self.room),
+            'room_id': self.room.room_id,
             'num_students': self.num_students,
             'krs_id': self.krs_id
         }
 
+    @property
+    def lecturer_key(self) -> str:
+        """Normalized lecturer name used for lecturer conflict matching"""
+        return self.lecturer_name.lower()
+
+    @property
+    def minute_of_week(self) -> int:
+        """Start of the class as minutes since Monday 00:00 (sort key)"""
+        return self.day.value * MINUTES_PER_DAY + self.time_slot.start_minute
+
     def __str__(self) -> str:
         return (f"{self.course_name} ({self.course_code}) - "
                 f"{self.day.name} {self.time_slot} @ {self.room.room_name} - "
                 f"By {self.lecturer_name}")
 
 
+class _LazyDescription:
+    """
+    Descriptor behind ScheduleConflict.description: None is replaced by
+    default_description() on first read. As a dataclass field default it
+    keeps description an ordinary init, repr and compare field (default "").
+    """
+
+    def __get__(self, conflict: Optional['ScheduleConflict'], owner: type) -> str:
+        if conflict is None:
+            return ""
+        description = conflict._description
+        if description is None:
+            description = conflict._description = conflict.default_description()
+        return description
+
+    def __set__(self, conflict: 'ScheduleConflict', description: Optional[str]) -> None:
+        conflict._description = description
+
+
 @dataclass
 class ScheduleConflict:
-    """Represents a schedule conflict"""
+    """
+    Represents a schedule conflict
+
+    Passing description=None defers the standard description until it is
+    first read, so conflicts nobody looks at never format their text.
+    """
     conflict_type: ConflictType
     schedule_1: Schedule
     schedule_2: Optional[Schedule] = None
-    description: str = ""
+    description: Optional[str] = _LazyDescription()
     severity: str = "high"  # high, medium, low
 
     def to_dict(self) -> Dict:
@@ -140,10 +294,49 @@ class ScheduleConflict:
             result['schedule_2'] = self.schedule_2.to_dict()
         return result
 
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        """Stable identity of the conflict, independent of schedule order"""
+        if self.schedule_2 is None:
+            return (self.conflict_type.value, self.schedule_1.schedule_id, None)
+        first, second = sorted((self.schedule_1.schedule_id, self.schedule_2.schedule_id))
+        return (self.conflict_type.value, first, second)
+
+    def default_description(self) -> str:
+        """Build the standard description for this conflict type"""
+        sched1, sched2 = self.schedule_1, self.schedule_2
+        if self.conflict_type == ConflictType.CAPACITY_EXCEEDED:
+            return (f"{sched1.course_name}: {sched1.num_students} students "
+                    f"exceed room capacity of {sched1.room.capacity}")
+        if self.conflict_type == ConflictType.ROOM_CONFLICT:
+            return (f"Room '{sched1.room.room_name}' double-booked: "
+                    f"{sched1.course_name} vs {sched2.course_name}")
+        return (f"Lecturer '{sched1.lecturer_name}' double-booked: "
+                f"{sched1.course_name} ({sched1.day.name} {sched1.time_slot}) vs "
+                f"{sched2.course_name} ({sched2.day.name} {sched2.time_slot})")
+
     def __str__(self) -> str:
         return f"[{self.conflict_type.value}] {self.description}"
 
 
+@dataclass
+class BulkResult:
+    """Outcome of one row of a bulk operation"""
+    index: int
+    schedule_id: Optional[str]
+    success: bool
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Convert result to dictionary"""
+        return {
+            'index': self.index,
+            'schedule_id': self.schedule_id,
+            'success': self.success,
+            'error': self.error
+        }
+
+
 # ============================================================================
 # OBSERVER PATTERN - NOTIFICATION SYSTEM
 # ============================================================================
@@ -156,20 +349,53 @@ class Observer(ABC):
         """Update observer with event notification"""
         pass
 
+    # Delivery channels (notification_channels.EmailChannel, SMSChannel, ...)
+    # each message is also sent through, besides the log
+    channels: Tuple = ()
+
+    # Delivered inside notify() even when an AsyncDispatcher is set, i.e.
+    # under the service's write lock and in commit order. Only for observers
+    # whose update() never blocks (e.g. event_stream.EventBroadcaster).
+    inline = False
+
+    def _send_to_channels(self, event_type: EventType, message: str) -> None:
+        for channel in self.channels:
+            channel.deliver(self, f"Schedule notification: {event_type.value}", message)
+
+    @property
+    def observer_id(self) -> str:
+        """Identity within the observer type (the instance unless overridden)"""
+        return f"0x{id(self):x}"
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Registry key: two observers with the same key are the same recipient"""
+        return (self.__class__.__name__, self.observer_id)
+
 
 class StudentObserver(Observer):
     """Observer for students"""
 
-    def __init__(self, student_id: str, student_name: str, email: str):
+    def __init__(self, student_id: str, student_name: str, email: str,
+                 phone: Optional[str] = None, device_token: Optional[str] = None,
+                 channels: Iterable = ()):
         self.student_id = student_id
         self.student_name = student_name
         self.email = email
+        self.phone = phone
+        self.device_token = device_token
+        self.channels = tuple(channels)
+
+    @property
+    def observer_id(self) -> str:
+        return self.student_id
 
     def update(self, event_type: EventType, data: Dict) -> None:
         """Notify student of schedule changes"""
         message = self._format_message(event_type, data)
         logger.info(f"📧 STUDENT NOTIFICATION ({self.student_name}): {message}")
         logger.info(f"   Email: {self.email}")
+        self._send_to_channels(event_type, message)
 
     def _format_message(self, event_type: EventType, data: Dict) -> str:
         """Format notification message"""
@@ -183,22 +409,36 @@ class StudentObserver(Observer):
             return f"Schedule conflict detected: {data.get('description')}"
         elif event_type == EventType.SCHEDULE_RESOLVED:
             return f"Schedule conflict resolved: {data.get('description')}"
+        elif event_type == EventType.BATCH_APPLIED:
+            return f"Schedules changed in bulk: {data.get('description')}"
+        elif event_type == EventType.NOTIFICATION_DIGEST:
+            return f"Digest of schedule changes: {data.get('description')}"
         return f"Schedule event: {event_type.value}"
 
 
 class LecturerObserver(Observer):
     """Observer for lecturers"""
 
-    def __init__(self, lecturer_id: str, lecturer_name: str, email: str):
+    def __init__(self, lecturer_id: str, lecturer_name: str, email: str,
+                 phone: Optional[str] = None, device_token: Optional[str] = None,
+                 channels: Iterable = ()):
         self.lecturer_id = lecturer_id
         self.lecturer_name = lecturer_name
         self.email = email
+        self.phone = phone
+        self.device_token = device_token
+        self.channels = tuple(channels)
+
+    @property
+    def observer_id(self) -> str:
+        return self.lecturer_id
 
     def update(self, event_type: EventType, data: Dict) -> None:
         """Notify lecturer of schedule changes"""
         message = self._format_message(event_type, data)
         logger.info(f"👨‍🏫 LECTURER NOTIFICATION ({self.lecturer_name}): {message}")
         logger.info(f"   Email: {self.email}")
+        self._send_to_channels(event_type, message)
 
     def _format_message(self, event_type: EventType, data: Dict) -> str:
         """Format notification message"""
@@ -212,22 +452,36 @@ class LecturerObserver(Observer):
             return f"ALERT: Schedule conflict detected: {data.get('description')}"
         elif event_type == EventType.SCHEDULE_RESOLVED:
             return f"Schedule conflict has been resolved: {data.get('description')}"
+        elif event_type == EventType.BATCH_APPLIED:
+            return f"Schedules changed in bulk: {data.get('description')}"
+        elif event_type == EventType.NOTIFICATION_DIGEST:
+            return f"Digest of schedule changes: {data.get('description')}"
         return f"Schedule event: {event_type.value}"
 
 
 class AdminObserver(Observer):
     """Observer for academic administrators"""
 
-    def __init__(self, admin_id: str, admin_name: str, email: str):
+    def __init__(self, admin_id: str, admin_name: str, email: str,
+                 phone: Optional[str] = None, device_token: Optional[str] = None,
+                 channels: Iterable = ()):
         self.admin_id = admin_id
         self.admin_name = admin_name
         self.email = email
+        self.phone = phone
+        self.device_token = device_token
+        self.channels = tuple(channels)
+
+    @property
+    def observer_id(self) -> str:
+        return self.admin_id
 
     def update(self, event_type: EventType, data: Dict) -> None:
         """Notify admin of schedule changes"""
         message = self._format_message(event_type, data)
         logger.info(f"👨‍💼 ADMIN NOTIFICATION ({self.admin_name}): {message}")
         logger.info(f"   Email: {self.email}")
+        self._send_to_channels(event_type, message)
 
     def _format_message(self, event_type: EventType, data: Dict) -> str:
         """Format notification message"""
@@ -242,40 +496,853 @@ class AdminObserver(Observer):
             return f"⚠️  CONFLICT ALERT: {conflict_details}"
         elif event_type == EventType.SCHEDULE_RESOLVED:
             return f"Conflict resolved: {data.get('description')}"
+        elif event_type == EventType.BATCH_APPLIED:
+            return f"Schedules changed in bulk: {data.get('description')}"
+        elif event_type == EventType.NOTIFICATION_DIGEST:
+            return f"Digest of schedule changes: {data.get('description')}"
         return f"Schedule event: {event_type.value}"
 
 
-class ScheduleSubject:
-    """Publisher/Subject for schedule notifications (Observable)"""
+def event_key(data: Dict) -> Optional[Tuple]:
+    """
+    What an event is about: ('schedule', id) for a schedule event,
+    ('conflict', type, ids...) for a conflict event, None otherwise (batches)
+    """
+    if 'schedule_1' in data:
+        schedule_ids = sorted(data[key]['schedule_id'] for key in ('schedule_1', 'schedule_2')
+                              if key in data)
+        return ('conflict', data.get('conflict_type'), *schedule_ids)
+    if 'schedule_id' in data:
+        return ('schedule', data['schedule_id'])
+    return None
+
+
+# Net event when a second event for the same schedule/conflict arrives in a
+# digest window; None drops both (e.g. created then deleted)
+_DIGEST_MERGES: Dict[Tuple[EventType, EventType], Optional[EventType]] = {
+    (EventType.SCHEDULE_CREATED, EventType.SCHEDULE_UPDATED): EventType.SCHEDULE_CREATED,
+    (EventType.SCHEDULE_CREATED, EventType.SCHEDULE_DELETED): None,
+    (EventType.SCHEDULE_DELETED, EventType.SCHEDULE_CREATED): EventType.SCHEDULE_UPDATED,
+    (EventType.CONFLICT_DETECTED, EventType.SCHEDULE_RESOLVED): None,
+    (EventType.SCHEDULE_RESOLVED, EventType.CONFLICT_DETECTED): None,
+}
+
+
+class DigestObserver(Observer):
+    """
+    Buffers the events for one recipient and delivers them as one
+    NOTIFICATION_DIGEST message once `window` seconds passed since the first
+    buffered event or `max_events` events arrived.
+
+    Events about the same schedule (or the same conflict) collapse into the
+    net change with the latest data: created+updated is one created,
+    created+deleted or detected+resolved cancel out. BATCH_APPLIED events
+    are split into their per-schedule events first. A digest holding a
+    single plain (non-batch) event is delivered as that event; one made from
+    a BATCH_APPLIED stays a digest, so its conflict counts are not lost. The
+    digest takes the
+    recipient's key, so attaching it replaces the undigested recipient.
+
+    With auto_flush, a timer thread flushes a window that receives no
+    further events; without it, call flush() (e.g. from a scheduler).
+    """
+
+    def __init__(self, recipient: Observer, window: float = 60.0, max_events: int = 50,
+                 auto_flush: bool = True, clock: Callable[[], float] = timer.monotonic):
+        if window < 0:
+            raise ValueError("window must be >= 0")
+        if max_events < 1:
+            raise ValueError("max_events must be >= 1")
+        self.recipient = recipient
+        self.window = window
+        self.max_events = max_events
+        self.auto_flush = auto_flush
+        self.clock = clock
+        self.received = 0       # events passed to update()
+        self.delivered = 0      # messages passed to the recipient
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[EventType, Dict]] = {}
+        self._buffered = 0
+        self._conflicts = {'detected': 0, 'resolved': 0}
+        self._batched = False
+        self._window_start: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.recipient.key
+
+    @property
+    def pending(self) -> int:
+        """Coalesced events waiting for the next digest"""
+        return len(self._entries)
+
+    def update(self, event_type: EventType, data: Dict) -> None:
+        """Buffer an event, delivering the digest when the window or count is reached"""
+        with self._lock:
+            now = self.clock()
+            if self._window_start is None:
+                self._window_start = now
+                if self.auto_flush and self.window > 0:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            self.received += 1
+            self._buffered += 1
+            if event_type == EventType.BATCH_APPLIED:
+                self._batched = True
+                for event in data.get('events', ()):
+                    self._add(EventType(event['event_type']), event['data'])
+                self._conflicts['detected'] += data.get('conflicts_detected', {}).get('total_conflicts', 0)
+                self._conflicts['resolved'] += data.get('conflicts_resolved', {}).get('total_conflicts', 0)
+            else:
+                self._add(event_type, data)
+            due = (self._buffered >= self.max_events
+                   or now - self._window_start >= self.window)
+            message = self._take() if due else None
+        self._deliver(message)
+
+    def flush(self) -> None:
+        """Deliver whatever is buffered now"""
+        with self._lock:
+            message = self._take()
+        self._deliver(message)
+
+    def _add(self, event_type: EventType, data: Dict) -> None:
+        key = event_key(data) or ('event', self.received, len(self._entries))
+        previous = self._entries.get(key)
+        if previous is not None:
+            merge = (previous[0], event_type)
+            event_type = _DIGEST_MERGES.get(merge, event_type)
+            if event_type is None:
+                del self._entries[key]
+                return
+        self._entries[key] = (event_type, data)
+
+    def _take(self) -> Optional[Tuple[EventType, Dict]]:
+        """Reset the buffer, returning the message to deliver (None if empty)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        entries, received, conflicts = list(self._entries.values()), self._buffered, self._conflicts
+        batched = self._batched
+        self._entries, self._buffered = {}, 0
+        self._conflicts = {'detected': 0, 'resolved': 0}
+        self._batched = False
+        self._window_start = None
+        if not entries and not any(conflicts.values()):
+            return None
+        self.delivered += 1
+        if len(entries) == 1 and received == 1 and not batched:
+            return entries[0]
+        counts = Counter(event_type for event_type, _ in entries)
+        detected = counts[EventType.CONFLICT_DETECTED] + conflicts['detected']
+        resolved = counts[EventType.SCHEDULE_RESOLVED] + conflicts['resolved']
+        parts = [f"{counts[event_type]} {label}" for event_type, label in
+                 ((EventType.SCHEDULE_CREATED, "created"), (EventType.SCHEDULE_UPDATED, "updated"),
+                  (EventType.SCHEDULE_DELETED, "deleted")) if counts[event_type]]
+        if detected or resolved:
+            parts.append(f"{detected} new conflict(s), {resolved} resolved")
+        return EventType.NOTIFICATION_DIGEST, {
+            'events': [{'event_type': event_type.value, 'data': data} for event_type, data in entries],
+            'received': received,
+            'conflicts_detected': detected,
+            'conflicts_resolved': resolved,
+            'description': f"{', '.join(parts) or 'no net change'} ({received} notifications)",
+        }
+
+    def _deliver(self, message: Optional[Tuple[EventType, Dict]]) -> None:
+        if message is not None:
+            self.recipient.update(*message)
+
+
+class _DispatchShard:
+    """One worker thread with its own bounded FIFO of (observer, event_type, data)"""
+
+    def __init__(self, dispatcher: 'AsyncDispatcher', index: int):
+        self.dispatcher = dispatcher
+        self.queue: deque = deque()
+        self.condition = threading.Condition()
+        self.pending = 0          # queued + spilled + being delivered
+        self.spilled = 0          # records in the spill file not yet read back
+        self.counts = {'delivered': 0, 'dropped': 0, 'spilled': 0, 'failed': 0}
+        self.outstanding: Dict[Hashable, int] = {}     # observer key -> pending deliveries
+        self.spilled_observers: Dict[Hashable, Observer] = {}
+        self.forgotten: Set[Hashable] = set()          # detached, release once drained
+        self.spill_file = None
+        self.spill_read = self.spill_write = 0
+        self.thread = threading.Thread(target=self._run, name=f'observer-dispatch-{index}',
+                                       daemon=True)
+        self.thread.start()
+
+    def put(self, item: Tuple) -> None:
+        """Queue one delivery, applying the dispatcher's backpressure policy"""
+        dispatcher = self.dispatcher
+        key = item[0].key
+        with self.condition:
+            if dispatcher.closed:
+                raise RuntimeError("AsyncDispatcher is closed")
+            self.forgotten.discard(key)
+            # Once anything spilled, later events follow it to keep FIFO order
+            if len(self.queue) >= dispatcher.max_queue or self.spilled:
+                if dispatcher.policy == 'block':
+                    while len(self.queue) >= dispatcher.max_queue and not dispatcher.closed:
+                        self.condition.wait()
+                    if dispatcher.closed:
+                        raise RuntimeError("AsyncDispatcher is closed")
+                elif dispatcher.policy == 'drop_oldest':
+                    dropped = self.queue.popleft()
+                    self.pending -= 1
+                    self.counts['dropped'] += 1
+                    self._release(dropped[0].key)
+                else:
+                    self._spill(item)
+                    self.outstanding[key] = self.outstanding.get(key, 0) + 1
+                    self.condition.notify_all()
+                    return
+            self.queue.append(item)
+            self.pending += 1
+            self.outstanding[key] = self.outstanding.get(key, 0) + 1
+            self.condition.notify_all()
+
+    def forget(self, key: Hashable) -> None:
+        """Release a detached observer's shard assignment once nothing is pending for it"""
+        with self.condition:
+            if key in self.outstanding:
+                self.forgotten.add(key)
+            else:
+                self.dispatcher._assignments.pop(key, None)
+
+    def _release(self, key: Hashable) -> None:
+        """One delivery for key finished or was dropped (lock held)"""
+        remaining = self.outstanding[key] - 1
+        if remaining:
+            self.outstanding[key] = remaining
+            return
+        del self.outstanding[key]
+        self.spilled_observers.pop(key, None)
+        if key in self.forgotten:
+            self.forgotten.discard(key)
+            self.dispatcher._assignments.pop(key, None)
+
+    def wait_idle(self, deadline: Optional[float]) -> bool:
+        with self.condition:
+            while self.pending:
+                remaining = None if deadline is None else deadline - timer.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def _spill(self, item: Tuple) -> None:
+        observer, event_type, data = item
+        dispatcher = self.dispatcher
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(dir=dispatcher.spill_dir)
+        self.spilled_observers[observer.key] = observer
+        record = json.dumps({'observer': observer.key, 'event_type': event_type.value,
+                             'data': data}, default=str)
+        self.spill_file.seek(self.spill_write)
+        self.spill_file.write(record.encode('utf-8') + b'\n')
+        self.spill_write = self.spill_file.tell()
+        self.spilled += 1
+        self.pending += 1
+        self.counts['spilled'] += 1
+
+    def _unspill(self) -> None:
+        """Move up to max_queue spilled records back into the queue (lock held)"""
+        self.spill_file.seek(self.spill_read)
+        while self.spilled and len(self.queue) < self.dispatcher.max_queue:
+            record = json.loads(self.spill_file.readline())
+            self.queue.append((self.spilled_observers[tuple(record['observer'])],
+                               EventType(record['event_type']), record['data']))
+            self.spilled -= 1
+        self.spill_read = self.spill_file.tell()
+        if not self.spilled:
+            self.spill_file.seek(0)
+            self.spill_file.truncate()
+            self.spill_read = self.spill_write = 0
+
+    def _run(self) -> None:
+        dispatcher = self.dispatcher
+        while True:
+            with self.condition:
+                while not self.queue and not self.spilled and not dispatcher.closed:
+                    self.condition.wait()
+                if not self.queue and self.spilled:
+                    self._unspill()
+                if not self.queue:
+                    return  # closed and drained
+                observer, event_type, data = self.queue.popleft()
+                self.condition.notify_all()  # room for blocked producers
+            outcome = 'delivered'
+            try:
+                observer.update(event_type, data)
+            except Exception as e:
+                outcome = 'failed'
+                logger.error(f"❌ Observer {observer.__class__.__name__} failed on "
+                             f"{event_type.value}: {e}")
+            with self.condition:
+                self.counts[outcome] += 1
+                self.pending -= 1
+                self._release(observer.key)
+                self.condition.notify_all()
+
+
+class AsyncDispatcher:
+    """
+    Delivers observer notifications on worker threads, so a slow observer
+    (email, SMS) does not add latency to the mutation that raised the event.
+
+    Each observer is pinned to one of `workers` threads, which keeps the
+    events an observer receives in order. Every worker has a bounded queue
+    of max_queue deliveries; when it is full the policy decides:
+    - "block": the notifying thread waits for room (backpressure)
+    - "drop_oldest": the oldest queued delivery is discarded (counted in dropped)
+    - "spill": deliveries overflow to a temporary file in spill_dir and are
+      read back in order once the queue drains (event data is stored as JSON)
+
+    flush() waits until everything submitted so far has been delivered;
+    close() drains the queues and stops the workers. Exceptions raised by
+    observers are logged and counted in stats['failed']. Observers with
+    inline = True bypass the queues and are updated inside submit().
+    Observers are tracked by Observer.key; forget() (called on detach)
+    releases that state once the observer's pending deliveries are done.
+
+    Observers run outside the service's lock. To read the service they
+    should use snapshot(); with the "block" policy, waiting for the read
+    lock while a writer waits for queue room would deadlock.
+    """
+
+    POLICIES = ("block", "drop_oldest", "spill")
+
+    def __init__(self, workers: int = 2, max_queue: int = 1000, policy: str = "block",
+                 spill_dir: Optional[str] = None):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'. Use: {', '.join(self.POLICIES)}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.spill_dir = spill_dir
+        self.closed = False
+        self._shards = [_DispatchShard(self, index) for index in range(workers)]
+        self._assignments: Dict[Hashable, _DispatchShard] = {}
+        self._assign_lock = threading.Lock()
+        self._next_shard = 0
+
+    def submit(self, observers: Iterable[Observer], event_type: EventType, data: Dict) -> None:
+        """Queue one event for each observer (inline observers are updated right away)"""
+        for observer in observers:
+            if observer.inline:
+                try:
+                    observer.update(event_type, data)
+                except Exception as e:
+                    logger.error(f"❌ Observer {observer.__class__.__name__} failed on "
+                                 f"{event_type.value}: {e}")
+                continue
+            key = observer.key
+            shard = self._assignments.get(key)
+            if shard is None:
+                # Round-robin on first sight keeps the workers evenly loaded
+                with self._assign_lock:
+                    shard = self._assignments.get(key)
+                    if shard is None:
+                        shard = self._assignments[key] = self._shards[self._next_shard]
+                        self._next_shard = (self._next_shard + 1) % len(self._shards)
+            shard.put((observer, event_type, data))
+
+    def forget(self, observer: Observer) -> None:
+        """Drop the state kept for a detached observer (after its pending deliveries)"""
+        shard = self._assignments.get(observer.key)
+        if shard is not None:
+            shard.forget(observer.key)
+
+    @property
+    def tracked(self) -> int:
+        """Observers with a worker assignment"""
+        return len(self._assignments)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted event was delivered; False on timeout"""
+        deadline = None if timeout is None else timer.monotonic() + timeout
+        return all(shard.wait_idle(deadline) for shard in self._shards)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Deliver what is queued, then stop the workers"""
+        self.closed = True
+        for shard in self._shards:
+            with shard.condition:
+                shard.condition.notify_all()
+        deadline = None if timeout is None else timer.monotonic() + timeout
+        for shard in self._shards:
+            shard.thread.join(None if deadline is None else max(0.0, deadline - timer.monotonic()))
+            if shard.spill_file is not None and not shard.thread.is_alive():
+                shard.spill_file.close()
+
+    @property
+    def queued(self) -> int:
+        """Deliveries not finished yet, including spilled ones"""
+        return sum(shard.pending for shard in self._shards)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Deliveries delivered, dropped, spilled and failed so far"""
+        totals = dict.fromkeys(('delivered', 'dropped', 'spilled', 'failed'), 0)
+        for shard in self._shards:
+            with shard.condition:
+                for name, count in shard.counts.items():
+                    totals[name] += count
+        return totals
+
+    def __enter__(self) -> 'AsyncDispatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Topics a Subscription can filter on, most selective first: a subscription
+# is indexed under the first topic it sets
+SUBSCRIPTION_TOPICS = ('krs_id', 'course_code', 'lecturer', 'room_id')
+
+
+def event_topics(data: Dict) -> List[Dict[str, str]]:
+    """
+    The schedules an event is about, as topic dicts (lecturer lower-cased):
+    the schedule of a CRUD event, both schedules of a conflict event, every
+    schedule of a BATCH_APPLIED event
+    """
+    subjects = [data, data.get('schedule_1'), data.get('schedule_2')]
+    subjects.extend(event.get('data') for event in data.get('events', ()))
+    topics = []
+    for subject in subjects:
+        if not subject or 'schedule_id' not in subject:
+            continue
+        lecturer = subject.get('lecturer_name')
+        topics.append({
+            'krs_id': subject.get('krs_id'),
+            'course_code': subject.get('course_code'),
+            'lecturer': lecturer.lower() if lecturer else None,
+            'room_id': subject.get('room_id'),
+        })
+    return topics
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    Interest of one observer in a subset of events, see ScheduleSubject.subscribe().
+
+    Every topic that is set must match the same schedule of the event (AND);
+    event_types, when set, restricts the event types (OR). An observer can
+    hold several subscriptions and receives an event once if any matches.
+    """
+    observer: Observer
+    event_types: Optional[FrozenSet[EventType]] = None
+    lecturer: Optional[str] = None
+    room_id: Optional[str] = None
+    course_code: Optional[str] = None
+    krs_id: Optional[str] = None
+    sequence: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.lecturer is not None:
+            self.lecturer = self.lecturer.lower()
+        if self.event_types is not None:
+            self.event_types = frozenset(self.event_types)
+
+    @property
+    def constraints(self) -> List[Tuple[str, str]]:
+        """(topic, value) pairs that are set, most selective first"""
+        return [(topic, getattr(self, topic)) for topic in SUBSCRIPTION_TOPICS
+                if getattr(self, topic) is not None]
+
+    def matches(self, event_type: EventType, topics: Dict[str, str]) -> bool:
+        """Whether the event type and one schedule's topics satisfy the subscription"""
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        return all(topics.get(topic) == value for topic, value in self.constraints)
+
+    def accepts(self, event_type: EventType, data: Dict) -> bool:
+        """Whether an event matches, checking every schedule it is about"""
+        if not self.constraints:
+            return self.event_types is None or event_type in self.event_types
+        return any(self.matches(event_type, topics) for topics in event_topics(data))
+
+
+class SubscriptionIndex:
+    """
+    Inverted index from topic values to subscriptions.
+
+    A subscription is stored once: under the (topic, value) of its most
+    selective topic, or under its event types when it sets no topic. Routing
+    an event looks up each (topic, value) of each schedule the event is
+    about and verifies the few candidates found, so the cost follows the
+    number of matching subscriptions, not the number of observers.
+    Subscribe and unsubscribe are O(1).
+    """
 
     def __init__(self):
-        self._observers: List[Observer] = []
+        self._lock = threading.Lock()
+        self._by_topic: Dict[Tuple[str, str], Dict[int, Subscription]] = defaultdict(dict)
+        self._by_event_type: Dict[Optional[EventType], Dict[int, Subscription]] = defaultdict(dict)
+        self._by_observer: Dict[Hashable, Dict[int, Subscription]] = defaultdict(dict)
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._by_observer.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._by_observer)
+
+    def add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._sequence += 1
+            subscription.sequence = self._sequence
+            for index, key in self._buckets(subscription):
+                index[key][id(subscription)] = subscription
+            self._by_observer[subscription.observer.key][id(subscription)] = subscription
+        return subscription
+
+    def remove(self, subscription: Subscription) -> bool:
+        with self._lock:
+            owned = self._by_observer.get(subscription.observer.key)
+            if not owned or owned.pop(id(subscription), None) is None:
+                return False
+            if not owned:
+                del self._by_observer[subscription.observer.key]
+            self._unindex(subscription)
+            return True
+
+    def subscribed(self, observer: Observer) -> bool:
+        """Whether the observer (by key) holds any subscription"""
+        return observer.key in self._by_observer
+
+    def remove_observer(self, observer: Observer) -> int:
+        """Drop every subscription of an observer (by key), returns how many"""
+        with self._lock:
+            owned = self._by_observer.pop(observer.key, {})
+            for subscription in owned.values():
+                self._unindex(subscription)
+        return len(owned)
+
+    def match(self, event_type: EventType, data: Dict) -> List[Observer]:
+        """Observers with a matching subscription, each once, in subscription order"""
+        matched: Dict[Hashable, Tuple[int, Observer]] = {}
+
+        def accept(subscription: Subscription) -> None:
+            key = subscription.observer.key
+            if key not in matched or subscription.sequence < matched[key][0]:
+                matched[key] = (subscription.sequence, subscription.observer)
+
+        with self._lock:
+            for bucket_key in (None, event_type):
+                for subscription in self._by_event_type.get(bucket_key, {}).values():
+                    accept(subscription)
+            for topics in event_topics(data):
+                for topic, value in topics.items():
+                    if value is None:
+                        continue
+                    for subscription in self._by_topic.get((topic, value), {}).values():
+                        if subscription.matches(event_type, topics):
+                            accept(subscription)
+        return [observer for _, observer in sorted(matched.values(), key=itemgetter(0))]
+
+    def _buckets(self, subscription: Subscription) -> List[Tuple[Dict, Hashable]]:
+        """(index, key) of every bucket the subscription is stored in"""
+        constraints = subscription.constraints
+        if constraints:
+            return [(self._by_topic, constraints[0])]
+        if subscription.event_types is None:
+            return [(self._by_event_type, None)]
+        return [(self._by_event_type, event_type) for event_type in subscription.event_types]
+
+    def _unindex(self, subscription: Subscription) -> None:
+        for index, key in self._buckets(subscription):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(id(subscription), None)
+                if not bucket:
+                    del index[key]
+
+
+class ObserverRegistry:
+    """
+    Attached observers keyed by Observer.key, i.e. (type, id).
+
+    add/remove are O(1) and idempotent: attaching a second StudentObserver
+    for the same student replaces the first in place instead of adding a
+    duplicate. Iteration order is attach order. notify() reads snapshot(),
+    a tuple rebuilt lazily after changes, so a burst of attaches costs one
+    copy rather than one per attach.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._observers: Dict[Hashable, Observer] = {}
+        self._snapshot: Optional[Tuple[Observer, ...]] = ()
+
+    def __len__(self) -> int:
+        return len(self._observers)
+
+    def __bool__(self) -> bool:
+        return bool(self._observers)
+
+    def __iter__(self) -> Iterator[Observer]:
+        return iter(self.snapshot())
+
+    def __contains__(self, observer: Observer) -> bool:
+        return observer.key in self._observers
+
+    def get(self, key: Hashable) -> Optional[Observer]:
+        return self._observers.get(key)
+
+    def add_many(self, observers: Iterable[Observer]) -> int:
+        """Register observers, returns how many keys were new"""
+        added = 0
+        with self._lock:
+            for observer in observers:
+                key = observer.key
+                added += key not in self._observers
+                self._observers[key] = observer
+            self._snapshot = None
+        return added
+
+    def remove_many(self, observers: Iterable[Observer]) -> int:
+        """Unregister observers by key, returns how many were registered"""
+        removed = 0
+        with self._lock:
+            for observer in observers:
+                removed += self._observers.pop(observer.key, None) is not None
+            if removed:
+                self._snapshot = None
+        return removed
+
+    def snapshot(self) -> Tuple[Observer, ...]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = tuple(self._observers.values())
+        return snapshot
+
 
-    def attach(self, observer: Observer) -> None:
-        """Attach an observer"""
-        if observer not in self._observers:
-            self._observers.append(observer)
+class ScheduleSubject:
+    """
+    Publisher/Subject for schedule notifications (Observable)
+
+    Attached observers live in an ObserverRegistry keyed by (type, id), so
+    attach/detach are O(1) and re-attaching a recipient is a no-op. With a
+    dispatcher (AsyncDispatcher) set, notify() only queues the deliveries.
+
+    attach() subscribes an observer to every event; subscribe() narrows an
+    observer down to events about a lecturer, room, course or KRS and/or
+    to some event types, routed through a SubscriptionIndex.
+
+    If event_log is set (see schedule_persistence.EventLog), every event is
+    appended to it before delivery, so offline consumers can replay it. An
+    append that fails is logged and the event is still delivered.
+    """
+
+    def __init__(self, dispatcher: Optional[AsyncDispatcher] = None):
+        self._observers = ObserverRegistry()
+        self._subscriptions = SubscriptionIndex()
+        self.dispatcher = dispatcher
+        self.event_log = None
+
+    def attach(self, observer: Observer) -> bool:
+        """Attach an observer, returns False if its key was already attached"""
+        added = self._observers.add_many((observer,)) > 0
+        if added:
             logger.debug(f"Observer attached: {observer.__class__.__name__}")
+        return added
 
-    def detach(self, observer: Observer) -> None:
-        """Detach an observer"""
-        if observer in self._observers:
-            self._observers.remove(observer)
+    def detach(self, observer: Observer) -> bool:
+        """Detach an observer, including its topic subscriptions"""
+        removed = self._observers.remove_many((observer,)) > 0
+        if removed:
             logger.debug(f"Observer detached: {observer.__class__.__name__}")
+        self._subscriptions.remove_observer(observer)
+        if self.dispatcher is not None:
+            self.dispatcher.forget(observer)
+        return removed
+
+    def attach_many(self, observers: Iterable[Observer]) -> int:
+        """Attach observers in one pass, returns how many were new"""
+        added = self._observers.add_many(observers)
+        logger.info(f"👥 Attached {added} observers ({len(self._observers)} total)")
+        return added
+
+    def detach_many(self, observers: Iterable[Observer]) -> int:
+        """Detach observers and their subscriptions, returns how many were attached"""
+        observers = list(observers)
+        removed = self._observers.remove_many(observers)
+        for observer in observers:
+            self._subscriptions.remove_observer(observer)
+            if self.dispatcher is not None:
+                self.dispatcher.forget(observer)
+        logger.info(f"👥 Detached {removed} observers ({len(self._observers)} total)")
+        return removed
+
+    def subscribe(self, observer: Observer,
+                  event_types: Optional[Iterable[EventType]] = None,
+                  lecturer: Optional[str] = None, room_id: Optional[str] = None,
+                  course_code: Optional[str] = None,
+                  krs_id: Optional[str] = None) -> Subscription:
+        """
+        Deliver to observer only the events matching every given filter,
+        e.g. subscribe(student, krs_id="KRS001") or
+        subscribe(lecturer_observer, lecturer="Dr. Smith").
+        Returns the Subscription, for unsubscribe().
+        """
+        return self._subscriptions.add(Subscription(
+            observer, event_types, lecturer, room_id, course_code, krs_id))
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """Remove one subscription, returns False if it was not active"""
+        removed = self._subscriptions.remove(subscription)
+        observer = subscription.observer
+        if (removed and self.dispatcher is not None and observer.key not in self._observers
+                and not self._subscriptions.subscribed(observer)):
+            self.dispatcher.forget(observer)
+        return removed
+
+    @property
+    def has_observers(self) -> bool:
+        """Whether anyone is attached or subscribed, or events are logged"""
+        return bool(self._observers) or bool(self._subscriptions) or self.event_log is not None
 
     def notify(self, event_type: EventType, data: Dict) -> None:
         """Notify all observers of an event"""
-        logger.debug(f"Notifying {len(self._observers)} observers of event: {event_type.value}")
-        for observer in self._observers:
+        if self.event_log is not None:
+            # The change behind the event is already applied: a log failure
+            # must neither undo that for the caller nor starve the observers
+            try:
+                self.event_log.append(event_type, data)
+            except Exception as e:
+                logger.error(f"❌ Event log append failed for {event_type.value}: {e}")
+        observers = self._observers.snapshot()
+        if self._subscriptions:
+            observers = list(observers) + [observer for observer in
+                                           self._subscriptions.match(event_type, data)
+                                           if observer not in self._observers]
+        logger.debug(f"Notifying {len(observers)} observers of event: {event_type.value}")
+        self._dispatch(observers, event_type, data)
+
+    def _dispatch(self, observers: Iterable[Observer], event_type: EventType, data: Dict) -> None:
+        """Hand an event to its observers, through the dispatcher if there is one"""
+        if self.dispatcher is not None:
+            self.dispatcher.submit(observers, event_type, data)
+            return
+        for observer in observers:
             observer.update(event_type, data)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for asynchronously dispatched notifications (no-op when inline)"""
+        if self.dispatcher is None:
+            return True
+        return self.dispatcher.flush(timeout)
+
 
 # ============================================================================
 # CONFLICT DETECTION ENGINE
 # ============================================================================
 
+# A partition row: (start_minute, end_minute, schedule_index, room_code, lecturer_code)
+PartitionRow = Tuple[int, int, int, int, int]
+
+
+def _iter_partition_pairs(rows: List[PartitionRow],
+                          kinds: Tuple[int, ...] = (0, 1)) -> Iterator[Tuple[int, int, int]]:
+    """
+    Sweep line over the rows of one day, yielding (i, j, kind) pairs as found.
+
+    kind is 0 for a room conflict and 1 for a lecturer conflict, i < j.
+    A booking stays in its active bucket until a later start time reaches its
+    end time, so every comparison made is either a conflict or an eviction.
+    """
+    active_by_kind: Tuple[Dict[int, List[Tuple[int, int, int]]], ...] = ({}, {})
+
+    for start, end, i, room_code, lecturer_code in sorted(rows):
+        for kind in kinds:
+            active = active_by_kind[kind]
+            key = lecturer_code if kind else room_code
+            still_active = []
+            for other in active.get(key, ()):
+                other_start, other_end, j = other
+                if other_end <= start:
+                    continue
+                still_active.append(other)
+                if other_start < end:
+                    yield (j, i, kind) if j < i else (i, j, kind)
+            still_active.append((start, end, i))
+            active[key] = still_active
+
+
+def _sweep_partition(rows: List[PartitionRow]) -> Tuple[List[Tuple[int, int, int]], float]:
+    """
+    Sweep line over the rows of one day, returns ((i, j, kind) pairs, seconds).
+    Module level so ProcessPoolExecutor workers can run it.
+    """
+    started = timer.perf_counter()
+    pairs = list(_iter_partition_pairs(rows))
+    return pairs, timer.perf_counter() - started
+
+
 class ConflictDetectionEngine:
-    """Engine for detecting schedule conflicts (3-dimensional conflict detection)"""
+    """
+    Engine for detecting schedule conflicts (3-dimensional conflict detection)
+
+    Strategies:
+    - "sweep": per-day sweep line in pure Python (default)
+    - "parallel": the same sweep line with the seven day partitions shipped
+      to a ProcessPoolExecutor (max_workers processes)
+    - "vectorized": NumPy sorted arrays + searchsorted, for full-term audits
+      over very large datasets. Falls back to "sweep" without NumPy.
+    - "pairwise": the original O(n²) pair loop
+
+    Every strategy returns the same ScheduleConflict list from
+    detect_conflicts(); the static detect_schedule_conflicts() always uses
+    the sweep line. The sweep and parallel strategies record the time spent on each day partition in
+    last_partition_timings (day name -> seconds), measured inside the worker,
+    and the wall time of the whole per-day phase in last_partition_wall_time.
+    For "parallel" the wall time also covers shipping the rows to the
+    workers and the pairs back; compare it with the wall time of a "sweep"
+    run to see whether the pool pays off.
+    """
+
+    STRATEGIES = ("sweep", "parallel", "vectorized", "pairwise")
+
+    # Conflict type of each pair kind produced by the sweep lines
+    _PAIR_TYPES = (ConflictType.ROOM_CONFLICT, ConflictType.LECTURER_CONFLICT)
+
+    def __init__(self, strategy: str = "sweep", max_workers: Optional[int] = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'. Use: {', '.join(self.STRATEGIES)}")
+        if strategy == "vectorized" and np is None:
+            logger.warning("NumPy is not installed, using the sweep line strategy")
+            strategy = "sweep"
+        self.strategy = strategy
+        self.max_workers = max_workers
+        self.last_partition_timings: Dict[str, float] = {}
+        self.last_partition_wall_time = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the worker processes of the parallel strategy"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ConflictDetectionEngine':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @staticmethod
     def detect_schedule_conflicts(schedules: List[Schedule]) -> List[ScheduleConflict]:
@@ -287,21 +1354,102 @@ class ConflictDetectionEngine:
         2. Lecturer Conflict: Same day, overlapping time, same lecturer
         3. Capacity Exceeded: Number of students > room capacity
         
-        Time Complexity: O(n²) for schedule comparison, O(n log n) with interval trees
+        Room and lecturer conflicts use a sweep line per day: schedules are sorted
+        by start time and each one is only compared with the bookings still active
+        in its room and lecturer buckets. The result (content and order) is the
+        same as detect_schedule_conflicts_pairwise.
+        
+        Time Complexity: O(n log n + k), k = number of conflicts
+
+        Always uses the default sweep line; detect_conflicts() applies the
+        engine's strategy.
         """
-        conflicts: List[ScheduleConflict] = []
+        return ConflictDetectionEngine().detect_conflicts(schedules)
 
-        # Check for capacity violations first (O(n))
-        for schedule in schedules:
-            if not schedule.room.can_accommodate(schedule.num_students):
-                conflict = ScheduleConflict(
-                    conflict_type=ConflictType.CAPACITY_EXCEEDED,
-                    schedule_1=schedule,
-                    description=f"{schedule.course_name}: {schedule.num_students} students "
-                               f"exceed room capacity of {schedule.room.capacity}",
-                    severity="high"
-                )
-                conflicts.append(conflict)
+    def detect_conflicts(self, schedules: List[Schedule]) -> List[ScheduleConflict]:
+        """
+        Detect all conflicts in a list of schedules with this engine's strategy.
+
+        Returns the same list as detect_schedule_conflicts() for every strategy.
+        """
+        if self.strategy == "pairwise":
+            return self.detect_schedule_conflicts_pairwise(schedules)
+
+        conflicts = self._capacity_conflicts(schedules)
+        if self.strategy == "vectorized":
+            pairs = self._vectorized_conflict_pairs(schedules)
+        else:
+            pairs = self._sweep_conflict_pairs(schedules)
+        conflicts.extend(self._build_pair_conflicts(schedules, pairs))
+        return conflicts
+
+    def iter_conflicts(self, schedules: List[Schedule],
+                       conflict_types: Optional[Iterable[ConflictType]] = None,
+                       day: Optional[DayOfWeek] = None,
+                       room_id: Optional[str] = None,
+                       limit: Optional[int] = None) -> Iterator[ScheduleConflict]:
+        """
+        Yield conflicts lazily, stopping as soon as the caller does.
+
+        Filters: conflict_types (any of), day, and room_id (a conflict matches
+        when one of its schedules is in the room). At most limit conflicts are
+        yielded. Descriptions are only built when read.
+
+        Order: capacity conflicts first, then room and lecturer conflicts day by
+        day (MONDAY first) in sweep order, which is not necessarily the order
+        of detect_schedule_conflicts. The sweep line is always used.
+        """
+        if limit is not None and limit <= 0:
+            return
+        wanted = set(conflict_types) if conflict_types is not None else set(ConflictType)
+        yielded = 0
+
+        if ConflictType.CAPACITY_EXCEEDED in wanted:
+            for schedule in schedules:
+                if day is not None and schedule.day != day:
+                    continue
+                if room_id is not None and schedule.room.room_id != room_id:
+                    continue
+                for conflict in self._capacity_conflicts([schedule]):
+                    yield conflict
+                    yielded += 1
+                    if yielded == limit:
+                        return
+
+        kinds = tuple(kind for kind, conflict_type in enumerate(self._PAIR_TYPES)
+                      if conflict_type in wanted)
+        if not kinds:
+            return
+
+        partitions, _ = self._partition_rows(schedules, day)
+        for partition_day in sorted(partitions, key=lambda d: d.value):
+            rows = partitions[partition_day]
+            if room_id is not None and kinds == (0,):
+                # Room conflicts of another room can never match the filter
+                rows = [row for row in rows if schedules[row[2]].room.room_id == room_id]
+            for i, j, kind in _iter_partition_pairs(rows, kinds):
+                sched1, sched2 = schedules[i], schedules[j]
+                if room_id is not None and room_id not in (sched1.room.room_id,
+                                                           sched2.room.room_id):
+                    continue
+                if not sched1.time_slot.overlaps_with(sched2.time_slot):
+                    continue
+                yield self._pair_conflict(self._PAIR_TYPES[kind], sched1, sched2)
+                yielded += 1
+                if yielded == limit:
+                    return
+
+    @staticmethod
+    def detect_schedule_conflicts_pairwise(schedules: List[Schedule]) -> List[ScheduleConflict]:
+        """
+        Reference implementation comparing every pair of schedules.
+
+        Produces exactly the same result as detect_schedule_conflicts and is kept
+        as a correctness oracle for tests and benchmarks.
+
+        Time Complexity: O(n²)
+        """
+        conflicts = ConflictDetectionEngine._capacity_conflicts(schedules)
 
         # Check for room and lecturer conflicts (O(n²))
         for i, sched1 in enumerate(schedules):
@@ -316,31 +1464,174 @@ class ConflictDetectionEngine:
 
                 # Same room conflict
                 if sched1.room.room_id == sched2.room.room_id:
-                    conflict = ScheduleConflict(
-                        conflict_type=ConflictType.ROOM_CONFLICT,
-                        schedule_1=sched1,
-                        schedule_2=sched2,
-                        description=f"Room '{sched1.room.room_name}' double-booked: "
-                                   f"{sched1.course_name} vs {sched2.course_name}",
-                        severity="critical"
-                    )
-                    conflicts.append(conflict)
+                    conflicts.append(ConflictDetectionEngine._pair_conflict(
+                        ConflictType.ROOM_CONFLICT, sched1, sched2))
 
                 # Same lecturer conflict
                 if sched1.lecturer_name.lower() == sched2.lecturer_name.lower():
-                    conflict = ScheduleConflict(
-                        conflict_type=ConflictType.LECTURER_CONFLICT,
-                        schedule_1=sched1,
-                        schedule_2=sched2,
-                        description=f"Lecturer '{sched1.lecturer_name}' double-booked: "
-                                   f"{sched1.course_name} ({sched1.day.name} {sched1.time_slot}) vs "
-                                   f"{sched2.course_name} ({sched2.day.name} {sched2.time_slot})",
-                        severity="critical"
-                    )
-                    conflicts.append(conflict)
+                    conflicts.append(ConflictDetectionEngine._pair_conflict(
+                        ConflictType.LECTURER_CONFLICT, sched1, sched2))
 
         return conflicts
 
+    @staticmethod
+    def _capacity_conflicts(schedules: List[Schedule]) -> List[ScheduleConflict]:
+        """Check for capacity violations (O(n))"""
+        conflicts: List[ScheduleConflict] = []
+        for schedule in schedules:
+            if not schedule.room.can_accommodate(schedule.num_students):
+                conflict = ScheduleConflict(
+                    conflict_type=ConflictType.CAPACITY_EXCEEDED,
+                    schedule_1=schedule,
+                    description=None,
+                    severity="high"
+                )
+                conflicts.append(conflict)
+        return conflicts
+
+    @staticmethod
+    def _pair_conflict(conflict_type: ConflictType, sched1: Schedule,
+                       sched2: Schedule) -> ScheduleConflict:
+        """Build a room or lecturer conflict between two schedules"""
+        return ScheduleConflict(
+            conflict_type=conflict_type,
+            schedule_1=sched1,
+            schedule_2=sched2,
+            description=None,
+            severity="critical"
+        )
+
+    @staticmethod
+    def _partition_rows(schedules: List[Schedule],
+                        day: Optional[DayOfWeek] = None) -> Tuple[Dict[DayOfWeek, List[PartitionRow]], bool]:
+        """
+        Split schedules into compact per-day rows (only day, when given).
+
+        Rooms and lecturers are replaced by integer codes so a partition can be
+        pickled cheaply. Also returns whether every time is a whole minute; if
+        not, pairs found on the (outward rounded) minutes must be confirmed.
+        """
+        room_codes: Dict[str, int] = {}
+        lecturer_codes: Dict[str, int] = {}
+        partitions: Dict[DayOfWeek, List[PartitionRow]] = defaultdict(list)
+        whole_minutes = True
+        for index, schedule in enumerate(schedules):
+            if day is not None and schedule.day != day:
+                continue
+            slot = schedule.time_slot
+            whole_minutes = whole_minutes and slot.whole_minutes
+            partitions[schedule.day].append((
+                slot.start_minute, slot.end_minute, index,
+                room_codes.setdefault(schedule.room.room_id, len(room_codes)),
+                lecturer_codes.setdefault(schedule.lecturer_key, len(lecturer_codes)),
+            ))
+        return partitions, whole_minutes
+
+    def _sweep_conflict_pairs(self, schedules: List[Schedule]) -> List[Tuple[int, int, int]]:
+        """Find overlapping (i, j, kind) index pairs, one sweep line per day"""
+        partitions, whole_minutes = self._partition_rows(schedules)
+        days = sorted(partitions, key=lambda day: day.value)
+        payloads = [partitions[day] for day in days]
+
+        started = timer.perf_counter()
+        if self.strategy == "parallel" and len(payloads) > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            results = list(self._executor.map(_sweep_partition, payloads))
+        else:
+            results = [_sweep_partition(rows) for rows in payloads]
+        self.last_partition_wall_time = timer.perf_counter() - started
+
+        self.last_partition_timings = {
+            day.name: elapsed for day, (_, elapsed) in zip(days, results)
+        }
+        pairs = [pair for day_pairs, _ in results for pair in day_pairs]
+        if not whole_minutes:
+            pairs = [(i, j, kind) for i, j, kind in pairs
+                     if schedules[i].time_slot.overlaps_with(schedules[j].time_slot)]
+        return pairs
+
+    @staticmethod
+    def _vectorized_conflict_pairs(schedules: List[Schedule]) -> List[Tuple[int, int, int]]:
+        """
+        Find overlapping (i, j, kind) index pairs with NumPy.
+
+        Schedules are encoded as integer columns (day, start minute, end
+        minute, room code, lecturer code). For each conflict kind the rows are
+        sorted by (day, key code, start); the rows that can overlap row i are
+        then the ones after it whose combined key is below (bucket, end_i),
+        found with one searchsorted call for all rows at once.
+        """
+        count = len(schedules)
+        if count < 2:
+            return []
+
+        room_codes: Dict[str, int] = {}
+        lecturer_codes: Dict[str, int] = {}
+        rows = []
+        whole_minutes = True
+        for schedule in schedules:
+            slot = schedule.time_slot
+            whole_minutes = whole_minutes and slot.whole_minutes
+            rows.append((
+                schedule.day.value,
+                slot.start_minute,
+                slot.end_minute,
+                room_codes.setdefault(schedule.room.room_id, len(room_codes)),
+                lecturer_codes.setdefault(schedule.lecturer_key, len(lecturer_codes)),
+            ))
+        columns = np.array(rows, dtype=np.int64)
+        days, starts, ends = columns[:, 0], columns[:, 1], columns[:, 2]
+
+        # Minutes fit in 11 bits even after rounding the end upwards
+        minute_span = 2048
+        pairs: List[Tuple[int, int, int]] = []
+        for kind, codes in ((0, columns[:, 3]), (1, columns[:, 4])):
+            buckets = days * (codes.max() + 1) + codes
+            order = np.lexsort((starts, buckets))
+            sorted_buckets = buckets[order]
+            sorted_starts = starts[order]
+            sorted_ends = ends[order]
+
+            keys = sorted_buckets * minute_span + sorted_starts
+            limits = sorted_buckets * minute_span + np.clip(sorted_ends, 0, minute_span - 1)
+            upper = np.searchsorted(keys, limits, side='left')
+
+            positions = np.arange(count)
+            candidates = np.maximum(upper - positions - 1, 0)
+            total = int(candidates.sum())
+            if total == 0:
+                continue
+
+            left = np.repeat(positions, candidates)
+            offsets = np.arange(total) - np.repeat(np.cumsum(candidates) - candidates, candidates)
+            right = left + 1 + offsets
+            overlapping = sorted_starts[left] < sorted_ends[right]
+            first = order[left[overlapping]]
+            second = order[right[overlapping]]
+            found = zip(np.minimum(first, second).tolist(),
+                        np.maximum(first, second).tolist(),
+                        [kind] * len(first))
+
+            if whole_minutes:
+                pairs.extend(found)
+            else:
+                # Minute columns are rounded outwards, confirm on the exact times
+                pairs.extend((i, j, kind) for i, j, kind in found
+                             if schedules[i].time_slot.overlaps_with(schedules[j].time_slot))
+
+        return pairs
+
+    @staticmethod
+    def _build_pair_conflicts(schedules: List[Schedule],
+                              pairs: List[Tuple[int, int, int]]) -> List[ScheduleConflict]:
+        """Turn (i, j, kind) pairs into conflicts, ordered like the pairwise loop"""
+        kinds = ConflictDetectionEngine._PAIR_TYPES
+        return [
+            ConflictDetectionEngine._pair_conflict(kinds[kind], schedules[i], schedules[j])
+            for i, j, kind in sorted(pairs)
+        ]
+
     @staticmethod
     def get_conflict_summary(conflicts: List[ScheduleConflict]) -> Dict:
         """Get summary of conflicts"""
@@ -365,64 +1656,887 @@ class ConflictDetectionEngine:
         return summary
 
 
+# ============================================================================
+# INDEXES
+# ============================================================================
+
+class ScheduleIndex:
+    """
+    Hash index from a derived key (lecturer, room, day, ...) to the schedules
+    sharing it. Buckets are dicts keyed by schedule_id, so add, remove and
+    replace are O(1) and a lookup costs O(k). Schedules whose key is None
+    (e.g. no krs_id) are not indexed.
+
+    The key each schedule was indexed under is remembered by schedule_id, so
+    removal still finds the right bucket after the Schedule object itself
+    was changed in place (get_schedule(), edit, update_schedule()).
+    """
+
+    def __init__(self, key: Callable[[Schedule], Optional[Hashable]]):
+        self._key = key
+        self._buckets: Dict[Hashable, Dict[str, Schedule]] = {}
+        self._keys: Dict[str, Hashable] = {}
+
+    def add(self, schedule: Schedule) -> None:
+        """Index a schedule"""
+        key = self._key(schedule)
+        if key is not None:
+            self._buckets.setdefault(key, {})[schedule.schedule_id] = schedule
+            self._keys[schedule.schedule_id] = key
+
+    def remove(self, schedule: Schedule) -> None:
+        """Drop a schedule from the index"""
+        key = self._keys.pop(schedule.schedule_id, None)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.pop(schedule.schedule_id, None)
+            if not bucket:
+                del self._buckets[key]
+
+    def replace(self, old: Schedule, new: Schedule) -> None:
+        """Swap in a new version of a schedule, keeping its position if the key is unchanged"""
+        key = self._key(new)
+        if key is not None and key == self._keys.get(old.schedule_id):
+            self._buckets[key][new.schedule_id] = new
+        else:
+            self.remove(old)
+            self.add(new)
+
+    def get(self, key: Hashable) -> List[Schedule]:
+        """Schedules indexed under key"""
+        return list(self._buckets.get(key, {}).values())
+
+    def count(self, key: Hashable) -> int:
+        """Number of schedules indexed under key"""
+        return len(self._buckets.get(key, ()))
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class IntervalIndex:
+    """
+    Sorted interval list for one bucket of bookings (e.g. one room on one day).
+
+    Entries are (start, end, item_id) in minutes of the day, kept sorted by
+    start. A multiset of lengths keeps max_length equal to the longest entry
+    still indexed, so the entries that can overlap [start, end) all sit in the
+    window [start - max_length, end) of the sorted list. A query costs
+    O(log n + w) where w is the number of entries starting in that window;
+    w stays close to the number of matches unless one entry is much longer
+    than the rest of the bucket.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[int, int, str]] = []
+        self._starts: List[int] = []
+        self._lengths: Counter = Counter()
+        self._max_length = 0
+
+    def add(self, start: int, end: int, item_id: str) -> None:
+        """Insert an interval"""
+        entry = (start, end, item_id)
+        position = bisect_left(self._entries, entry)
+        self._entries.insert(position, entry)
+        self._starts.insert(position, start)
+        self._lengths[end - start] += 1
+        self._max_length = max(self._max_length, end - start)
+
+    def remove(self, start: int, end: int, item_id: str) -> bool:
+        """Remove an interval, returns False if it was not indexed"""
+        entry = (start, end, item_id)
+        position = bisect_left(self._entries, entry)
+        if position == len(self._entries) or self._entries[position] != entry:
+            return False
+        del self._entries[position]
+        del self._starts[position]
+        length = end - start
+        self._lengths[length] -= 1
+        if not self._lengths[length]:
+            del self._lengths[length]
+            if length == self._max_length:
+                self._max_length = max(self._lengths, default=0)
+        return True
+
+    def overlapping(self, start: int, end: int) -> List[str]:
+        """Ids of the intervals overlapping [start, end), ordered by start"""
+        low = bisect_left(self._starts, start - self._max_length)
+        high = bisect_left(self._starts, end)
+        return [item_id for _, item_end, item_id in self._entries[low:high]
+                if item_end > start]
+
+    def spans(self) -> Iterator[Tuple[int, int]]:
+        """(start, end) of every interval, ordered by start"""
+        return ((start, end) for start, end, _ in self._entries)
+
+    def __iter__(self):
+        return (item_id for _, _, item_id in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class OccupancyBitmap:
+    """
+    Per-day occupancy bitmaps at SLOT_MINUTES resolution.
+
+    Each (key, day) is one Python int with one bit per slot (288 bits for
+    5-minute slots), so "is R free on TUESDAY 10:00-12:00" is a single AND
+    with the slot mask of the query. Bookings are rounded outwards to whole
+    slots: a free answer is always exact, a busy answer is exact when the
+    query is aligned to the slot grid. Bookings whose end is not after their
+    start occupy no slot.
+    """
+
+    SLOT_MINUTES = 5
+    SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+    def __init__(self):
+        self._bitmaps: Dict[str, List[int]] = {}
+
+    @classmethod
+    def mask(cls, start: int, end: int) -> int:
+        """Bit mask of the slots touched by [start, end) minutes"""
+        first = max(start, 0) // cls.SLOT_MINUTES
+        last = min(-(-end // cls.SLOT_MINUTES), cls.SLOTS_PER_DAY)
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    @classmethod
+    def is_aligned(cls, start: int, end: int) -> bool:
+        """Whether [start, end) lies exactly on slot boundaries"""
+        return start % cls.SLOT_MINUTES == 0 and end % cls.SLOT_MINUTES == 0
+
+    def get(self, key: str, day: DayOfWeek) -> int:
+        """Bitmap of key on day"""
+        days = self._bitmaps.get(key)
+        return days[day.value] if days else 0
+
+    def set(self, key: str, day: DayOfWeek, bitmap: int) -> None:
+        """Replace the bitmap of key on day"""
+        days = self._bitmaps.get(key)
+        if days is None:
+            if not bitmap:
+                return
+            days = self._bitmaps[key] = [0] * len(DayOfWeek)
+        days[day.value] = bitmap
+        if not any(days):
+            del self._bitmaps[key]
+
+    def occupy(self, key: str, day: DayOfWeek, start: int, end: int) -> None:
+        """Mark [start, end) as occupied"""
+        self.set(key, day, self.get(key, day) | self.mask(start, end))
+
+    def rebuild(self, key: str, day: DayOfWeek, spans: Iterable[Tuple[int, int]]) -> None:
+        """Recompute the bitmap of key on day from its remaining bookings"""
+        bitmap = 0
+        for start, end in spans:
+            bitmap |= self.mask(start, end)
+        self.set(key, day, bitmap)
+
+    def is_free(self, key: str, day: DayOfWeek, start: int, end: int) -> bool:
+        """Whether no occupied slot intersects [start, end)"""
+        return not self.get(key, day) & self.mask(start, end)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the bitmaps (dict, lists and ints)"""
+        total = sys.getsizeof(self._bitmaps)
+        for days in self._bitmaps.values():
+            total += sys.getsizeof(days)
+            total += sum(sys.getsizeof(bitmap) for bitmap in days if bitmap)
+        return total
+
+    def __len__(self) -> int:
+        return len(self._bitmaps)
+
+
+# ============================================================================
+# CONCURRENCY
+# ============================================================================
+
+class ReadWriteLock:
+    """
+    Reader-writer lock: any number of concurrent readers or a single writer.
+
+    Waiting writers hold back new readers, so a steady stream of reads
+    cannot starve them; readers already waiting when a writer releases are
+    let in before the next writer, so back-to-back writes cannot starve
+    readers either. The lock is reentrant for the thread holding it: a
+    reader may nest reads, and the writer may take the read or write side
+    again (e.g. an observer reading the service during a notification).
+    Upgrading a read lock to a write lock would deadlock and raises
+    RuntimeError instead.
+    """
+
+    def __init__(self):
+        # Uncontended paths take the bare mutex; the condition is only used
+        # to wait and wake
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        # Waiting readers to admit ahead of the next writer
+        self._admit = 0
+        self._local = threading.local()
+
+    def acquire_read(self, blocking: bool = True) -> bool:
+        """
+        Wait until no writer holds or waits for the lock. With
+        blocking=False, return False instead of waiting.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if depth or self._writer == threading.get_ident():
+            self._local.depth = depth + 1
+            return True
+        with self._mutex:
+            if self._writer is not None or (self._waiting_writers and not self._admit):
+                if not blocking:
+                    return False
+                self._waiting_readers += 1
+                try:
+                    while self._writer is not None or (self._waiting_writers and not self._admit):
+                        self._condition.wait()
+                finally:
+                    self._waiting_readers -= 1
+                if self._admit:
+                    self._admit -= 1
+            self._readers += 1
+        self._local.depth = 1
+        return True
+
+    def release_read(self) -> None:
+        """Release one level of the read side"""
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            raise RuntimeError("Read lock not held")
+        self._local.depth = depth - 1
+        if depth > 1 or self._writer == threading.get_ident():
+            return
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Block until there are no readers and no other writer"""
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, 'depth', 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._mutex:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._admit:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Release one level of the write side"""
+        if self._writer != threading.get_ident():
+            raise RuntimeError("Write lock not held")
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._mutex:
+            self._writer = None
+            self._admit = self._waiting_readers
+            self._condition.notify_all()
+
+    @property
+    def write_held(self) -> bool:
+        """Whether the calling thread holds the write side"""
+        return self._writer == threading.get_ident()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        """Hold the read side for the duration of a with block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """Hold the write side for the duration of a with block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _reads(method: Callable) -> Callable:
+    """Run a SchedulingService method under the read side of its lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._lock.release_read()
+    return wrapper
+
+
+def _writes(method: Callable) -> Callable:
+    """
+    Run a SchedulingService method under the write side of its lock and
+    publish the snapshot of what it committed before releasing it
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            try:
+                if self._batch is None:
+                    self._publish_snapshot()
+            finally:
+                self._lock.release_write()
+    return wrapper
+
+
 # ============================================================================
 # SCHEDULING SERVICE
 # ============================================================================
 
-class SchedulingService(ScheduleSubject):
-    """Main scheduling service with CRUD operations and conflict detection"""
+class ScheduleBatch:
+    """
+    Mutations staged inside SchedulingService.batch().
+
+    Keeps an undo log for rollback and, per touched schedule, the version it
+    had before the batch (None if it did not exist), so the exit can run
+    conflict detection once and report one net event per schedule.
+    """
 
     def __init__(self):
-        super().__init__()
+        self.errors: List[str] = []
+        self.committed = False
+        self.undo_log: List[Tuple] = []
+        self.before: Dict[str, Optional[Schedule]] = {}
+        self.journal: List[Tuple] = []
+
+    def record(self, schedule_id: str, before: Optional[Schedule], undo: Tuple) -> None:
+        """Remember a mutation of schedule_id and how to revert it"""
+        self.before.setdefault(schedule_id, before)
+        self.undo_log.append(undo)
+
+    @property
+    def touched(self) -> List[str]:
+        """Ids of the schedules changed in the batch, in first-touch order"""
+        return list(self.before)
+
+
+class _SnapshotBlock:
+    """
+    One chunk of a ScheduleSnapshot: the schedules whose insertion position
+    falls in one SNAPSHOT_BLOCK range, in position order, and the conflicts
+    whose schedule_1 is one of them. Blocks are never changed after they are
+    built: a snapshot reuses every block of the previous one whose range saw
+    no change, together with the lookup indexes already built over it.
+    """
+
+    __slots__ = ('schedules', 'capacity_conflicts', 'pair_conflicts', '_indexes')
+
+    def __init__(self, schedules: Dict[str, Schedule],
+                 capacity_conflicts: Tuple[ScheduleConflict, ...],
+                 pair_conflicts: Tuple[ScheduleConflict, ...]):
+        self.schedules = schedules
+        self.capacity_conflicts = capacity_conflicts
+        self.pair_conflicts = pair_conflicts
+        self._indexes: Dict[str, Dict[Hashable, List[Schedule]]] = {}
+
+    def lookup(self, name: str, key: Hashable) -> List[Schedule]:
+        """Schedules of the block whose attribute path `name` equals key"""
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            get_key = attrgetter(name)
+            for schedule in self.schedules.values():
+                index.setdefault(get_key(schedule), []).append(schedule)
+            self._indexes[name] = index
+        return index.get(key, [])
+
+
+class _SnapshotSchedules(Mapping):
+    """Read-only schedule_id -> Schedule mapping of a ScheduleSnapshot, in insertion order"""
+
+    def __init__(self, blocks: Dict[int, _SnapshotBlock], by_id: Tuple[Dict[str, Schedule], ...],
+                 length: int):
+        self._blocks = blocks
+        self._by_id = by_id
+        self._length = length
+
+    def __getitem__(self, schedule_id: str) -> Schedule:
+        return self._by_id[hash(schedule_id) % len(self._by_id)][schedule_id]
+
+    def __contains__(self, schedule_id) -> bool:
+        return schedule_id in self._by_id[hash(schedule_id) % len(self._by_id)]
+
+    def __iter__(self) -> Iterator[str]:
+        for block in self._blocks.values():
+            yield from block.schedules
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class ScheduleSnapshot:
+    """
+    Versioned, read-only view of a SchedulingService (schedules, rooms,
+    conflicts) as returned by SchedulingService.snapshot().
+
+    Reading a snapshot takes no lock. The service publishes one per commit,
+    copy-on-write: schedules and conflicts are split into blocks of
+    SNAPSHOT_BLOCK insertion positions plus ID_CHUNKS hash chunks for lookups
+    by id, and a new snapshot only rebuilds the blocks and chunks the commit
+    touched. Lookup indexes are built per block on first use and carried
+    over with the unchanged blocks, so a lookup costs O(blocks + k).
+
+    event_id is the last event id of the service's event_source when the
+    snapshot was published (None without one): a client that loads the
+    snapshot and then streams from event_id misses nothing.
+
+    The Schedule and Room objects are the service's own, shared with later
+    snapshots. The service replaces a schedule on update rather than
+    changing it, so a snapshot stays consistent only as long as callers
+    treat those objects as read-only too.
+    """
+
+    SNAPSHOT_BLOCK = 256
+    ID_CHUNKS = 256
+
+    def __init__(self, version: int, blocks: Dict[int, _SnapshotBlock],
+                 by_id: Tuple[Dict[str, Schedule], ...], rooms: Mapping, length: int,
+                 event_id: Optional[str] = None):
+        self.version = version
+        self.event_id = event_id
+        self.schedules: Mapping = _SnapshotSchedules(blocks, by_id, length)
+        self.rooms = rooms
+        self._blocks = blocks
+        self._by_id = by_id
+        self._conflicts: Optional[Tuple[ScheduleConflict, ...]] = None
+
+    @classmethod
+    def empty(cls) -> 'ScheduleSnapshot':
+        """Version 0: no rooms, no schedules"""
+        return cls(0, {}, tuple({} for _ in range(cls.ID_CHUNKS)), MappingProxyType({}), 0)
+
+    @property
+    def conflicts(self) -> Tuple[ScheduleConflict, ...]:
+        """All conflicts, in the order a full detection pass would return them"""
+        if self._conflicts is None:
+            blocks = self._blocks.values()
+            self._conflicts = tuple(chain(
+                chain.from_iterable(block.capacity_conflicts for block in blocks),
+                chain.from_iterable(block.pair_conflicts for block in blocks)))
+        return self._conflicts
+
+    def _lookup(self, name: str, key: Hashable) -> List[Schedule]:
+        """Schedules whose attribute path `name` equals key, in insertion order"""
+        return [schedule for block in self._blocks.values()
+                for schedule in block.lookup(name, key)]
+
+    def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        """Get schedule by ID"""
+        return self.schedules.get(schedule_id)
+
+    def list_schedules(self) -> List[Schedule]:
+        """List all schedules"""
+        return list(chain.from_iterable(block.schedules.values()
+                                        for block in self._blocks.values()))
+
+    def get_room(self, room_id: str) -> Optional[Room]:
+        """Get room by ID"""
+        return self.rooms.get(room_id)
+
+    def list_rooms(self) -> List[Room]:
+        """List all rooms"""
+        return list(self.rooms.values())
+
+    def get_schedules_by_lecturer(self, lecturer_name: str) -> List[Schedule]:
+        """Get all schedules for a specific lecturer (case-insensitive)"""
+        return self._lookup('lecturer_key', lecturer_name.lower())
+
+    def get_schedules_by_room(self, room_id: str) -> List[Schedule]:
+        """Get all schedules for a specific room"""
+        return self._lookup('room.room_id', room_id)
+
+    def get_schedules_by_day(self, day: DayOfWeek) -> List[Schedule]:
+        """Get all schedules on a specific day"""
+        return self._lookup('day', day)
+
+    def get_schedules_by_course(self, course_code: str) -> List[Schedule]:
+        """Get all schedules (sections) of a course"""
+        return self._lookup('course_code', course_code)
+
+    def get_schedules_by_krs(self, krs_id: str) -> List[Schedule]:
+        """Get all schedules linked to a KRS"""
+        return self._lookup('krs_id', krs_id)
+
+    def count_schedules_by_room(self, room_id: str) -> int:
+        """Number of schedules in a room"""
+        return sum(len(block.lookup('room.room_id', room_id)) for block in self._blocks.values())
+
+    def get_conflicts(self) -> List[ScheduleConflict]:
+        """Get all conflicts"""
+        return list(self.conflicts)
+
+    def get_conflict_summary(self) -> Dict:
+        """Get conflict summary"""
+        return ConflictDetectionEngine.get_conflict_summary(self.conflicts)
+
+
+class SchedulingService(ScheduleSubject):
+    """
+    Main scheduling service with CRUD operations and conflict detection
+
+    Safe to share between threads: queries run under the read side of a
+    ReadWriteLock and do not block each other, mutations (including their
+    conflict detection and observer notifications) are serialized under the
+    write side. Readers that must never wait for a writer use snapshot(),
+    which every commit publishes before the write lock is released. Pass an
+    AsyncDispatcher to deliver observer notifications on worker threads
+    instead of inside the mutation; those deliveries are queued once the
+    snapshot of their change is published, while inline observers (and all
+    observers without a dispatcher) run before it and read the service
+    itself.
+
+    If journal is set (see schedule_persistence.DurableStore), every
+    change is handed to journal.append() as a list of ('room', Room),
+    ('put', Schedule) and ('delete', schedule_id) entries, in commit order
+    and under the write lock, after validation and before memory changes:
+    if append() raises, the change is not applied. A batch is one append.
+    """
+
+    # Bulk changes touching at least 1/FULL_REFRESH_RATIO of all schedules
+    # re-run full conflict detection instead of updating per schedule
+    FULL_REFRESH_RATIO = 4
+
+    def __init__(self, dispatcher: Optional[AsyncDispatcher] = None):
+        super().__init__(dispatcher)
+        self._lock = ReadWriteLock()
         self.schedules: Dict[str, Schedule] = {}
         self.rooms: Dict[str, Room] = {}
-        self.conflicts: List[ScheduleConflict] = []
         self.conflict_detection = ConflictDetectionEngine()
 
+        # Insertion position of every schedule, used to keep the conflict list
+        # in the same order a full detection pass would produce
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+
+        # Interval indexes per (day, room_id) and per (day, lecturer_key), and
+        # the (day, room_id, lecturer_key, start, end) each schedule was
+        # indexed under, so removal does not depend on the Schedule's fields
+        self._interval_keys: Dict[str, Tuple[DayOfWeek, str, str, int, int]] = {}
+        self._room_buckets: Dict[Tuple[DayOfWeek, str], IntervalIndex] = defaultdict(IntervalIndex)
+        self._lecturer_buckets: Dict[Tuple[DayOfWeek, str], IntervalIndex] = defaultdict(IntervalIndex)
+
+        # 5-minute occupancy bitmaps per room_id and per lecturer_key
+        self.room_occupancy = OccupancyBitmap()
+        self.lecturer_occupancy = OccupancyBitmap()
+
+        # Hash indexes behind the get_schedules_by_* lookups
+        self._by_lecturer = ScheduleIndex(attrgetter('lecturer_key'))
+        self._by_room = ScheduleIndex(attrgetter('room.room_id'))
+        self._by_day = ScheduleIndex(attrgetter('day'))
+        self._by_course_code = ScheduleIndex(attrgetter('course_code'))
+        self._by_krs_id = ScheduleIndex(attrgetter('krs_id'))
+        self._hash_indexes = (self._by_lecturer, self._by_room, self._by_day,
+                              self._by_course_code, self._by_krs_id)
+
+        # Live conflict set, keyed by ScheduleConflict.key
+        self._conflict_index: Dict[Tuple, ScheduleConflict] = {}
+        self._conflict_keys_by_schedule: Dict[str, Set[Tuple]] = defaultdict(set)
+        self._sorted_conflicts: Optional[List[ScheduleConflict]] = []
+
+        # Open batch(), if any
+        self._batch: Optional[ScheduleBatch] = None
+
+        # Bumped on every committed change. Schedules are mirrored per
+        # snapshot block (insertion position range) and id chunk, and the
+        # ones a commit touches are marked, so publishing its snapshot only
+        # copies those (see ScheduleSnapshot)
+        self._version = 0
+        self._snapshot = ScheduleSnapshot.empty()
+        self._snapshot_blocks: Dict[int, Dict[str, Schedule]] = {}
+        self._snapshot_ids: List[Dict[str, Schedule]] = [
+            {} for _ in range(ScheduleSnapshot.ID_CHUNKS)]
+        self._dirty_blocks: Set[int] = set()
+        self._dirty_ids: Set[int] = set()
+        self._rooms_changed = False
+
+        # Dispatcher deliveries waiting for the snapshot of their change
+        self._outbox: List[Tuple[List[Observer], EventType, Dict]] = []
+
+        # Optional durable log of committed changes
+        self.journal = None
+
+        # Optional event stream whose last_event_id each snapshot records
+        self._event_source = None
+
+    @property
+    def version(self) -> int:
+        """Monotonically increasing number of committed changes"""
+        return self._version
+
+    def snapshot(self) -> ScheduleSnapshot:
+        """
+        Read-only view of the latest committed state, for lock-free reads.
+
+        Never waits for a writer. Every commit (single change, bulk import or
+        batch) publishes its snapshot before releasing the write lock, so once
+        a write returned, snapshot() includes it; while a mutation or batch is
+        still in flight the previous snapshot is returned.
+        """
+        return self._snapshot
+
+    @property
+    def event_source(self):
+        """Observer with a last_event_id (e.g. an EventBroadcaster), or None"""
+        return self._event_source
+
+    @event_source.setter
+    def event_source(self, source) -> None:
+        with self._lock.write_locked():
+            self._event_source = source
+            if self._batch is None:
+                self._publish_snapshot()
+
+    def _publish_snapshot(self) -> None:
+        """
+        Publish the snapshot of the current version unless it already exists,
+        then queue the dispatcher deliveries that waited for it.
+
+        Copy-on-write: only the blocks and id chunks changed since the
+        previous snapshot are copied, O(SNAPSHOT_BLOCK) per touched block
+        plus O(blocks) for the block table, and the others are shared.
+        """
+        previous = self._snapshot
+        # Inline observers have already seen this commit's events
+        source = self._event_source
+        event_id = None if source is None else source.last_event_id
+        if previous.version != self._version:
+            blocks = dict(previous._blocks)
+            added = False
+            for block in self._dirty_blocks:
+                members = self._snapshot_blocks.get(block)
+                if not members:
+                    blocks.pop(block, None)
+                    continue
+                added = added or block not in blocks
+                blocks[block] = self._build_block(members)
+            if added and previous._blocks:
+                # Blocks are listed in position order
+                last = next(reversed(previous._blocks))
+                if any(block < last for block in self._dirty_blocks if block not in previous._blocks):
+                    blocks = dict(sorted(blocks.items()))
+            by_id = list(previous._by_id)
+            for chunk in self._dirty_ids:
+                by_id[chunk] = dict(self._snapshot_ids[chunk])
+            rooms = MappingProxyType(dict(self.rooms)) if self._rooms_changed else previous.rooms
+            self._snapshot = ScheduleSnapshot(self._version, blocks, tuple(by_id), rooms,
+                                              len(self.schedules), event_id)
+            self._dirty_blocks.clear()
+            self._dirty_ids.clear()
+            self._rooms_changed = False
+        elif previous.event_id != event_id:
+            # Events without a commit (or a new event_source): same state, new position
+            self._snapshot = ScheduleSnapshot(previous.version, previous._blocks, previous._by_id,
+                                              previous.rooms, len(previous.schedules), event_id)
+
+        if self._outbox:
+            outbox, self._outbox = self._outbox, []
+            for observers, event_type, data in outbox:
+                self.dispatcher.submit(observers, event_type, data)
+
+    def _build_block(self, members: Dict[str, Schedule]) -> _SnapshotBlock:
+        """Copy one block of schedules with the conflicts whose schedule_1 is in it"""
+        capacity_conflicts, pair_conflicts = [], []
+        for schedule_id in members:
+            for key in self._conflict_keys_by_schedule.get(schedule_id, ()):
+                conflict = self._conflict_index[key]
+                if conflict.schedule_1.schedule_id != schedule_id:
+                    continue
+                if conflict.schedule_2 is None:
+                    capacity_conflicts.append(conflict)
+                else:
+                    pair_conflicts.append(conflict)
+        pair_conflicts.sort(key=self._conflict_order)
+        return _SnapshotBlock(dict(members), tuple(capacity_conflicts), tuple(pair_conflicts))
+
+    def _track(self, schedule: Schedule) -> None:
+        """Put a schedule into its snapshot block and id chunk, marking both changed"""
+        schedule_id = schedule.schedule_id
+        block = self._positions[schedule_id] // ScheduleSnapshot.SNAPSHOT_BLOCK
+        chunk = hash(schedule_id) % ScheduleSnapshot.ID_CHUNKS
+        self._snapshot_blocks.setdefault(block, {})[schedule_id] = schedule
+        self._snapshot_ids[chunk][schedule_id] = schedule
+        self._dirty_blocks.add(block)
+        self._dirty_ids.add(chunk)
+
+    def _untrack(self, schedule_id: str) -> None:
+        """Take a schedule out of its snapshot block and id chunk, marking both changed"""
+        block = self._positions[schedule_id] // ScheduleSnapshot.SNAPSHOT_BLOCK
+        chunk = hash(schedule_id) % ScheduleSnapshot.ID_CHUNKS
+        members = self._snapshot_blocks[block]
+        del members[schedule_id]
+        if not members:
+            del self._snapshot_blocks[block]
+        del self._snapshot_ids[chunk][schedule_id]
+        self._dirty_blocks.add(block)
+        self._dirty_ids.add(chunk)
+
+    def _touch_conflict(self, conflict: ScheduleConflict) -> None:
+        """Mark the snapshot block holding a conflict (that of its schedule_1) changed"""
+        self._dirty_blocks.add(
+            self._positions[conflict.schedule_1.schedule_id] // ScheduleSnapshot.SNAPSHOT_BLOCK)
+
+    def _dispatch(self, observers: Iterable[Observer], event_type: EventType, data: Dict) -> None:
+        """
+        Inside a write, hold dispatcher deliveries back until the snapshot of
+        the change is published, so an observer reading snapshot() sees it.
+        Inline observers are still updated right away.
+        """
+        if self.dispatcher is None or not self._lock.write_held:
+            super()._dispatch(observers, event_type, data)
+            return
+        observers = list(observers)
+        inline = [observer for observer in observers if observer.inline]
+        if inline:
+            self.dispatcher.submit(inline, event_type, data)
+        queued = [observer for observer in observers if not observer.inline]
+        if queued:
+            self._outbox.append((queued, event_type, data))
+
+    @property
+    def lock(self) -> ReadWriteLock:
+        """
+        The service's reader-writer lock, for callers that need several
+        calls to be atomic (e.g. read-modify-write of a schedule)
+        """
+        return self._lock
+
     # Room Management
+    @_writes
     def add_room(self, room: Room) -> bool:
         """Add a new room"""
         if room.room_id in self.rooms:
             logger.warning(f"Room {room.room_id} already exists")
             return False
+        # Rooms survive a batch rollback, so they are journaled right away
+        if self.journal is not None:
+            self.journal.append([('room', room)])
         self.rooms[room.room_id] = room
+        self._rooms_changed = True
+        self._version += 1
         logger.info(f"✅ Room added: {room}")
         return True
 
+    @_reads
     def get_room(self, room_id: str) -> Optional[Room]:
         """Get room by ID"""
         return self.rooms.get(room_id)
 
+    @_reads
     def list_rooms(self) -> List[Room]:
         """List all rooms"""
         return list(self.rooms.values())
 
     # Schedule CRUD Operations
+    @_writes
     def create_schedule(self, schedule: Schedule) -> bool:
         """Create a new schedule"""
         if schedule.schedule_id in self.schedules:
-            logger.warning(f"Schedule {schedule.schedule_id} already exists")
-            return False
+            return self._reject(f"Schedule {schedule.schedule_id} already exists", logging.WARNING)
 
         # Validate room exists and has capacity
         if not self._validate_schedule(schedule):
             return False
 
-        self.schedules[schedule.schedule_id] = schedule
+        self._write_journal([('put', schedule)])
+        self._store_schedule(schedule)
         logger.info(f"✅ Schedule created: {schedule}")
+        if self._batch is not None:
+            self._batch.record(schedule.schedule_id, None, ('create', schedule))
+            return True
 
         # Check for conflicts
-        self._detect_and_notify_conflicts()
+        self._detect_and_notify_conflicts(schedule.schedule_id)
 
         # Notify observers
         self.notify(EventType.SCHEDULE_CREATED, schedule.to_dict())
         return True
 
+    @_writes
+    def create_schedules_bulk(self, schedules: Iterable[Schedule]) -> List[BulkResult]:
+        """
+        Create many schedules at once, e.g. when loading a term.
+
+        Every row is validated first and invalid rows (unknown room, capacity,
+        duplicate id) are skipped. The valid rows are inserted, conflict
+        detection runs once over the result, and observers receive a single
+        BATCH_APPLIED summary instead of one event per schedule and conflict.
+
+        Returns one BulkResult per input row, in input order.
+        """
+        results: List[BulkResult] = []
+        accepted: List[Schedule] = []
+        seen: Set[str] = set()
+        for index, schedule in enumerate(schedules):
+            if not isinstance(schedule, Schedule):
+                results.append(BulkResult(index, None, False, "Not a Schedule"))
+                continue
+            error = self._validation_error(schedule)
+            if error is None and (schedule.schedule_id in self.schedules
+                                  or schedule.schedule_id in seen):
+                error = f"Schedule {schedule.schedule_id} already exists"
+            if error is not None:
+                results.append(BulkResult(index, schedule.schedule_id, False, error))
+                continue
+            seen.add(schedule.schedule_id)
+            accepted.append(schedule)
+            results.append(BulkResult(index, schedule.schedule_id, True))
+
+        if accepted:
+            self._write_journal([('put', schedule) for schedule in accepted])
+        for schedule in accepted:
+            self._store_schedule(schedule)
+        failed = [result for result in results if not result.success]
+
+        # Inside batch() the rows join the batch and its exit does the rest
+        if self._batch is not None:
+            for schedule in accepted:
+                self._batch.record(schedule.schedule_id, None, ('create', schedule))
+            self._batch.errors.extend(f"Row {result.index}: {result.error}" for result in failed)
+            return results
+
+        added, resolved = self._refresh_conflicts([s.schedule_id for s in accepted])
+        self._version += 1
+        logger.info(f"✅ Bulk create: {len(accepted)} created, {len(failed)} rejected, "
+                    f"{len(added)} new conflict(s)")
+        self._notify_batch(accepted, [], [], failed, added, resolved)
+        return results
+
+    @_writes
     def update_schedule(self, schedule_id: str, updated_schedule: Schedule) -> bool:
         """Update an existing schedule"""
         if schedule_id not in self.schedules:
-            logger.warning(f"Schedule {schedule_id} not found")
-            return False
+            return self._reject(f"Schedule {schedule_id} not found", logging.WARNING)
+
+        if updated_schedule.schedule_id != schedule_id:
+            return self._reject(
+                f"Schedule id mismatch: {updated_schedule.schedule_id} != {schedule_id}")
 
         if not self._validate_schedule(updated_schedule):
             return False
@@ -430,28 +2544,42 @@ class SchedulingService(ScheduleSubject):
         old_schedule = self.schedules[schedule_id]
         updated_schedule.created_at = old_schedule.created_at
         updated_schedule.updated_at = datetime.now()
+        self._share_room(updated_schedule)
+        self._write_journal([('put', updated_schedule)])
         self.schedules[schedule_id] = updated_schedule
+        self._reindex_schedule(old_schedule, updated_schedule)
 
         logger.info(f"✅ Schedule updated: {updated_schedule}")
+        if self._batch is not None:
+            self._batch.record(schedule_id, old_schedule,
+                               ('update', old_schedule, updated_schedule))
+            return True
 
         # Check for conflicts
-        self._detect_and_notify_conflicts()
+        self._detect_and_notify_conflicts(schedule_id)
 
         # Notify observers
         self.notify(EventType.SCHEDULE_UPDATED, updated_schedule.to_dict())
         return True
 
+    @_writes
     def delete_schedule(self, schedule_id: str) -> bool:
         """Delete a schedule"""
         if schedule_id not in self.schedules:
-            logger.warning(f"Schedule {schedule_id} not found")
-            return False
+            return self._reject(f"Schedule {schedule_id} not found", logging.WARNING)
 
+        self._write_journal([('delete', schedule_id)])
         schedule = self.schedules.pop(schedule_id)
+        self._unindex_schedule(schedule)
         logger.info(f"✅ Schedule deleted: {schedule}")
+        if self._batch is not None:
+            self._batch.record(schedule_id, schedule,
+                               ('delete', schedule, self._positions[schedule_id]))
+            return True
 
         # Check for conflicts (in case deletion resolved conflicts)
-        self._detect_and_notify_conflicts()
+        self._detect_and_notify_conflicts(schedule_id)
+        del self._positions[schedule_id]
 
         # Notify observers
         self.notify(EventType.SCHEDULE_DELETED, schedule.to_dict())
@@ -462,65 +2590,505 @@ class SchedulingService(ScheduleSubject):
 
         return True
 
+    @contextmanager
+    def batch(self) -> Iterator[ScheduleBatch]:
+        """
+        Stage several mutations and apply their side effects once.
+
+        Inside the block create/update/delete validate and change the store
+        right away, but conflict detection and notifications are deferred.
+        On exit conflicts are brought up to date once for the union of the
+        touched schedules and observers receive a single BATCH_APPLIED event
+        holding the net change per schedule (e.g. create + delete cancels
+        out). If any mutation was rejected, or the block raised, the whole
+        batch is rolled back and nothing is notified.
+
+        Nested batch() calls join the outermost batch. The write lock is held
+        for the whole block, so other threads never see a half-applied batch.
+        """
+        with self._lock.write_locked():
+            if self._batch is not None:
+                yield self._batch
+                return
+
+            batch = self._batch = ScheduleBatch()
+            try:
+                yield batch
+            except BaseException:
+                self._batch = None
+                self._rollback_batch(batch)
+                raise
+            self._batch = None
+
+            try:
+                if batch.errors:
+                    logger.warning(f"⚠️  Batch rolled back: {len(batch.errors)} rejected change(s)")
+                    self._rollback_batch(batch)
+                else:
+                    self._commit_batch(batch)
+            finally:
+                self._publish_snapshot()
+
+    def _commit_batch(self, batch: ScheduleBatch) -> None:
+        """Run the deferred conflict detection and notification of a batch"""
+        # The batch is only applied once it is on disk: if that fails, undo it
+        if batch.journal and self.journal is not None:
+            try:
+                self.journal.append(batch.journal)
+            except BaseException:
+                self._rollback_batch(batch)
+                raise
+        touched = batch.touched
+        added, resolved = self._refresh_conflicts(touched)
+        self._version += 1
+
+        created, updated, deleted = [], [], []
+        for schedule_id in touched:
+            before, after = batch.before[schedule_id], self.schedules.get(schedule_id)
+            if after is None:
+                self._positions.pop(schedule_id, None)
+                if before is not None:
+                    deleted.append(before)
+            elif before is None:
+                created.append(after)
+            else:
+                updated.append(after)
+        batch.committed = True
+
+        logger.info(f"✅ Batch applied: {len(created)} created, {len(updated)} updated, "
+                    f"{len(deleted)} deleted")
+        self._notify_batch(created, updated, deleted, [], added, resolved)
+        for schedule in deleted:
+            if schedule.krs_id:
+                self._invalidate_krs(schedule.krs_id, schedule)
+
+    def _rollback_batch(self, batch: ScheduleBatch) -> None:
+        """Revert every mutation of a batch, newest first"""
+        restored = False
+        for action, schedule, *rest in reversed(batch.undo_log):
+            if action == 'create':
+                del self.schedules[schedule.schedule_id]
+                self._unindex_schedule(schedule)
+                del self._positions[schedule.schedule_id]
+            elif action == 'update':
+                self.schedules[schedule.schedule_id] = schedule
+                self._reindex_schedule(rest[0], schedule)
+            else:
+                self.schedules[schedule.schedule_id] = schedule
+                self._positions[schedule.schedule_id] = rest[0]
+                self._index_schedule(schedule)
+                restored = True
+
+        # Deleted schedules come back at the end of the dict; restore the
+        # insertion order the conflict list and listings rely on
+        if restored:
+            by_position = lambda item: self._positions[item[0]]
+            ordered = sorted(self.schedules.items(), key=by_position)
+            self.schedules.clear()
+            self.schedules.update(ordered)
+            for block in self._dirty_blocks:
+                members = self._snapshot_blocks.get(block)
+                if members:
+                    self._snapshot_blocks[block] = dict(sorted(members.items(), key=by_position))
+        logger.info(f"↩️  Batch rolled back: {len(batch.undo_log)} change(s) reverted")
+
+    @_reads
     def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
         """Get schedule by ID"""
         return self.schedules.get(schedule_id)
 
+    @_reads
     def list_schedules(self) -> List[Schedule]:
         """List all schedules"""
         return list(self.schedules.values())
 
+    @_reads
     def get_schedules_by_lecturer(self, lecturer_name: str) -> List[Schedule]:
-        """Get all schedules for a specific lecturer"""
-        return [s for s in self.schedules.values()
-                if s.lecturer_name.lower() == lecturer_name.lower()]
+        """Get all schedules for a specific lecturer (case-insensitive)"""
+        return self._by_lecturer.get(lecturer_name.lower())
 
+    @_reads
     def get_schedules_by_room(self, room_id: str) -> List[Schedule]:
         """Get all schedules for a specific room"""
-        return [s for s in self.schedules.values()
-                if s.room.room_id == room_id]
+        return self._by_room.get(room_id)
 
+    @_reads
     def get_schedules_by_day(self, day: DayOfWeek) -> List[Schedule]:
         """Get all schedules on a specific day"""
-        return [s for s in self.schedules.values() if s.day == day]
+        return self._by_day.get(day)
+
+    @_reads
+    def get_schedules_by_course(self, course_code: str) -> List[Schedule]:
+        """Get all schedules (sections) of a course"""
+        return self._by_course_code.get(course_code)
+
+    @_reads
+    def get_schedules_by_krs(self, krs_id: str) -> List[Schedule]:
+        """Get all schedules linked to a KRS"""
+        return self._by_krs_id.get(krs_id)
+
+    @_reads
+    def count_schedules_by_room(self, room_id: str) -> int:
+        """Number of schedules in a room, without building the list"""
+        return self._by_room.count(room_id)
+
+    @_reads
+    def find_overlapping_schedules(self, day: DayOfWeek, start_time: time, end_time: time,
+                                   room_id: Optional[str] = None,
+                                   lecturer_name: Optional[str] = None) -> List[Schedule]:
+        """
+        Get the schedules occupying a room and/or lecturer on a day between
+        start_time and end_time, ordered by start time.
+
+        Answered from the (day, room) / (day, lecturer) interval indexes in
+        O(log n + k). When both room_id and lecturer_name are given, only
+        schedules matching both are returned.
+        """
+        if room_id is None and lecturer_name is None:
+            raise ValueError("room_id or lecturer_name is required")
+
+        time_slot = TimeSlot(start_time, end_time)
+        start, end = time_slot.start_minute, time_slot.end_minute
+        if room_id is not None:
+            index = self._room_buckets.get((day, room_id))
+        else:
+            index = self._lecturer_buckets.get((day, lecturer_name.lower()))
+        if index is None:
+            return []
+
+        result = []
+        for schedule_id in index.overlapping(start, end):
+            schedule = self.schedules[schedule_id]
+            if lecturer_name is not None and schedule.lecturer_key != lecturer_name.lower():
+                continue
+            if schedule.time_slot.overlaps_with(time_slot):
+                result.append(schedule)
+        return result
+
+    @_reads
+    def is_room_free(self, room_id: str, day: DayOfWeek, start_time: time, end_time: time) -> bool:
+        """Check whether a room has no booking overlapping start_time-end_time on a day"""
+        return self._is_free(self.room_occupancy, room_id, day, start_time, end_time,
+                             room_id=room_id)
+
+    @_reads
+    def is_lecturer_free(self, lecturer_name: str, day: DayOfWeek, start_time: time,
+                         end_time: time) -> bool:
+        """Check whether a lecturer has no class overlapping start_time-end_time on a day"""
+        return self._is_free(self.lecturer_occupancy, lecturer_name.lower(), day,
+                             start_time, end_time, lecturer_name=lecturer_name)
+
+    def _is_free(self, occupancy: OccupancyBitmap, key: str, day: DayOfWeek,
+                 start_time: time, end_time: time, **owner) -> bool:
+        """Bitmap AND first; only unaligned busy answers fall back to the interval index"""
+        if start_time < end_time:
+            slot = TimeSlot(start_time, end_time)
+            start, end = slot.start_minute, slot.end_minute
+            if occupancy.is_free(key, day, start, end):
+                return True
+            if slot.whole_minutes and OccupancyBitmap.is_aligned(start, end):
+                return False
+        return not self.find_overlapping_schedules(day, start_time, end_time, **owner)
 
     # Validation
     def _validate_schedule(self, schedule: Schedule) -> bool:
         """Validate schedule before creation/update"""
+        error = self._validation_error(schedule)
+        if error is not None:
+            return self._reject(error)
+        return True
+
+    def _reject(self, message: str, level: int = logging.ERROR) -> bool:
+        """Log a rejected change (failing the open batch, if any) and return False"""
+        logger.log(level, message)
+        if self._batch is not None:
+            self._batch.errors.append(message)
+        return False
+
+    def _validation_error(self, schedule: Schedule) -> Optional[str]:
+        """Reason a schedule may not be stored, or None if it is valid"""
         # Check if room exists
         if schedule.room.room_id not in self.rooms:
-            logger.error(f"Room {schedule.room.room_id} not found")
-            return False
+            return f"Room {schedule.room.room_id} not found"
 
         # Check capacity
         if not schedule.room.can_accommodate(schedule.num_students):
-            logger.error(f"Room capacity exceeded: {schedule.num_students} > {schedule.room.capacity}")
-            return False
+            return f"Room capacity exceeded: {schedule.num_students} > {schedule.room.capacity}"
 
-        return True
+        return None
+
+    def _write_journal(self, entries: List[Tuple]) -> None:
+        """
+        Journal a validated change before it is applied, so a failing append
+        leaves memory untouched; inside batch() it waits for the commit
+        """
+        if self.journal is None:
+            return
+        if self._batch is not None:
+            self._batch.journal.extend(entries)
+        else:
+            self.journal.append(entries)
+
+    def _store_schedule(self, schedule: Schedule) -> None:
+        """Insert a validated new schedule and index it"""
+        self._share_room(schedule)
+        self.schedules[schedule.schedule_id] = schedule
+        self._positions[schedule.schedule_id] = self._next_position
+        self._next_position += 1
+        self._index_schedule(schedule)
+
+    def _share_room(self, schedule: Schedule) -> None:
+        """Point the schedule at the registered Room when it is an equal copy"""
+        registered = self.rooms.get(schedule.room.room_id)
+        if registered is not None and registered is not schedule.room \
+                and registered == schedule.room:
+            schedule.room = registered
+
+    # Indexes
+    def _index_schedule(self, schedule: Schedule) -> None:
+        """Add a schedule to every index"""
+        self._add_intervals(schedule)
+        for index in self._hash_indexes:
+            index.add(schedule)
+        self._track(schedule)
+
+    def _unindex_schedule(self, schedule: Schedule) -> None:
+        """Remove a schedule from every index"""
+        self._remove_intervals(schedule)
+        for index in self._hash_indexes:
+            index.remove(schedule)
+        self._untrack(schedule.schedule_id)
+
+    def _reindex_schedule(self, old: Schedule, new: Schedule) -> None:
+        """
+        Move a schedule's index entries from its old to its new version.
+        Old entries are found by the keys recorded when it was indexed, so
+        old may be new itself, edited in place.
+        """
+        self._remove_intervals(old)
+        self._add_intervals(new)
+        for index in self._hash_indexes:
+            index.replace(old, new)
+        self._track(new)
+
+    def _add_intervals(self, schedule: Schedule) -> None:
+        """Add a schedule to the day/room and day/lecturer interval indexes and bitmaps"""
+        day, room_id, lecturer_key = schedule.day, schedule.room.room_id, schedule.lecturer_key
+        start, end = schedule.time_slot.start_minute, schedule.time_slot.end_minute
+        self._room_buckets[(day, room_id)].add(start, end, schedule.schedule_id)
+        self._lecturer_buckets[(day, lecturer_key)].add(start, end, schedule.schedule_id)
+        self.room_occupancy.occupy(room_id, day, start, end)
+        self.lecturer_occupancy.occupy(lecturer_key, day, start, end)
+        self._interval_keys[schedule.schedule_id] = (day, room_id, lecturer_key, start, end)
+
+    def _remove_intervals(self, schedule: Schedule) -> None:
+        """Remove a schedule from the day/room and day/lecturer interval indexes and bitmaps"""
+        indexed = self._interval_keys.pop(schedule.schedule_id, None)
+        if indexed is None:
+            return
+        day, room_id, lecturer_key, start, end = indexed
+        for buckets, occupancy, key in (
+                (self._room_buckets, self.room_occupancy, room_id),
+                (self._lecturer_buckets, self.lecturer_occupancy, lecturer_key)):
+            bucket = buckets.get((day, key))
+            if bucket is None:
+                continue
+            bucket.remove(start, end, schedule.schedule_id)
+            occupancy.rebuild(key, day, bucket.spans())
+            if not bucket:
+                del buckets[(day, key)]
 
     # Conflict Management
-    def _detect_and_notify_conflicts(self) -> None:
-        """Detect conflicts in current schedules and notify observers"""
-        self.conflicts = self.conflict_detection.detect_schedule_conflicts(
-            list(self.schedules.values())
+    @property
+    @_reads
+    def conflicts(self) -> List[ScheduleConflict]:
+        """Current conflicts, in the order a full detection pass would return them"""
+        if self._sorted_conflicts is None:
+            self._sorted_conflicts = sorted(self._conflict_index.values(),
+                                            key=self._conflict_order)
+        return self._sorted_conflicts
+
+    def _conflict_order(self, conflict: ScheduleConflict) -> Tuple[int, int, int, int]:
+        """Sort key matching ConflictDetectionEngine's output order"""
+        first = self._positions[conflict.schedule_1.schedule_id]
+        if conflict.schedule_2 is None:
+            return (0, first, 0, 0)
+        kind = 0 if conflict.conflict_type == ConflictType.ROOM_CONFLICT else 1
+        return (1, first, self._positions[conflict.schedule_2.schedule_id], kind)
+
+    def _update_conflicts_for(self, schedule_id: str) -> Tuple[List[ScheduleConflict],
+                                                               List[ScheduleConflict]]:
+        """
+        Recompute only the conflicts a single schedule is part of.
+
+        Old conflicts involving the schedule are dropped, then the schedule (if
+        it still exists) is checked against the overlapping bookings in its
+        own day/room and day/lecturer interval indexes.
+
+        Returns (added, resolved): the conflicts whose key is new and the ones
+        whose key went away, both in conflict list order.
+        """
+        old_conflicts: Dict[Tuple, ScheduleConflict] = {}
+        for key in self._conflict_keys_by_schedule.pop(schedule_id, set()):
+            conflict = self._conflict_index.pop(key)
+            old_conflicts[key] = conflict
+            self._touch_conflict(conflict)
+            for other in (conflict.schedule_1, conflict.schedule_2):
+                if other is not None and other.schedule_id != schedule_id:
+                    other_keys = self._conflict_keys_by_schedule[other.schedule_id]
+                    other_keys.discard(key)
+                    if not other_keys:
+                        del self._conflict_keys_by_schedule[other.schedule_id]
+        self._sorted_conflicts = None
+
+        schedule = self.schedules.get(schedule_id)
+        if schedule is None:
+            return [], sorted(old_conflicts.values(), key=self._conflict_order)
+
+        new_conflicts = ConflictDetectionEngine._capacity_conflicts([schedule])
+        position = self._positions[schedule_id]
+        start, end = schedule.time_slot.start_minute, schedule.time_slot.end_minute
+        candidates = (
+            (ConflictType.ROOM_CONFLICT, self._room_buckets[(schedule.day, schedule.room.room_id)]),
+            (ConflictType.LECTURER_CONFLICT, self._lecturer_buckets[(schedule.day, schedule.lecturer_key)]),
         )
+        for conflict_type, bucket in candidates:
+            for other_id in bucket.overlapping(start, end):
+                if other_id == schedule_id:
+                    continue
+                other = self.schedules[other_id]
+                if not schedule.time_slot.overlaps_with(other.time_slot):
+                    continue
+                if position < self._positions[other_id]:
+                    new_conflicts.append(
+                        ConflictDetectionEngine._pair_conflict(conflict_type, schedule, other))
+                else:
+                    new_conflicts.append(
+                        ConflictDetectionEngine._pair_conflict(conflict_type, other, schedule))
+
+        for conflict in new_conflicts:
+            key = conflict.key
+            self._conflict_index[key] = conflict
+            self._touch_conflict(conflict)
+            self._conflict_keys_by_schedule[conflict.schedule_1.schedule_id].add(key)
+            if conflict.schedule_2 is not None:
+                self._conflict_keys_by_schedule[conflict.schedule_2.schedule_id].add(key)
+
+        added = [c for c in new_conflicts if c.key not in old_conflicts]
+        new_keys = {c.key for c in new_conflicts}
+        resolved = [c for key, c in old_conflicts.items() if key not in new_keys]
+        return (sorted(added, key=self._conflict_order),
+                sorted(resolved, key=self._conflict_order))
+
+    def _refresh_conflicts(self, schedule_ids: List[str]) -> Tuple[List[ScheduleConflict],
+                                                                   List[ScheduleConflict]]:
+        """
+        Bring the conflict set up to date after several schedules changed.
 
-        if self.conflicts:
-            logger.warning(f"⚠️  {len(self.conflicts)} conflict(s) detected!")
-            for conflict in self.conflicts:
+        Small change sets are handled incrementally per schedule; once they
+        touch a sizeable share of the store a single full detection pass is
+        cheaper. Returns (added, resolved) like _update_conflicts_for.
+        """
+        if len(schedule_ids) * self.FULL_REFRESH_RATIO >= len(self.schedules):
+            return self._rebuild_conflicts()
+
+        added: List[ScheduleConflict] = []
+        resolved: List[ScheduleConflict] = []
+        for schedule_id in schedule_ids:
+            schedule_added, schedule_resolved = self._update_conflicts_for(schedule_id)
+            added.extend(schedule_added)
+            resolved.extend(schedule_resolved)
+        added.sort(key=self._conflict_order)
+        resolved.sort(key=self._conflict_order)
+        return added, resolved
+
+    def _rebuild_conflicts(self) -> Tuple[List[ScheduleConflict], List[ScheduleConflict]]:
+        """Replace the conflict set with a full detection pass and return the delta"""
+        # Dict order is insertion order, so the engine output is already in
+        # conflict list order
+        detected = self.conflict_detection.detect_conflicts(list(self.schedules.values()))
+        old_index = self._conflict_index
+        self._conflict_index = {}
+        self._conflict_keys_by_schedule = defaultdict(set)
+        for conflict in detected:
+            key = conflict.key
+            self._conflict_index[key] = conflict
+            self._conflict_keys_by_schedule[conflict.schedule_1.schedule_id].add(key)
+            if conflict.schedule_2 is not None:
+                self._conflict_keys_by_schedule[conflict.schedule_2.schedule_id].add(key)
+        self._sorted_conflicts = detected
+        self._dirty_blocks.update(self._snapshot_blocks)
+
+        added = [c for c in detected if c.key not in old_index]
+        resolved = sorted((c for key, c in old_index.items() if key not in self._conflict_index),
+                          key=self._conflict_order)
+        return added, resolved
+
+    def _notify_batch(self, created: List[Schedule], updated: List[Schedule],
+                      deleted: List[Schedule], failed: List[BulkResult],
+                      added: List[ScheduleConflict], resolved: List[ScheduleConflict]) -> None:
+        """
+        Send one BATCH_APPLIED notification for a bulk change: the ids per
+        change kind, the coalesced per-schedule events and conflict summaries
+        """
+        # Nobody listening (e.g. while recovering from disk): skip the payload
+        if not self.has_observers:
+            return
+        parts = [f"{len(schedules)} {label}" for label, schedules in
+                 (("created", created), ("updated", updated), ("deleted", deleted)) if schedules]
+        if failed:
+            parts.append(f"{len(failed)} rejected")
+        parts.append(f"{len(added)} new conflict(s), {len(resolved)} resolved")
+        events = [{'event_type': event_type.value, 'data': schedule.to_dict()}
+                  for event_type, schedules in ((EventType.SCHEDULE_CREATED, created),
+                                                (EventType.SCHEDULE_UPDATED, updated),
+                                                (EventType.SCHEDULE_DELETED, deleted))
+                  for schedule in schedules]
+        self.notify(EventType.BATCH_APPLIED, {
+            'created': [schedule.schedule_id for schedule in created],
+            'updated': [schedule.schedule_id for schedule in updated],
+            'deleted': [schedule.schedule_id for schedule in deleted],
+            'events': events,
+            'failed': [result.to_dict() for result in failed],
+            'conflicts_detected': ConflictDetectionEngine.get_conflict_summary(added),
+            'conflicts_resolved': ConflictDetectionEngine.get_conflict_summary(resolved),
+            'description': ", ".join(parts)
+        })
+
+    def _detect_and_notify_conflicts(self, schedule_id: str) -> None:
+        """
+        Bring the conflict set up to date after a schedule changed and notify
+        observers of the delta: CONFLICT_DETECTED for conflicts that are new,
+        SCHEDULE_RESOLVED for conflicts that went away. Conflicts that were
+        already known are not re-broadcast.
+        """
+        added, resolved = self._update_conflicts_for(schedule_id)
+        self._version += 1
+        self._notify_conflict_delta(added, resolved)
+
+    def _notify_conflict_delta(self, added: List[ScheduleConflict],
+                               resolved: List[ScheduleConflict]) -> None:
+        """Log and notify new and resolved conflicts"""
+        if added:
+            logger.warning(f"⚠️  {len(added)} new conflict(s) detected!")
+            for conflict in added:
                 logger.warning(f"   - {conflict}")
                 self.notify(EventType.CONFLICT_DETECTED, conflict.to_dict())
 
+        for conflict in resolved:
+            logger.info(f"✅ Conflict resolved: {conflict}")
+            self.notify(EventType.SCHEDULE_RESOLVED, conflict.to_dict())
+
+    @_reads
     def get_conflicts(self) -> List[ScheduleConflict]:
         """Get all current conflicts"""
         return self.conflicts
 
+    @_reads
     def get_conflicts_for_schedule(self, schedule_id: str) -> List[ScheduleConflict]:
         """Get conflicts involving a specific schedule"""
-        return [c for c in self.conflicts
-                if c.schedule_1.schedule_id == schedule_id or
-                   (c.schedule_2 and c.schedule_2.schedule_id == schedule_id)]
+        keys = self._conflict_keys_by_schedule.get(schedule_id, ())
+        return sorted((self._conflict_index[key] for key in keys), key=self._conflict_order)
 
     # KRS Integration
     def _invalidate_krs(self, krs_id: str, schedule: Schedule) -> None:
@@ -533,6 +3101,7 @@ class SchedulingService(ScheduleSubject):
         }
         # In a real system, this would call an API to invalidate KRS
 
+    @_reads
     def get_conflict_summary(self) -> Dict:
         """Get conflict summary"""
         return self.conflict_detection.get_conflict_summary(self.conflicts)
@@ -573,16 +3142,17 @@ class SchedulingSuggestionEngine:
         # Generate suggestions
         for i, (day, time_slot, room) in enumerate(ranked_slots[:num_suggestions]):
             # Check if this slot conflicts with lecturer's other schedules
-            lecturer_schedules = self.service.get_schedules_by_lecturer(
-                conflicted_schedule.lecturer_name
-            )
-
-            has_lecturer_conflict = any(
-                s.schedule_id != conflicted_schedule.schedule_id and
-                s.day == day and
-                s.time_slot.overlaps_with(time_slot)
-                for s in lecturer_schedules
-            )
+            has_lecturer_conflict = False
+            if not self.service.is_lecturer_free(conflicted_schedule.lecturer_name, day,
+                                                 time_slot.start_time, time_slot.end_time):
+                lecturer_schedules = self.service.find_overlapping_schedules(
+                    day, time_slot.start_time, time_slot.end_time,
+                    lecturer_name=conflicted_schedule.lecturer_name
+                )
+                has_lecturer_conflict = any(
+                    s.schedule_id != conflicted_schedule.schedule_id
+                    for s in lecturer_schedules
+                )
 
             reason = []
             reason.append(f"Room capacity: {room.capacity} (need: {conflicted_schedule.num_students})")
@@ -668,17 +3238,19 @@ class DashboardService:
         self.service = scheduling_service
 
     def get_dashboard_summary(self) -> Dict:
-        """Get overall dashboard summary"""
-        schedules = self.service.list_schedules()
-        conflicts = self.service.get_conflicts()
+        """Get overall dashboard summary, read from one consistent snapshot"""
+        snapshot = self.service.snapshot()
+        schedules = snapshot.list_schedules()
 
         return {
+            'version': snapshot.version,
+            'event_id': snapshot.event_id,
             'total_schedules': len(schedules),
-            'total_rooms': len(self.service.list_rooms()),
-            'total_conflicts': len(conflicts),
-            'conflict_summary': self.service.get_conflict_summary(),
+            'total_rooms': len(snapshot.rooms),
+            'total_conflicts': len(snapshot.conflicts),
+            'conflict_summary': snapshot.get_conflict_summary(),
             'schedules_by_day': self._count_schedules_by_day(schedules),
-            'room_utilization': self._calculate_room_utilization(schedules)
+            'room_utilization': self._calculate_room_utilization(snapshot)
         }
 
     def _count_schedules_by_day(self, schedules: List[Schedule]) -> Dict[str, int]:
@@ -688,29 +3260,30 @@ class DashboardService:
             counts[schedule.day.name] += 1
         return counts
 
-    def _calculate_room_utilization(self, schedules: List[Schedule]) -> Dict[str, Dict]:
+    def _calculate_room_utilization(self, snapshot: ScheduleSnapshot) -> Dict[str, Dict]:
         """Calculate room utilization percentage"""
         room_stats = {}
 
-        for room in self.service.list_rooms():
-            room_schedules = self.service.get_schedules_by_room(room.room_id)
+        for room in snapshot.list_rooms():
+            used_slots = snapshot.count_schedules_by_room(room.room_id)
             room_stats[room.room_name] = {
                 'total_slots': 10 * 5,  # Assuming 10 time slots, 5 days
-                'used_slots': len(room_schedules),
-                'utilization_percent': round((len(room_schedules) / (10 * 5)) * 100, 2)
+                'used_slots': used_slots,
+                'utilization_percent': round((used_slots / (10 * 5)) * 100, 2)
             }
 
         return room_stats
 
     def get_conflict_report(self) -> Dict:
         """Get detailed conflict report"""
-        conflicts = self.service.get_conflicts()
+        snapshot = self.service.snapshot()
 
         report = {
             'timestamp': datetime.now().isoformat(),
-            'total_conflicts': len(conflicts),
-            'conflicts': [c.to_dict() for c in conflicts],
-            'summary': self.service.get_conflict_summary()
+            'version': snapshot.version,
+            'total_conflicts': len(snapshot.conflicts),
+            'conflicts': [c.to_dict() for c in snapshot.conflicts],
+            'summary': snapshot.get_conflict_summary()
         }
 
         return report
@@ -741,7 +3314,7 @@ class DashboardService:
         print(f"{'Course':<20} {'Code':<8} {'Lecturer':<15} {'Day':<10} {'Time':<12} {'Room':<12} {'Students':<10}")
         print("-" * 120)
 
-        for schedule in sorted(schedules, key=lambda s: (s.day.value, s.time_slot.start_time)):
+        for schedule in sorted(schedules, key=lambda s: s.minute_of_week):
             print(f"{schedule.course_name:<20} {schedule.course_code:<8} {schedule.lecturer_name:<15} "
                   f"{schedule.day.name:<10} {str(schedule.time_slot):<12} {schedule.room.room_name:<12} "
                   f"{schedule.num_students:<10}")
@@ -787,7 +3360,7 @@ class DashboardService:
         else:
             print(f"{'Day':<12} {'Time':<12} {'Course':<25} {'Lecturer':<15} {'Students':<10}")
             print("-" * 100)
-            for schedule in sorted(schedules, key=lambda s: (s.day.value, s.time_slot.start_time)):
+            for schedule in sorted(schedules, key=lambda s: s.minute_of_week):
                 print(f"{schedule.day.name:<12} {str(schedule.time_slot):<12} {schedule.course_name:<25} "
                       f"{schedule.lecturer_name:<15} {schedule.num_students:<10}")
 
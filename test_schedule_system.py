@@ -3,9 +3,61 @@ Unit Tests for Schedule Management System
 Tests all core functionality: CRUD, Conflict Detection, Observer Pattern
 """
 
+import dataclasses
+import email
+import importlib
+import importlib.util
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
 import unittest
 from datetime import datetime, time
+from unittest import mock
 from schedule_system import *
+from schedule_persistence import (
+    DurableStore, SQLiteScheduleRepository, ColumnarSnapshot, write_columnar_snapshot, EventLog
+)
+from event_stream import EventBroadcaster, parse_event_id
+from notification_channels import (
+    EmailChannel, SMSChannel, PushChannel, TokenBucket, RetryPolicy,
+    LocalSMTPServer, LocalHTTPGateway
+)
+
+
+class RecordingObserver(Observer):
+    """Observer that keeps every event it receives"""
+
+    def __init__(self):
+        self.events = []
+
+    def update(self, event_type, data):
+        self.events.append((event_type, data))
+
+    def of_type(self, event_type):
+        return [data for received, data in self.events if received == event_type]
+
+
+def make_random_schedules(count, seed=7, num_rooms=8, num_lecturers=12):
+    """Build a reproducible list of schedules with plenty of overlaps"""
+    rng = random.Random(seed)
+    rooms = [Room(f"R{i:03d}", f"Room {i}", rng.choice([20, 30, 40])) for i in range(num_rooms)]
+    lecturers = [f"Dr. Lecturer {i}" for i in range(num_lecturers)]
+    schedules = []
+    for i in range(count):
+        start = rng.randrange(7 * 60, 18 * 60, 15)
+        end = start + rng.choice([30, 60, 90, 120, 150])
+        lecturer = rng.choice(lecturers)
+        schedules.append(Schedule(
+            f"SCH{i:05d}", f"Course {i}", f"C{i:04d}",
+            lecturer.upper() if rng.random() < 0.1 else lecturer,
+            rng.choice(list(DayOfWeek)[:5]),
+            TimeSlot(time(start // 60, start % 60), time(end // 60, end % 60)),
+            rng.choice(rooms), rng.randrange(10, 45)
+        ))
+    return schedules
 
 
 class TestTimeSlot(unittest.TestCase):
@@ -29,6 +81,30 @@ class TestTimeSlot(unittest.TestCase):
         slot2 = TimeSlot(time(8, 0), time(10, 0))
         self.assertTrue(slot1.overlaps_with(slot2))
 
+    def test_integer_minutes(self):
+        """Test the precomputed minute encoding and labels"""
+        slot = TimeSlot(time(8, 5), time(10, 30))
+        self.assertEqual((slot.start_minute, slot.end_minute), (485, 630))
+        self.assertEqual(slot.minute_of_week(DayOfWeek.TUESDAY), (1440 + 485, 1440 + 630))
+        self.assertEqual(str(slot), "08:05-10:30")
+        self.assertEqual((slot.start_label, slot.end_label), ("08:05", "10:30"))
+
+    def test_minutes_follow_assignment(self):
+        """Test that changing a time re-encodes the slot"""
+        slot = TimeSlot(time(8, 0), time(10, 0))
+        self.assertEqual(str(slot), "08:00-10:00")
+        slot.end_time = time(9, 15)
+        self.assertEqual(slot.end_minute, 555)
+        self.assertEqual(str(slot), "08:00-09:15")
+
+    def test_sub_minute_overlap_exact(self):
+        """Test that times with seconds are compared on the exact values"""
+        slot1 = TimeSlot(time(8, 0), time(9, 0, 10))
+        slot2 = TimeSlot(time(9, 0, 30), time(10, 0))
+        self.assertFalse(slot1.whole_minutes)
+        self.assertFalse(slot1.overlaps_with(slot2))
+        self.assertEqual(slot1.end_minute, 541)
+
 
 class TestRoom(unittest.TestCase):
     """Test Room class"""
@@ -140,6 +216,91 @@ class TestConflictDetection(unittest.TestCase):
         self.assertEqual(len(conflicts), 1)
         self.assertEqual(conflicts[0].conflict_type, ConflictType.LECTURER_CONFLICT)
 
+    def test_back_to_back_slots_no_conflict(self):
+        """Test that a class ending when the next one starts is not a conflict"""
+        schedules = [
+            Schedule("SCH001", "Course A", "A101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(8, 0), time(10, 0)), self.room1, 30),
+            Schedule("SCH002", "Course B", "B101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(10, 0), time(12, 0)), self.room1, 30),
+            Schedule("SCH003", "Course C", "C101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(11, 0), time(13, 0)), self.room1, 30),
+        ]
+
+        conflicts = self.engine.detect_schedule_conflicts(schedules)
+        self.assertEqual([(c.conflict_type, c.schedule_1.schedule_id, c.schedule_2.schedule_id)
+                          for c in conflicts],
+                         [(ConflictType.ROOM_CONFLICT, "SCH002", "SCH003"),
+                          (ConflictType.LECTURER_CONFLICT, "SCH002", "SCH003")])
+
+    def test_sweep_line_matches_pairwise(self):
+        """Test that the sweep line returns exactly the pairwise result"""
+        schedules = make_random_schedules(400)
+
+        expected = self.engine.detect_schedule_conflicts_pairwise(schedules)
+        conflicts = self.engine.detect_schedule_conflicts(schedules)
+
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(conflicts, expected)
+
+    def test_sub_minute_times_match_pairwise(self):
+        """Test that times with seconds are compared exactly"""
+        schedules = [
+            Schedule("SCH001", "Course A", "A101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(8, 0), time(9, 0, 10)), self.room1, 30),
+            Schedule("SCH002", "Course B", "B101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(9, 0, 30), time(10, 0)), self.room1, 30),
+            Schedule("SCH003", "Course C", "C101", "Dr. Lecturer",
+                     DayOfWeek.MONDAY, TimeSlot(time(9, 0, 5), time(9, 30)), self.room1, 30),
+        ]
+
+        conflicts = self.engine.detect_schedule_conflicts(schedules)
+        self.assertEqual(conflicts, self.engine.detect_schedule_conflicts_pairwise(schedules))
+        self.assertEqual({(c.schedule_1.schedule_id, c.schedule_2.schedule_id) for c in conflicts},
+                         {("SCH001", "SCH003"), ("SCH002", "SCH003")})
+
+    def test_parallel_matches_pairwise(self):
+        """Test the process pool strategy and its per-day timings"""
+        schedules = make_random_schedules(300, seed=4)
+
+        with ConflictDetectionEngine(strategy="parallel", max_workers=2) as engine:
+            conflicts = engine.detect_conflicts(schedules)
+
+        self.assertEqual(conflicts, self.engine.detect_schedule_conflicts_pairwise(schedules))
+        self.assertEqual(set(engine.last_partition_timings),
+                         {s.day.name for s in schedules})
+        self.assertTrue(all(t >= 0 for t in engine.last_partition_timings.values()))
+        self.assertGreater(engine.last_partition_wall_time, 0)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_vectorized_matches_pairwise(self):
+        """Test that the NumPy strategy returns exactly the pairwise result"""
+        schedules = make_random_schedules(400, seed=9)
+        schedules.append(Schedule(
+            "SCH-EMPTY", "Course E", "E101", "Dr. Lecturer 1", DayOfWeek.MONDAY,
+            TimeSlot(time(9, 0), time(9, 0)), schedules[0].room, 10
+        ))
+
+        engine = ConflictDetectionEngine(strategy="vectorized")
+        self.assertEqual(engine.strategy, "vectorized")
+        self.assertEqual(engine.detect_conflicts(schedules),
+                         self.engine.detect_schedule_conflicts_pairwise(schedules))
+
+    def test_vectorized_falls_back_without_numpy(self):
+        """Test that the vectorized strategy degrades to the sweep line"""
+        with mock.patch('schedule_system.np', None):
+            engine = ConflictDetectionEngine(strategy="vectorized")
+        self.assertEqual(engine.strategy, "sweep")
+
+        schedules = make_random_schedules(100)
+        self.assertEqual(engine.detect_conflicts(schedules),
+                         self.engine.detect_schedule_conflicts_pairwise(schedules))
+
+    def test_unknown_strategy_rejected(self):
+        """Test that an unknown strategy name raises ValueError"""
+        with self.assertRaises(ValueError):
+            ConflictDetectionEngine(strategy="quantum")
+
 
 class TestSchedulingService(unittest.TestCase):
     """Test SchedulingService"""
@@ -294,6 +455,2080 @@ class TestSchedulingService(unittest.TestCase):
         self.assertEqual(len(monday_schedules), 1)
 
 
+class TestLazyConflictIteration(unittest.TestCase):
+    """Test ConflictDetectionEngine.iter_conflicts"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.engine = ConflictDetectionEngine()
+        self.schedules = make_random_schedules(300, seed=17)
+        self.expected = self.engine.detect_schedule_conflicts(self.schedules)
+
+    def test_iter_conflicts_yields_every_conflict(self):
+        """Test that the unfiltered iterator matches full detection"""
+        found = list(self.engine.iter_conflicts(self.schedules))
+        self.assertEqual(sorted(c.key for c in found), sorted(c.key for c in self.expected))
+
+    def test_filters(self):
+        """Test type, day and room filters"""
+        room_id = self.schedules[0].room.room_id
+        found = list(self.engine.iter_conflicts(
+            self.schedules, conflict_types=[ConflictType.ROOM_CONFLICT],
+            day=DayOfWeek.TUESDAY, room_id=room_id))
+
+        expected = [c for c in self.expected
+                    if c.conflict_type == ConflictType.ROOM_CONFLICT
+                    and c.schedule_1.day == DayOfWeek.TUESDAY
+                    and c.schedule_1.room.room_id == room_id]
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(sorted(c.key for c in found), sorted(c.key for c in expected))
+
+    def test_limit_and_lazy_descriptions(self):
+        """Test early termination and that descriptions are built on access"""
+        found = list(self.engine.iter_conflicts(
+            self.schedules, conflict_types=[ConflictType.LECTURER_CONFLICT], limit=5))
+
+        self.assertEqual(len(found), 5)
+        self.assertTrue(all(c._description is None for c in found))
+        self.assertIn("double-booked", found[0].description)
+        self.assertIsNotNone(found[0]._description)
+
+    def test_explicit_description_kept(self):
+        """Test that a description passed in is not replaced"""
+        conflict = ScheduleConflict(ConflictType.ROOM_CONFLICT, self.schedules[0],
+                                    self.schedules[1], description="Custom")
+        self.assertEqual(conflict.description, "Custom")
+        self.assertEqual(ScheduleConflict(ConflictType.ROOM_CONFLICT, self.schedules[0]).description, "")
+
+    def test_description_stays_a_dataclass_field(self):
+        """Test that replace(), asdict() and == see the (lazy) description"""
+        lazy = ScheduleConflict(ConflictType.ROOM_CONFLICT, self.schedules[0],
+                                self.schedules[1], description=None)
+        custom = dataclasses.replace(lazy, description="Custom")
+        self.assertIsNone(lazy._description)
+        self.assertEqual(custom.description, "Custom")
+        self.assertNotEqual(lazy, custom)
+        self.assertEqual(lazy, ScheduleConflict(ConflictType.ROOM_CONFLICT, self.schedules[0],
+                                                self.schedules[1], lazy.default_description()))
+        self.assertEqual(dataclasses.asdict(custom)['description'], "Custom")
+        self.assertEqual(dataclasses.replace(custom, severity="low").description, "Custom")
+        self.assertIn("description='Custom'", repr(custom))
+
+
+class TestIncrementalConflicts(unittest.TestCase):
+    """Test that SchedulingService keeps its conflict set up to date incrementally"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.schedules = make_random_schedules(150, seed=11)
+        for schedule in self.schedules:
+            self.service.add_room(schedule.room)
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+
+    def assert_matches_full_detection(self):
+        expected = ConflictDetectionEngine.detect_schedule_conflicts(
+            self.service.list_schedules()
+        )
+        self.assertEqual(self.service.get_conflicts(), expected)
+
+    def test_conflicts_match_full_detection_after_mutations(self):
+        """Test creates, updates and deletes against a full detection pass"""
+        rng = random.Random(3)
+        for schedule in self.schedules:
+            self.service.create_schedule(schedule)
+        self.assert_matches_full_detection()
+        self.assertGreater(len(self.service.get_conflicts()), 0)
+
+        replacements = make_random_schedules(150, seed=12)
+        for schedule in rng.sample(self.schedules, 40):
+            other = rng.choice(replacements)
+            moved = Schedule(
+                schedule.schedule_id, schedule.course_name, schedule.course_code,
+                other.lecturer_name, other.day, other.time_slot, schedule.room,
+                schedule.num_students
+            )
+            self.service.update_schedule(schedule.schedule_id, moved)
+        self.assert_matches_full_detection()
+
+        for schedule in rng.sample(self.schedules, 60):
+            self.service.delete_schedule(schedule.schedule_id)
+        self.assert_matches_full_detection()
+
+    def test_conflicts_for_schedule(self):
+        """Test that per-schedule conflicts follow the full conflict list"""
+        for schedule in self.schedules:
+            self.service.create_schedule(schedule)
+
+        for schedule in self.schedules[:20]:
+            expected = [c for c in self.service.get_conflicts()
+                        if schedule.schedule_id in (c.schedule_1.schedule_id,
+                                                    c.schedule_2.schedule_id)]
+            self.assertEqual(self.service.get_conflicts_for_schedule(schedule.schedule_id),
+                             expected)
+
+    def test_delete_resolves_conflicts(self):
+        """Test that deleting a schedule drops only its conflicts"""
+        room = self.schedules[0].room
+        first = Schedule("A", "Course A", "A101", "Dr. A", DayOfWeek.MONDAY,
+                         TimeSlot(time(8, 0), time(10, 0)), room, 10)
+        second = Schedule("B", "Course B", "B101", "Dr. A", DayOfWeek.MONDAY,
+                          TimeSlot(time(9, 0), time(11, 0)), room, 10)
+        self.service.create_schedule(first)
+        self.service.create_schedule(second)
+        self.assertEqual(len(self.service.get_conflicts()), 2)
+
+        self.service.delete_schedule("A")
+        self.assertEqual(self.service.get_conflicts(), [])
+        self.assertEqual(self.service.get_conflicts_for_schedule("B"), [])
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Test IntervalIndex overlap queries"""
+
+    def test_overlapping_matches_brute_force(self):
+        """Test overlap queries against a linear scan"""
+        rng = random.Random(5)
+        index = IntervalIndex()
+        intervals = {}
+        for i in range(300):
+            start = rng.randrange(0, 1400)
+            end = start + rng.randrange(1, 240)
+            intervals[f"I{i}"] = (start, end)
+            index.add(start, end, f"I{i}")
+        for item_id in rng.sample(sorted(intervals), 100):
+            self.assertTrue(index.remove(*intervals.pop(item_id), item_id))
+
+        for _ in range(200):
+            start = rng.randrange(0, 1440)
+            end = start + rng.randrange(1, 180)
+            expected = {item_id for item_id, (s, e) in intervals.items() if s < end and start < e}
+            self.assertEqual(set(index.overlapping(start, end)), expected)
+
+    def test_remove_missing_interval(self):
+        """Test removing an interval that is not indexed"""
+        index = IntervalIndex()
+        index.add(60, 120, "A")
+        self.assertFalse(index.remove(60, 120, "B"))
+        self.assertEqual(len(index), 1)
+
+    def test_max_length_shrinks_on_removal(self):
+        """Test the query window follows the longest interval still indexed"""
+        index = IntervalIndex()
+        index.add(0, 600, "LONG")
+        index.add(540, 600, "A")
+        index.add(600, 660, "B")
+        index.add(600, 630, "C")
+        self.assertEqual(index._max_length, 600)
+
+        index.remove(0, 600, "LONG")
+        self.assertEqual(index._max_length, 60)
+        index.remove(600, 660, "B")
+        self.assertEqual(index._max_length, 60)
+        index.remove(540, 600, "A")
+        self.assertEqual(index._max_length, 30)
+        self.assertEqual(index.overlapping(610, 620), ["C"])
+        index.remove(600, 630, "C")
+        self.assertEqual(index._max_length, 0)
+
+
+class TestOverlapQueries(unittest.TestCase):
+    """Test SchedulingService.find_overlapping_schedules"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.schedules = make_random_schedules(200, seed=21)
+        for schedule in self.schedules:
+            self.service.add_room(schedule.room)
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+            self.service.create_schedule(schedule)
+
+    def test_room_occupancy_query(self):
+        """Test who occupies a room between two times"""
+        booked = next(s for s in self.schedules if s.day == DayOfWeek.MONDAY)
+        room_id = booked.room.room_id
+        slot = TimeSlot(booked.time_slot.start_time, time(booked.time_slot.end_time.hour + 1, 0))
+        found = self.service.find_overlapping_schedules(
+            DayOfWeek.MONDAY, slot.start_time, slot.end_time, room_id=room_id)
+
+        expected = {s.schedule_id for s in self.schedules
+                    if s.day == DayOfWeek.MONDAY and s.room.room_id == room_id
+                    and s.time_slot.overlaps_with(slot)}
+        self.assertGreater(len(expected), 0)
+        self.assertEqual({s.schedule_id for s in found}, expected)
+
+    def test_lecturer_query_case_insensitive(self):
+        """Test lecturer lookups ignore case and follow updates"""
+        schedule = self.schedules[0]
+        found = self.service.find_overlapping_schedules(
+            schedule.day, schedule.time_slot.start_time, schedule.time_slot.end_time,
+            lecturer_name=schedule.lecturer_name.upper())
+        self.assertIn(schedule.schedule_id, [s.schedule_id for s in found])
+
+        self.service.delete_schedule(schedule.schedule_id)
+        found = self.service.find_overlapping_schedules(
+            schedule.day, schedule.time_slot.start_time, schedule.time_slot.end_time,
+            lecturer_name=schedule.lecturer_name)
+        self.assertNotIn(schedule.schedule_id, [s.schedule_id for s in found])
+
+    def test_query_requires_room_or_lecturer(self):
+        """Test that a query without a room or lecturer is rejected"""
+        with self.assertRaises(ValueError):
+            self.service.find_overlapping_schedules(DayOfWeek.MONDAY, time(9, 0), time(10, 0))
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+    """Test the hash indexes behind the get_schedules_by_* lookups"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.schedules = make_random_schedules(120, seed=5)
+        for i, schedule in enumerate(self.schedules):
+            schedule.krs_id = f"KRS{i % 7}" if i % 3 else None
+            schedule.course_code = f"C{i % 10:04d}"
+            self.service.add_room(schedule.room)
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+            self.service.create_schedule(schedule)
+
+    def assertMatchesScan(self):
+        """Every index lookup equals a linear scan over all schedules"""
+        stored = list(self.service.schedules.values())
+        for schedule in stored:
+            lecturer = schedule.lecturer_name.upper()
+            self.assertEqual(
+                {s.schedule_id for s in self.service.get_schedules_by_lecturer(lecturer)},
+                {s.schedule_id for s in stored if s.lecturer_name.lower() == lecturer.lower()})
+            self.assertEqual(
+                {s.schedule_id for s in self.service.get_schedules_by_room(schedule.room.room_id)},
+                {s.schedule_id for s in stored if s.room.room_id == schedule.room.room_id})
+            self.assertEqual(
+                {s.schedule_id for s in self.service.get_schedules_by_course(schedule.course_code)},
+                {s.schedule_id for s in stored if s.course_code == schedule.course_code})
+        for day in DayOfWeek:
+            self.assertEqual({s.schedule_id for s in self.service.get_schedules_by_day(day)},
+                             {s.schedule_id for s in stored if s.day == day})
+        for i in range(7):
+            self.assertEqual({s.schedule_id for s in self.service.get_schedules_by_krs(f"KRS{i}")},
+                             {s.schedule_id for s in stored if s.krs_id == f"KRS{i}"})
+
+    def test_lookups_match_linear_scan(self):
+        """Test index lookups after a bulk load"""
+        self.assertMatchesScan()
+        self.assertEqual(self.service.get_schedules_by_course("NOPE"), [])
+
+    def test_indexes_follow_updates_and_deletes(self):
+        """Test that updates and deletes move index entries"""
+        rooms = list(self.service.rooms.values())
+        for schedule in self.schedules[:30]:
+            moved = Schedule(
+                schedule.schedule_id, schedule.course_name, "MOVED", "Dr. Someone Else",
+                DayOfWeek.SATURDAY, schedule.time_slot, rooms[0],
+                min(schedule.num_students, rooms[0].capacity), krs_id="KRS-NEW"
+            )
+            self.assertTrue(self.service.update_schedule(schedule.schedule_id, moved))
+        for schedule in self.schedules[30:50]:
+            self.service.delete_schedule(schedule.schedule_id)
+
+        self.assertMatchesScan()
+        self.assertEqual(len(self.service.get_schedules_by_krs("KRS-NEW")), 30)
+        self.assertEqual(len(self.service.get_schedules_by_course("MOVED")), 30)
+
+    def test_update_rejects_id_mismatch(self):
+        """Test that a schedule cannot be stored under another id"""
+        schedule = self.schedules[0]
+        other = Schedule("OTHER", schedule.course_name, schedule.course_code,
+                         schedule.lecturer_name, schedule.day, schedule.time_slot,
+                         schedule.room, schedule.num_students)
+        self.assertFalse(self.service.update_schedule(schedule.schedule_id, other))
+        self.assertIs(self.service.get_schedule(schedule.schedule_id), schedule)
+
+    def test_update_of_schedule_edited_in_place(self):
+        """Test get_schedule(), edit, update_schedule() with the stored object"""
+        service = self.service
+        for schedule_id, day in (("SCH00000", DayOfWeek.SATURDAY),  # nothing booked yet
+                                 ("SCH00001", DayOfWeek.SATURDAY),
+                                 ("SCH00002", DayOfWeek.MONDAY)):
+            schedule = service.get_schedule(schedule_id)
+            old_day, old_room = schedule.day, schedule.room.room_id
+            old_start, old_end = schedule.time_slot.start_time, schedule.time_slot.end_time
+            schedule.day = day
+            schedule.time_slot = TimeSlot(time(6, 0), time(7, 0))
+            schedule.lecturer_name = "Dr. Moved"
+            self.assertTrue(service.update_schedule(schedule_id, schedule))
+
+            if old_day != day:
+                self.assertNotIn(schedule_id,
+                                 {s.schedule_id for s in service.get_schedules_by_day(old_day)})
+            self.assertNotIn(schedule_id, {s.schedule_id for s in service.find_overlapping_schedules(
+                old_day, old_start, old_end, room_id=old_room)})
+            self.assertIn(schedule, service.find_overlapping_schedules(
+                day, time(6, 0), time(7, 0), room_id=old_room))
+            self.assertFalse(service.is_room_free(old_room, day, time(6, 0), time(7, 0)))
+        self.assertMatchesScan()
+        self.assertEqual(
+            {c.key for c in service.get_conflicts()},
+            {c.key for c in ConflictDetectionEngine.detect_schedule_conflicts(
+                list(service.schedules.values()))})
+
+
+class TestBulkCreate(unittest.TestCase):
+    """Test SchedulingService.create_schedules_bulk"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.schedules = make_random_schedules(150, seed=11)
+        for schedule in self.schedules:
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+        self.service = self._service_with_rooms()
+        self.observer = RecordingObserver()
+        self.service.attach(self.observer)
+
+    def _service_with_rooms(self):
+        service = SchedulingService()
+        for schedule in self.schedules:
+            service.add_room(schedule.room)
+        return service
+
+    def test_bulk_matches_row_by_row(self):
+        """Test that a bulk load ends in the same state as create_schedule per row"""
+        results = self.service.create_schedules_bulk(self.schedules)
+        self.assertTrue(all(result.success for result in results))
+
+        reference = self._service_with_rooms()
+        for schedule in self.schedules:
+            reference.create_schedule(schedule)
+        self.assertEqual([c.key for c in self.service.get_conflicts()],
+                         [c.key for c in reference.get_conflicts()])
+        self.assertEqual(len(self.service.get_schedules_by_day(DayOfWeek.MONDAY)),
+                         len(reference.get_schedules_by_day(DayOfWeek.MONDAY)))
+
+    def test_single_summary_notification(self):
+        """Test that observers get one BATCH_APPLIED event and nothing else"""
+        self.service.create_schedules_bulk(self.schedules)
+        self.assertEqual(len(self.observer.events), 1)
+        summary = self.observer.of_type(EventType.BATCH_APPLIED)[0]
+        self.assertEqual(len(summary['created']), len(self.schedules))
+        self.assertEqual(summary['conflicts_detected']['total_conflicts'],
+                         len(self.service.get_conflicts()))
+
+    def test_per_row_failures(self):
+        """Test that invalid rows are reported and skipped"""
+        unknown_room = Room("NOPE", "Nowhere", 10)
+        rows = [
+            self.schedules[0],
+            Schedule("BAD1", "Course", "C1", "Dr. A", DayOfWeek.MONDAY,
+                     TimeSlot(time(9, 0), time(10, 0)), unknown_room, 5),
+            Schedule("BAD2", "Course", "C2", "Dr. A", DayOfWeek.MONDAY,
+                     TimeSlot(time(9, 0), time(10, 0)), self.schedules[0].room, 500),
+            self.schedules[0],
+            "not a schedule",
+            self.schedules[1],
+        ]
+        results = self.service.create_schedules_bulk(rows)
+
+        self.assertEqual([r.success for r in results], [True, False, False, False, False, True])
+        self.assertIn("not found", results[1].error)
+        self.assertIn("capacity", results[2].error)
+        self.assertIn("already exists", results[3].error)
+        self.assertEqual(len(self.service.list_schedules()), 2)
+        summary = self.observer.of_type(EventType.BATCH_APPLIED)[0]
+        self.assertEqual([row['index'] for row in summary['failed']], [1, 2, 3, 4])
+
+    def test_small_batch_on_large_store(self):
+        """Test the incremental path when a batch is small next to the store"""
+        self.service.create_schedules_bulk(self.schedules[:140])
+        self.service.create_schedules_bulk(self.schedules[140:])
+
+        reference = self._service_with_rooms()
+        reference.create_schedules_bulk(self.schedules)
+        self.assertEqual([c.key for c in self.service.get_conflicts()],
+                         [c.key for c in reference.get_conflicts()])
+
+
+class TestBatchContext(unittest.TestCase):
+    """Test SchedulingService.batch()"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.schedules = make_random_schedules(80, seed=13)
+        for schedule in self.schedules:
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+        self.service = self._loaded_service()
+        self.observer = RecordingObserver()
+        self.service.attach(self.observer)
+
+    def _loaded_service(self):
+        service = SchedulingService()
+        for schedule in self.schedules:
+            service.add_room(schedule.room)
+        service.create_schedules_bulk(self.schedules)
+        return service
+
+    def _moved(self, schedule, day):
+        return Schedule(schedule.schedule_id, schedule.course_name, schedule.course_code,
+                        schedule.lecturer_name, day, schedule.time_slot, schedule.room,
+                        schedule.num_students, schedule.krs_id)
+
+    def _state(self, service):
+        return (list(service.schedules), [c.key for c in service.get_conflicts()],
+                [s.schedule_id for s in service.get_schedules_by_day(DayOfWeek.MONDAY)])
+
+    def test_batch_matches_individual_mutations(self):
+        """Test that one batch ends in the same state as the same calls one by one"""
+        def apply(service):
+            for schedule in self.schedules[:10]:
+                service.update_schedule(schedule.schedule_id,
+                                        self._moved(schedule, DayOfWeek.MONDAY))
+            for schedule in self.schedules[10:15]:
+                service.delete_schedule(schedule.schedule_id)
+
+        reference = self._loaded_service()
+        apply(reference)
+        with self.service.batch():
+            apply(self.service)
+
+        self.assertEqual(self._state(self.service), self._state(reference))
+        self.assertEqual(len(self.observer.events), 1)
+        summary = self.observer.of_type(EventType.BATCH_APPLIED)[0]
+        self.assertEqual(len(summary['updated']), 10)
+        self.assertEqual(len(summary['deleted']), 5)
+        self.assertEqual(len(summary['events']), 15)
+
+    def test_events_are_coalesced(self):
+        """Test that create+delete cancels out and create+update reports one creation"""
+        room = self.schedules[0].room
+        temp = Schedule("TEMP", "Temp", "T1", "Dr. Temp", DayOfWeek.SUNDAY,
+                        TimeSlot(time(9, 0), time(10, 0)), room, 1)
+        new = Schedule("NEW", "New", "N1", "Dr. New", DayOfWeek.SUNDAY,
+                       TimeSlot(time(9, 0), time(10, 0)), room, 1)
+        with self.service.batch() as batch:
+            self.service.create_schedule(temp)
+            self.service.create_schedule(new)
+            self.service.delete_schedule("TEMP")
+            self.service.update_schedule("NEW", self._moved(new, DayOfWeek.SATURDAY))
+
+        self.assertTrue(batch.committed)
+        summary = self.observer.of_type(EventType.BATCH_APPLIED)[0]
+        self.assertEqual(summary['created'], ["NEW"])
+        self.assertEqual(summary['deleted'], [])
+        self.assertEqual(summary['events'][0]['data']['day'], "SATURDAY")
+        self.assertNotIn("TEMP", self.service.schedules)
+
+    def test_rollback_on_validation_failure(self):
+        """Test that a rejected mutation reverts the whole batch"""
+        before = self._state(self.service)
+        first = self.schedules[0]
+        with self.service.batch() as batch:
+            self.service.delete_schedule(first.schedule_id)
+            self.service.update_schedule(self.schedules[1].schedule_id,
+                                         self._moved(self.schedules[1], DayOfWeek.SUNDAY))
+            self.assertFalse(self.service.delete_schedule("MISSING"))
+
+        self.assertFalse(batch.committed)
+        self.assertEqual(len(batch.errors), 1)
+        self.assertEqual(self._state(self.service), before)
+        self.assertFalse(self.service.is_room_free(
+            first.room.room_id, first.day, first.time_slot.start_time, first.time_slot.end_time))
+        self.assertEqual(self.observer.events, [])
+
+    def test_rollback_on_exception(self):
+        """Test that an exception inside the block reverts the batch and propagates"""
+        before = self._state(self.service)
+        with self.assertRaises(RuntimeError):
+            with self.service.batch():
+                self.service.delete_schedule(self.schedules[0].schedule_id)
+                raise RuntimeError("boom")
+
+        self.assertEqual(self._state(self.service), before)
+        self.assertEqual(self.observer.events, [])
+
+
+class TestOccupancyBitmaps(unittest.TestCase):
+    """Test room and lecturer occupancy bitmaps"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.room = Room("R001", "Room A", 40)
+        self.service.add_room(self.room)
+        self.service.create_schedule(Schedule(
+            "SCH001", "Course A", "A101", "Dr. Smith", DayOfWeek.TUESDAY,
+            TimeSlot(time(10, 0), time(12, 0)), self.room, 30
+        ))
+
+    def test_room_availability(self):
+        """Test aligned and unaligned room queries"""
+        self.assertFalse(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(10, 0), time(12, 0)))
+        self.assertFalse(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(11, 58), time(13, 0)))
+        self.assertTrue(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(12, 0), time(13, 0)))
+        self.assertTrue(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(8, 0), time(10, 0)))
+        self.assertTrue(self.service.is_room_free("R001", DayOfWeek.MONDAY, time(10, 0), time(12, 0)))
+
+    def test_unaligned_booking_checked_exactly(self):
+        """Test that a booking ending off the 5-minute grid is not over-reported"""
+        self.service.create_schedule(Schedule(
+            "SCH002", "Course B", "B101", "Dr. Jones", DayOfWeek.TUESDAY,
+            TimeSlot(time(13, 0), time(13, 52)), self.room, 30
+        ))
+        self.assertTrue(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(13, 52), time(15, 0)))
+        self.assertFalse(self.service.is_lecturer_free("dr. jones", DayOfWeek.TUESDAY, time(13, 50), time(15, 0)))
+
+    def test_bitmaps_follow_mutations(self):
+        """Test that updates and deletes clear the old bits"""
+        moved = Schedule(
+            "SCH001", "Course A", "A101", "Dr. Smith", DayOfWeek.TUESDAY,
+            TimeSlot(time(14, 0), time(15, 0)), self.room, 30
+        )
+        self.service.update_schedule("SCH001", moved)
+        self.assertTrue(self.service.is_room_free("R001", DayOfWeek.TUESDAY, time(10, 0), time(12, 0)))
+        self.assertFalse(self.service.is_lecturer_free("Dr. Smith", DayOfWeek.TUESDAY, time(14, 0), time(14, 5)))
+
+        self.service.delete_schedule("SCH001")
+        self.assertEqual(len(self.service.room_occupancy), 0)
+        self.assertEqual(len(self.service.lecturer_occupancy), 0)
+
+
+class TestConflictNotifications(unittest.TestCase):
+    """Test that only conflict deltas are broadcast"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.room1 = Room("R001", "Room A", 40)
+        self.room2 = Room("R002", "Room B", 40)
+        self.service.add_room(self.room1)
+        self.service.add_room(self.room2)
+        self.observer = RecordingObserver()
+        self.service.attach(self.observer)
+
+    def make_schedule(self, schedule_id, room, start_hour, lecturer="Dr. Smith"):
+        return Schedule(
+            schedule_id, f"Course {schedule_id}", schedule_id, lecturer,
+            DayOfWeek.MONDAY, TimeSlot(time(start_hour, 0), time(start_hour + 2, 0)),
+            room, 30
+        )
+
+    def test_existing_conflicts_not_rebroadcast(self):
+        """Test that an unrelated write does not resend standing conflicts"""
+        self.service.create_schedule(self.make_schedule("SCH001", self.room1, 8))
+        self.service.create_schedule(self.make_schedule("SCH002", self.room1, 9))
+        self.assertEqual(len(self.observer.of_type(EventType.CONFLICT_DETECTED)), 2)
+
+        self.observer.events.clear()
+        self.service.create_schedule(self.make_schedule("SCH003", self.room2, 14, "Dr. Jones"))
+
+        self.assertEqual(self.observer.of_type(EventType.CONFLICT_DETECTED), [])
+        self.assertEqual(len(self.service.get_conflicts()), 2)
+
+    def test_resolved_conflicts_emitted(self):
+        """Test SCHEDULE_RESOLVED when an update removes a conflict"""
+        self.service.create_schedule(self.make_schedule("SCH001", self.room1, 8))
+        self.service.create_schedule(self.make_schedule("SCH002", self.room1, 9))
+        self.observer.events.clear()
+
+        # Moving to another room keeps the lecturer conflict, resolves the room one
+        self.service.update_schedule("SCH002", self.make_schedule("SCH002", self.room2, 9))
+
+        resolved = self.observer.of_type(EventType.SCHEDULE_RESOLVED)
+        self.assertEqual([data['conflict_type'] for data in resolved],
+                         [ConflictType.ROOM_CONFLICT.value])
+        self.assertEqual(self.observer.of_type(EventType.CONFLICT_DETECTED), [])
+
+        self.observer.events.clear()
+        self.service.delete_schedule("SCH001")
+        resolved = self.observer.of_type(EventType.SCHEDULE_RESOLVED)
+        self.assertEqual([data['conflict_type'] for data in resolved],
+                         [ConflictType.LECTURER_CONFLICT.value])
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock used by SchedulingService"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.lock = ReadWriteLock()
+
+    def test_readers_share_the_lock(self):
+        """Test that two readers hold the lock at the same time"""
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with self.lock.read_locked():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(both_inside.broken)
+
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits until the writer releases"""
+        order = []
+        self.lock.acquire_write()
+        reader = threading.Thread(target=lambda: (self.lock.acquire_read(), order.append("read"),
+                                                  self.lock.release_read()))
+        reader.start()
+        reader.join(0.2)
+        order.append("write done")
+        self.lock.release_write()
+        reader.join(5)
+        self.assertEqual(order, ["write done", "read"])
+
+    def test_waiting_reader_goes_before_next_write(self):
+        """Test that back-to-back writes cannot starve a waiting reader"""
+        order = []
+        self.lock.acquire_write()
+        reader = threading.Thread(target=lambda: (self.lock.acquire_read(), order.append("read"),
+                                                  self.lock.release_read()))
+        reader.start()
+        while not self.lock._waiting_readers:
+            reader.join(0.01)
+        self.lock.release_write()
+        self.lock.acquire_write()
+        order.append("second write")
+        self.lock.release_write()
+        reader.join(5)
+        self.assertEqual(order, ["read", "second write"])
+
+    def test_reentrancy(self):
+        """Test nested reads, reads inside a write and the upgrade guard"""
+        with self.lock.write_locked():
+            with self.lock.write_locked():
+                with self.lock.read_locked():
+                    pass
+        with self.lock.read_locked():
+            with self.lock.read_locked():
+                pass
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.lock.write_locked():
+            pass
+
+
+class TestConcurrentService(unittest.TestCase):
+    """Stress SchedulingService with concurrent writers and readers"""
+
+    def test_concurrent_creates_and_reads(self):
+        """Test that indexes and conflicts stay consistent under concurrent use"""
+        service = SchedulingService()
+        schedules = make_random_schedules(400, seed=17)
+        for schedule in schedules:
+            service.add_room(schedule.room)
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+        errors = []
+        writers_done = threading.Event()
+
+        def writer(chunk):
+            try:
+                for schedule in chunk:
+                    service.create_schedule(schedule)
+                for schedule in chunk[::5]:
+                    service.delete_schedule(schedule.schedule_id)
+                with service.batch():
+                    for schedule in chunk[1::5]:
+                        service.update_schedule(schedule.schedule_id, Schedule(
+                            schedule.schedule_id, schedule.course_name, schedule.course_code,
+                            schedule.lecturer_name, DayOfWeek.SATURDAY, schedule.time_slot,
+                            schedule.room, schedule.num_students))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(100):
+                    if writers_done.is_set():
+                        break
+                    listed = service.list_schedules()
+                    for conflict in service.get_conflicts():
+                        self.assertIsNotNone(conflict.schedule_1)
+                    service.get_schedules_by_day(DayOfWeek.MONDAY)
+                    service.find_overlapping_schedules(DayOfWeek.MONDAY, time(8, 0),
+                                                       time(12, 0), room_id="R000")
+                    service.get_conflict_summary()
+                    self.assertLessEqual(len(listed), len(schedules))
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        writers = [threading.Thread(target=writer, args=(schedules[i::4],)) for i in range(4)]
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join(60)
+        writers_done.set()
+        for thread in readers:
+            thread.join(60)
+
+        self.assertEqual(errors, [])
+        stored = service.list_schedules()
+        expected_ids = {s.schedule_id for i in range(4) for j, s in enumerate(schedules[i::4])
+                        if j % 5 != 0}
+        self.assertEqual({s.schedule_id for s in stored}, expected_ids)
+        for day in DayOfWeek:
+            self.assertEqual({s.schedule_id for s in service.get_schedules_by_day(day)},
+                             {s.schedule_id for s in stored if s.day == day})
+        fresh = ConflictDetectionEngine().detect_schedule_conflicts(stored)
+        self.assertEqual([c.key for c in service.get_conflicts()], [c.key for c in fresh])
+
+
+class TestSnapshots(unittest.TestCase):
+    """Test versioned snapshots published by SchedulingService"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.schedules = make_random_schedules(60, seed=19)
+        for schedule in self.schedules:
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+            self.service.add_room(schedule.room)
+        self.service.create_schedules_bulk(self.schedules[:40])
+
+    def test_version_counts_committed_changes(self):
+        """Test that the version grows on commits only"""
+        version = self.service.version
+        self.service.create_schedule(self.schedules[40])
+        self.assertEqual(self.service.version, version + 1)
+
+        self.assertFalse(self.service.create_schedule(self.schedules[40]))
+        with self.service.batch():
+            self.service.delete_schedule(self.schedules[0].schedule_id)
+            self.service.delete_schedule("MISSING")
+        self.assertEqual(self.service.version, version + 1)
+
+        with self.service.batch():
+            for schedule in self.schedules[41:45]:
+                self.service.create_schedule(schedule)
+        self.assertEqual(self.service.version, version + 2)
+
+    def test_snapshot_is_immutable(self):
+        """Test that later changes do not leak into an older snapshot"""
+        before = self.service.snapshot()
+        self.assertIs(self.service.snapshot(), before)
+        self.service.delete_schedule(self.schedules[0].schedule_id)
+        self.service.create_schedule(self.schedules[40])
+
+        after = self.service.snapshot()
+        self.assertGreater(after.version, before.version)
+        self.assertIn(self.schedules[0].schedule_id, before.schedules)
+        self.assertNotIn(self.schedules[40].schedule_id, before.schedules)
+        self.assertEqual(len(before.list_schedules()), 40)
+        with self.assertRaises(TypeError):
+            before.schedules["X"] = self.schedules[41]
+
+    def test_snapshot_lookups_match_service(self):
+        """Test snapshot indexes and conflicts against the live service"""
+        snapshot = self.service.snapshot()
+        self.assertEqual([c.key for c in snapshot.get_conflicts()],
+                         [c.key for c in self.service.get_conflicts()])
+        for schedule in self.schedules[:40]:
+            self.assertEqual(snapshot.get_schedules_by_lecturer(schedule.lecturer_name),
+                             self.service.get_schedules_by_lecturer(schedule.lecturer_name))
+            self.assertEqual(
+                {s.schedule_id for s in snapshot.get_schedules_by_room(schedule.room.room_id)},
+                {s.schedule_id for s in self.service.get_schedules_by_room(schedule.room.room_id)})
+        self.assertEqual(DashboardService(self.service).get_dashboard_summary()['version'],
+                         self.service.version)
+
+    def test_readers_do_not_wait_for_writers(self):
+        """Test that snapshot() returns the published version while a batch is open"""
+        published = self.service.snapshot()
+        inside, release = threading.Event(), threading.Event()
+
+        def writer():
+            with self.service.batch():
+                self.service.delete_schedule(self.schedules[0].schedule_id)
+                inside.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            self.assertTrue(inside.wait(5))
+            self.assertIs(self.service.snapshot(), published)
+        finally:
+            release.set()
+            thread.join(5)
+        self.assertGreater(self.service.snapshot().version, published.version)
+        self.assertNotIn(self.schedules[0].schedule_id, self.service.snapshot().schedules)
+
+    def test_snapshot_records_event_id(self):
+        """Test that each snapshot carries the event_source position of its commit"""
+        broadcaster = EventBroadcaster()
+        self.service.dispatcher = AsyncDispatcher()
+        self.addCleanup(self.service.dispatcher.close, 5)
+        self.service.attach(broadcaster)
+        self.assertIsNone(self.service.snapshot().event_id)
+        self.service.event_source = broadcaster
+        self.assertEqual(self.service.snapshot().event_id, f"{broadcaster.epoch}-0")
+        for schedule in self.schedules[40:43]:
+            self.service.create_schedule(schedule)
+            snapshot = self.service.snapshot()
+            self.assertEqual(snapshot.event_id, broadcaster.last_event_id)
+            self.assertEqual(broadcaster._history[-1][2]['schedule_id'], schedule.schedule_id)
+        with self.service.batch():
+            self.service.delete_schedule(self.schedules[40].schedule_id)
+        self.assertEqual(self.service.snapshot().event_id, broadcaster.last_event_id)
+        self.assertEqual(broadcaster._history[-1][1], EventType.BATCH_APPLIED)
+
+    def test_commit_publishes_before_the_lock_is_released(self):
+        """Test that a write is in snapshot() even while another writer holds the lock"""
+        inside, release = threading.Event(), threading.Event()
+        self.service.create_schedule(self.schedules[40])
+
+        def writer():
+            with self.service.lock.write_locked():
+                inside.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            self.assertTrue(inside.wait(5))
+            snapshot = self.service.snapshot()
+            self.assertEqual(snapshot.version, self.service.version)
+            self.assertIs(snapshot.get_schedule(self.schedules[40].schedule_id), self.schedules[40])
+        finally:
+            release.set()
+            thread.join(5)
+
+    def test_snapshots_follow_every_commit(self):
+        """Test copy-on-write snapshots against the live service after each commit"""
+        ScheduleSnapshot.SNAPSHOT_BLOCK, block = 8, ScheduleSnapshot.SNAPSHOT_BLOCK
+        self.addCleanup(setattr, ScheduleSnapshot, 'SNAPSHOT_BLOCK', block)
+        service = SchedulingService()
+        for schedule in self.schedules:
+            service.add_room(schedule.room)
+        service.create_schedules_bulk(self.schedules[:40])
+        rng = random.Random(3)
+        rooms = list(service.rooms.values())
+        history = []
+
+        for step in range(120):
+            action = rng.random()
+            live = list(service.schedules)
+            if action < 0.3 and step % 10:
+                spare = [s for s in self.schedules if s.schedule_id not in service.schedules]
+                if spare:
+                    service.create_schedule(rng.choice(spare))
+            elif action < 0.5:
+                service.delete_schedule(rng.choice(live))
+            elif action < 0.6:
+                with service.batch():
+                    for schedule_id in rng.sample(live, 3):
+                        service.delete_schedule(schedule_id)
+                    service.create_schedule(rng.choice(
+                        [s for s in self.schedules if s.schedule_id not in service.schedules]))
+                    if step % 3 == 0:
+                        service.delete_schedule("MISSING")
+            else:
+                current = service.get_schedule(rng.choice(live))
+                room = rng.choice(rooms)
+                start = rng.randrange(7, 17)
+                service.update_schedule(current.schedule_id, Schedule(
+                    current.schedule_id, current.course_name, current.course_code,
+                    current.lecturer_name, rng.choice(list(DayOfWeek)[:5]),
+                    TimeSlot(time(start, 0), time(start + 2, 0)), room,
+                    min(current.num_students, room.capacity)))
+
+            snapshot = service.snapshot()
+            self.assertEqual(snapshot.version, service.version)
+            self.assertEqual(list(snapshot.schedules), list(service.schedules))
+            self.assertEqual(len(snapshot.schedules), len(service.schedules))
+            self.assertEqual([c.key for c in snapshot.conflicts],
+                             [c.key for c in service.get_conflicts()])
+            for schedule in rng.sample(list(service.schedules.values()), 5):
+                self.assertIs(snapshot.get_schedule(schedule.schedule_id), schedule)
+                self.assertEqual(snapshot.get_schedules_by_room(schedule.room.room_id),
+                                 [s for s in service.schedules.values()
+                                  if s.room.room_id == schedule.room.room_id])
+                self.assertEqual(snapshot.get_schedules_by_day(schedule.day),
+                                 [s for s in service.schedules.values() if s.day == schedule.day])
+            history.append((snapshot, list(service.schedules)))
+
+        # Older snapshots are unchanged, and a commit reuses untouched blocks
+        for snapshot, schedule_ids in history:
+            self.assertEqual(list(snapshot.schedules), schedule_ids)
+        before = service.snapshot()
+        service.delete_schedule(next(iter(service.schedules)))
+        after = service.snapshot()
+        shared = [block for block in after._blocks
+                  if after._blocks[block] is before._blocks.get(block)]
+        self.assertGreaterEqual(len(shared), len(after._blocks) - 1)
+
+
+class TestCompactRepresentation(unittest.TestCase):
+    """Test the slotted, interned Schedule / Room / TimeSlot representation"""
+
+    def make(self, schedule_id, room):
+        return Schedule(schedule_id, "".join(["Basis", " Data"]), "".join(["CS", "101"]),
+                        "".join(["Dr. ", "Smith"]), DayOfWeek.MONDAY,
+                        TimeSlot(time(8, 0), time(10, 0)), room, 30)
+
+    def test_slotted_without_dict(self):
+        """Test that the models carry no per-instance __dict__"""
+        room = Room("R101", "Room 101", 40)
+        schedule = self.make("SCH001", room)
+        for obj in (room, schedule, schedule.time_slot):
+            self.assertFalse(hasattr(obj, '__dict__'))
+        with self.assertRaises(AttributeError):
+            schedule.unknown_field = 1
+
+    def test_repeated_strings_interned(self):
+        """Test that equal course / lecturer strings share one object"""
+        room = Room("R101", "Room 101", 40)
+        first, second = self.make("SCH001", room), self.make("SCH002", room)
+        self.assertIs(first.course_code, second.course_code)
+        self.assertIs(first.course_name, second.course_name)
+        self.assertIs(first.lecturer_name, second.lecturer_name)
+        self.assertIs(first.time_slot.start_time, second.time_slot.start_time)
+
+    def test_updated_at_defaults_to_created_at(self):
+        """Test that a fresh schedule reuses its creation timestamp"""
+        schedule = self.make("SCH001", Room("R101", "Room 101", 40))
+        self.assertIs(schedule.updated_at, schedule.created_at)
+
+    def test_service_shares_registered_room(self):
+        """Test that stored schedules reference the registered Room by id"""
+        service = SchedulingService()
+        room = Room("R101", "Room 101", 40)
+        service.add_room(room)
+        schedule = self.make("SCH001", Room("R101", "Room 101", 40))
+        self.assertTrue(service.create_schedule(schedule))
+        self.assertIs(service.get_schedule("SCH001").room, room)
+
+        replacement = self.make("SCH001", Room("R101", "Room 101", 40))
+        self.assertTrue(service.update_schedule("SCH001", replacement))
+        self.assertIs(service.get_schedule("SCH001").room, room)
+
+    def test_time_slot_assignment_stays_encoded(self):
+        """Test that reassigning slot times still refreshes the minute encoding"""
+        slot = TimeSlot(time(8, 0), time(10, 0))
+        slot.end_time = time(11, 30)
+        self.assertEqual((slot.start_minute, slot.end_minute), (480, 690))
+        self.assertEqual(str(slot), "08:00-11:30")
+
+
+class TestDurableStore(unittest.TestCase):
+    """Test write-ahead log and snapshot persistence"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.schedules = make_random_schedules(40, seed=23)
+        for schedule in self.schedules:
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+
+    def open_service(self, **options):
+        service = SchedulingService()
+        store = DurableStore(self.directory, **options)
+        stats = store.open(service)
+        return service, store, stats
+
+    def populate(self, service):
+        for schedule in self.schedules:
+            service.add_room(schedule.room)
+        for schedule in self.schedules[:30]:
+            service.create_schedule(schedule)
+        moved = self.schedules[3]
+        service.update_schedule(moved.schedule_id, Schedule(
+            moved.schedule_id, moved.course_name, moved.course_code, moved.lecturer_name,
+            DayOfWeek.SATURDAY, TimeSlot(time(13, 0), time(15, 0)), moved.room, moved.num_students))
+        with service.batch():
+            service.delete_schedule(self.schedules[0].schedule_id)
+            service.create_schedules_bulk(self.schedules[30:])
+        with service.batch():
+            service.delete_schedule(self.schedules[1].schedule_id)
+            service.delete_schedule("MISSING")  # rolled back, never logged
+
+    def assertSameState(self, expected, actual):
+        self.assertEqual(list(expected.schedules), list(actual.schedules))
+        for schedule_id, schedule in expected.schedules.items():
+            restored = actual.schedules[schedule_id]
+            self.assertEqual(str(restored), str(schedule))
+            self.assertEqual(restored.updated_at, schedule.updated_at)
+            self.assertIs(restored.room, actual.rooms[schedule.room.room_id])
+        self.assertEqual(sorted(expected.rooms), sorted(actual.rooms))
+        self.assertEqual([c.key for c in expected.get_conflicts()],
+                         [c.key for c in actual.get_conflicts()])
+
+    def test_recovers_from_log(self):
+        """Test that replaying the log alone restores every change"""
+        service, store, _ = self.open_service(checkpoint_every=None)
+        self.populate(service)
+        store.close()
+
+        restored, store, stats = self.open_service()
+        store.close()
+        self.assertEqual(stats['snapshot_schedules'], 0)
+        self.assertGreater(stats['replayed_groups'], 0)
+        self.assertSameState(service, restored)
+
+    def test_recovers_from_snapshot_and_tail(self):
+        """Test that a checkpoint compacts the log and the tail is replayed after it"""
+        service, store, _ = self.open_service(checkpoint_every=None)
+        self.populate(service)
+        store.checkpoint()
+        self.assertEqual(len(store.wal.segments()), 1)
+        service.delete_schedule(self.schedules[2].schedule_id)
+        store.close()
+
+        restored, store, stats = self.open_service()
+        store.close()
+        self.assertEqual(stats['snapshot_schedules'], len(service.schedules) + 1)
+        self.assertEqual((stats['replayed_groups'], stats['replayed_operations']), (1, 1))
+        self.assertSameState(service, restored)
+
+    def test_torn_record_is_dropped(self):
+        """Test that a partially written last record is ignored and cut off"""
+        service, store, _ = self.open_service(sync_interval=0)
+        self.populate(service)
+        store.close()
+        segment = DurableStore(self.directory).wal.segments()[-1]
+        with open(segment, 'a', encoding='utf-8') as handle:
+            handle.write('{"seq": 999, "ops": [["delete", "SCH')
+
+        restored, store, _ = self.open_service()
+        self.assertSameState(service, restored)
+        restored.delete_schedule(self.schedules[2].schedule_id)
+        store.close()
+
+        again, store, _ = self.open_service()
+        store.close()
+        self.assertNotIn(self.schedules[2].schedule_id, again.schedules)
+
+    def test_background_checkpoint(self):
+        """Test that checkpoint_every triggers a compaction off the write path"""
+        service, store, _ = self.open_service(checkpoint_every=10)
+        self.populate(service)
+        store.close()
+        self.assertTrue(os.path.exists(store.snapshot_path))
+
+        restored, store, _ = self.open_service()
+        store.close()
+        self.assertSameState(service, restored)
+
+    def test_rejected_snapshot_row_fails_recovery(self):
+        """Test that a snapshot row failing validation stops recovery instead of being dropped"""
+        service, store, _ = self.open_service(checkpoint_every=None)
+        self.populate(service)
+        store.checkpoint()
+        store.close()
+        with open(store.snapshot_path, encoding='utf-8') as handle:
+            snapshot = json.load(handle)
+        snapshot['schedules'].append(snapshot['schedules'][0])
+        with open(store.snapshot_path, 'w', encoding='utf-8') as handle:
+            json.dump(snapshot, handle)
+
+        with self.assertLogs('schedule_persistence', 'ERROR') as logs:
+            with self.assertRaises(RuntimeError):
+                self.open_service()
+        self.assertIn(snapshot['schedules'][0]['schedule_id'], logs.output[0])
+
+    def test_failed_append_leaves_memory_unchanged(self):
+        """Test that a change the journal could not write is not applied either"""
+        service, store, _ = self.open_service(checkpoint_every=None)
+        self.populate(service)
+        before = {schedule_id: str(schedule) for schedule_id, schedule in service.schedules.items()}
+        conflicts = [conflict.key for conflict in service.get_conflicts()]
+
+        class FullDisk:
+            def append(self, entries):
+                raise OSError(28, "No space left on device")
+
+        service.journal = FullDisk()
+        moved = self.schedules[5]
+        clash = Schedule(moved.schedule_id, moved.course_name, moved.course_code,
+                         moved.lecturer_name, moved.day, moved.time_slot,
+                         self.schedules[6].room, moved.num_students)
+        for change in (lambda: service.create_schedule(Schedule(
+                           "NEW001", "Course", "CS999", "Dr. New", DayOfWeek.MONDAY,
+                           TimeSlot(time(8, 0), time(9, 0)), self.schedules[2].room, 1)),
+                       lambda: service.update_schedule(moved.schedule_id, clash),
+                       lambda: service.delete_schedule(self.schedules[4].schedule_id),
+                       lambda: service.create_schedules_bulk([self.schedules[0]])):
+            with self.assertRaises(OSError):
+                change()
+        with self.assertRaises(OSError):
+            with service.batch():
+                service.delete_schedule(self.schedules[7].schedule_id)
+
+        self.assertEqual({schedule_id: str(schedule)
+                          for schedule_id, schedule in service.schedules.items()}, before)
+        self.assertEqual([conflict.key for conflict in service.get_conflicts()], conflicts)
+        self.assertEqual(service.get_schedules_by_room(self.schedules[2].room.room_id),
+                         [s for s in service.schedules.values()
+                          if s.room.room_id == self.schedules[2].room.room_id])
+        service.journal = store
+        store.close()
+
+        restored, store, _ = self.open_service()
+        store.close()
+        self.assertSameState(service, restored)
+
+
+class TestSQLiteRepository(unittest.TestCase):
+    """Test the SQLite storage backend and its SQL conflict detection"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.repository = SQLiteScheduleRepository()
+        self.addCleanup(self.repository.close)
+        self.schedules = make_random_schedules(150, seed=29)
+        for room in {schedule.room.room_id: schedule.room for schedule in self.schedules}.values():
+            self.repository.add_room(room)
+        self.repository.save_schedules(self.schedules)
+
+    def conflict_view(self, conflicts):
+        return [(c.conflict_type, c.schedule_1.schedule_id,
+                 c.schedule_2.schedule_id if c.schedule_2 else None, c.description)
+                for c in conflicts]
+
+    def test_round_trip(self):
+        """Test that schedules come back equal and in insertion order"""
+        self.assertEqual(self.repository.list_schedules(), self.schedules)
+        self.assertEqual(self.repository.count_schedules(), len(self.schedules))
+        lecturer = self.schedules[0].lecturer_name
+        self.assertEqual(
+            self.repository.get_schedules_by_lecturer(lecturer.upper()),
+            [s for s in self.schedules if s.lecturer_key == lecturer.lower()])
+        self.assertIsNone(self.repository.get_schedule("MISSING"))
+        with self.assertRaises(ValueError):
+            self.repository.save_schedule(Schedule(
+                "SCH999", "X", "X1", "Dr. X", DayOfWeek.MONDAY,
+                TimeSlot(time(8, 0), time(9, 0)), Room("NOPE", "Nope", 10), 5))
+
+    def test_conflicts_match_engine(self):
+        """Test that the SQL self-join returns the engine's conflicts in the same order"""
+        expected = ConflictDetectionEngine().detect_schedule_conflicts(self.schedules)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(self.conflict_view(self.repository.detect_conflicts()),
+                         self.conflict_view(expected))
+
+        monday = [s for s in self.schedules if s.day == DayOfWeek.MONDAY]
+        self.assertEqual(
+            self.conflict_view(self.repository.detect_conflicts(DayOfWeek.MONDAY)),
+            self.conflict_view(ConflictDetectionEngine().detect_schedule_conflicts(monday)))
+
+    def test_upsert_and_seconds(self):
+        """Test that updates keep their position and second-precision times are exact"""
+        moved = self.schedules[5]
+        replacement = Schedule(
+            moved.schedule_id, moved.course_name, moved.course_code, moved.lecturer_name,
+            moved.day, TimeSlot(time(9, 0, 30), time(10, 0, 15)), moved.room, moved.num_students)
+        self.schedules[5] = replacement
+        self.repository.save_schedule(replacement)
+        self.assertTrue(self.repository.delete_schedule(self.schedules[7].schedule_id))
+        del self.schedules[7]
+
+        self.assertEqual(self.repository.list_schedules(), self.schedules)
+        self.assertEqual(
+            self.conflict_view(self.repository.detect_conflicts()),
+            self.conflict_view(ConflictDetectionEngine().detect_schedule_conflicts(self.schedules)))
+
+    def test_mirrors_service(self):
+        """Test that the repository can journal a service and load it back"""
+        service = SchedulingService()
+        mirror = SQLiteScheduleRepository()
+        self.addCleanup(mirror.close)
+        service.journal = mirror
+        for room in self.repository.list_rooms():
+            service.add_room(room)
+        service.create_schedules_bulk(self.schedules[:100])
+        with service.batch():
+            service.delete_schedule(self.schedules[0].schedule_id)
+            service.create_schedule(self.schedules[100])
+
+        self.assertEqual(mirror.list_schedules(), service.list_schedules())
+        restored = SchedulingService()
+        mirror.load_into(restored)
+        self.assertEqual([c.key for c in restored.get_conflicts()],
+                         [c.key for c in mirror.detect_conflicts()])
+        self.assertEqual([c.key for c in restored.get_conflicts()],
+                         [c.key for c in service.get_conflicts()])
+
+
+class TestColumnarSnapshot(unittest.TestCase):
+    """Test the memory-mapped columnar snapshot"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'schedules.col')
+        self.service = SchedulingService()
+        schedules = make_random_schedules(120, seed=31)
+        schedules[4].krs_id = "KRS001"
+        schedules[9].time_slot = TimeSlot(time(9, 0, 30), time(10, 15, 45))
+        for room in {schedule.room.room_id: schedule.room for schedule in schedules}.values():
+            self.service.add_room(room)
+        self.service.create_schedules_bulk(schedules)
+        write_columnar_snapshot(self.path, self.service.snapshot())
+        self.columnar = ColumnarSnapshot(self.path)
+        self.addCleanup(self.columnar.close)
+
+    def test_rows_round_trip(self):
+        """Test that every row materializes back to an equal Schedule"""
+        self.assertEqual(len(self.columnar), len(self.service.schedules))
+        self.assertEqual(self.columnar.version, self.service.version)
+        self.assertEqual(list(self.columnar.iter_schedules()), self.service.list_schedules())
+        self.assertEqual(self.columnar.list_rooms(), self.service.list_rooms())
+
+    def test_conflicts_match_engine(self):
+        """Test that column-based detection returns the engine's conflicts"""
+        expected = ConflictDetectionEngine().detect_schedule_conflicts(self.service.list_schedules())
+        actual = self.columnar.detect_conflicts()
+        self.assertGreater(len(expected), 0)
+        self.assertEqual([(c.key, c.description) for c in actual],
+                         [(c.key, c.description) for c in expected])
+
+    def test_dashboard_summary_matches_service(self):
+        """Test that the aggregates equal DashboardService on the live service"""
+        expected = DashboardService(self.service).get_dashboard_summary()
+        actual = self.columnar.get_dashboard_summary()
+        for summary in (expected, actual):
+            summary['conflict_summary']['affected_schedules'].sort()
+        self.assertEqual(actual, expected)
+
+    def test_rejects_other_files(self):
+        """Test that a file without the columnar header is refused"""
+        other = self.path + '.json'
+        with open(other, 'w', encoding='utf-8') as handle:
+            handle.write('{"rooms": []}')
+        with self.assertRaises(ValueError):
+            ColumnarSnapshot(other)
+
+
+class GatedObserver(RecordingObserver):
+    """Observer whose deliveries wait until the test opens the gate"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def update(self, event_type, data):
+        self.started.set()
+        self.gate.wait(5)
+        super().update(event_type, data)
+
+
+class TestAsyncDispatcher(unittest.TestCase):
+    """Test asynchronous observer dispatch and its backpressure policies"""
+
+    def make_dispatcher(self, **options):
+        dispatcher = AsyncDispatcher(**options)
+        self.addCleanup(dispatcher.close, 5)
+        return dispatcher
+
+    def fill(self, dispatcher, observer, count):
+        """Submit event 0, wait until it is being delivered, then submit the rest"""
+        dispatcher.submit([observer], EventType.SCHEDULE_CREATED, {'n': 0})
+        self.assertTrue(observer.started.wait(5))
+        for n in range(1, count):
+            dispatcher.submit([observer], EventType.SCHEDULE_CREATED, {'n': n})
+
+    def received(self, observer):
+        return [data['n'] for data in observer.of_type(EventType.SCHEDULE_CREATED)]
+
+    def test_service_does_not_wait_for_slow_observer(self):
+        """Test that writes return before a slow observer has run"""
+        service = SchedulingService(dispatcher=self.make_dispatcher())
+        observer = GatedObserver()
+        service.attach(observer)
+        room = Room("R101", "Room 101", 40)
+        service.add_room(room)
+        for i in range(3):
+            self.assertTrue(service.create_schedule(Schedule(
+                f"SCH{i}", "Course", "C1", f"Dr. {i}", DayOfWeek.MONDAY,
+                TimeSlot(time(8 + i, 0), time(9 + i, 0)), room, 30)))
+        self.assertEqual(observer.events, [])
+
+        observer.gate.set()
+        self.assertTrue(service.flush(5))
+        created = observer.of_type(EventType.SCHEDULE_CREATED)
+        self.assertEqual([data['schedule_id'] for data in created], ["SCH0", "SCH1", "SCH2"])
+
+    def test_queued_observers_see_the_published_snapshot(self):
+        """Test that an async observer finds its change in snapshot()"""
+        service = SchedulingService(dispatcher=self.make_dispatcher())
+        seen = []
+
+        class SnapshotReader(Observer):
+            def update(self, event_type, data):
+                seen.append(service.snapshot().get_schedule(data['schedule_id']) is not None)
+
+        service.subscribe(SnapshotReader(), event_types=[EventType.SCHEDULE_CREATED])
+        room = Room("R101", "Room 101", 40)
+        service.add_room(room)
+        for i in range(20):
+            service.create_schedule(Schedule(
+                f"SCH{i}", "Course", "C1", f"Dr. {i}", DayOfWeek.MONDAY,
+                TimeSlot(time(8, 0), time(9, 0)), room, 30))
+        self.assertTrue(service.flush(5))
+        self.assertEqual(seen, [True] * 20)
+
+    def test_drop_oldest(self):
+        """Test that a full queue discards its oldest delivery"""
+        dispatcher = self.make_dispatcher(workers=1, max_queue=2, policy="drop_oldest")
+        observer = GatedObserver()
+        self.fill(dispatcher, observer, 5)
+        observer.gate.set()
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.received(observer), [0, 3, 4])
+        self.assertEqual(dispatcher.stats['dropped'], 2)
+
+    def test_spill_keeps_order(self):
+        """Test that overflow goes to disk and comes back in order"""
+        dispatcher = self.make_dispatcher(workers=1, max_queue=2, policy="spill")
+        observer = GatedObserver()
+        self.fill(dispatcher, observer, 8)
+        self.assertEqual(dispatcher.queued, 8)
+        observer.gate.set()
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.received(observer), list(range(8)))
+        self.assertEqual(dispatcher.stats['spilled'], 5)
+
+    def test_block_applies_backpressure(self):
+        """Test that the producer waits while the queue is full"""
+        dispatcher = self.make_dispatcher(workers=1, max_queue=1, policy="block")
+        observer = GatedObserver()
+        self.fill(dispatcher, observer, 2)
+        producer = threading.Thread(target=dispatcher.submit,
+                                    args=([observer], EventType.SCHEDULE_CREATED, {'n': 2}))
+        producer.start()
+        producer.join(0.2)
+        self.assertTrue(producer.is_alive())
+
+        observer.gate.set()
+        producer.join(5)
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.received(observer), [0, 1, 2])
+
+    def test_failing_observer_is_isolated(self):
+        """Test that an exception in one observer does not stop the others"""
+        dispatcher = self.make_dispatcher(workers=2)
+        failing = mock.Mock(spec=Observer, inline=False)
+        failing.update.side_effect = RuntimeError("SMTP down")
+        recorder = RecordingObserver()
+        dispatcher.submit([failing, recorder], EventType.SCHEDULE_DELETED, {'n': 1})
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(len(recorder.events), 1)
+        self.assertEqual(dispatcher.stats['failed'], 1)
+        with self.assertRaises(ValueError):
+            AsyncDispatcher(policy="lossy")
+
+    def test_detached_observers_are_released(self):
+        """Test that per-observer state goes away on detach, after pending deliveries"""
+        dispatcher = self.make_dispatcher(workers=1, max_queue=2, policy="spill")
+        service = SchedulingService(dispatcher=dispatcher)
+        gated = GatedObserver()
+        service.attach(gated)
+        self.fill(dispatcher, gated, 5)
+        students = [StudentObserver(f"STU{i:03d}", f"Student {i}", f"s{i}@university.edu")
+                    for i in range(50)]
+        service.attach_many(students)
+        dispatcher.submit(students, EventType.SCHEDULE_CREATED, {'n': 99})
+        service.detach_many(students)
+        service.detach(gated)
+        self.assertEqual(dispatcher.tracked, 51)  # still delivering
+
+        gated.gate.set()
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.received(gated), [0, 1, 2, 3, 4])
+        self.assertEqual(dispatcher.tracked, 0)
+        shard = dispatcher._shards[0]
+        self.assertEqual((shard.outstanding, shard.spilled_observers), ({}, {}))
+
+
+class TestTopicSubscriptions(unittest.TestCase):
+    """Test topic-filtered observer subscriptions"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.room1 = Room("R101", "Room 101", 40)
+        self.room2 = Room("R102", "Room 102", 40)
+        self.service.add_room(self.room1)
+        self.service.add_room(self.room2)
+
+    def make(self, schedule_id, lecturer, room, hour, krs_id=None, course_code="CS101"):
+        return Schedule(schedule_id, "Course", course_code, lecturer, DayOfWeek.MONDAY,
+                        TimeSlot(time(hour, 0), time(hour + 2, 0)), room, 30, krs_id=krs_id)
+
+    def test_krs_subscription_filters_events(self):
+        """Test that a student only hears about its own KRS"""
+        student, other = RecordingObserver(), RecordingObserver()
+        self.service.subscribe(student, krs_id="KRS001")
+        self.service.subscribe(other, krs_id="KRS999")
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8, "KRS001"))
+        self.service.create_schedule(self.make("SCH002", "Dr. B", self.room1, 12, "KRS002"))
+
+        self.assertEqual([data['schedule_id'] for data in
+                          student.of_type(EventType.SCHEDULE_CREATED)], ["SCH001"])
+        self.assertEqual(other.events, [])
+
+    def test_topics_and_event_types_combine(self):
+        """Test AND across topics (same schedule) and the event type filter"""
+        observer = RecordingObserver()
+        self.service.subscribe(observer, lecturer="dr. a", room_id="R102",
+                               event_types=[EventType.SCHEDULE_CREATED])
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+        self.service.create_schedule(self.make("SCH002", "Dr. B", self.room2, 8))
+        self.service.create_schedule(self.make("SCH003", "DR. A", self.room2, 14))
+        self.service.delete_schedule("SCH003")
+
+        received = [(event_type, data['schedule_id']) for event_type, data in observer.events]
+        self.assertEqual(received, [(EventType.SCHEDULE_CREATED, "SCH003")])
+
+    def test_conflict_and_batch_events_route_by_any_schedule(self):
+        """Test that conflicts and batches reach subscribers of any schedule involved"""
+        observer = RecordingObserver()
+        self.service.subscribe(observer, room_id="R102")
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+        self.service.create_schedule(self.make("SCH002", "Dr. A", self.room2, 9))
+        self.assertEqual(len(observer.of_type(EventType.CONFLICT_DETECTED)), 1)
+
+        with self.service.batch():
+            self.service.create_schedule(self.make("SCH003", "Dr. C", self.room1, 14))
+            self.service.create_schedule(self.make("SCH004", "Dr. D", self.room2, 14))
+        self.assertEqual(len(observer.of_type(EventType.BATCH_APPLIED)), 1)
+
+        with self.service.batch():
+            self.service.create_schedule(self.make("SCH005", "Dr. E", self.room1, 17))
+        self.assertEqual(len(observer.of_type(EventType.BATCH_APPLIED)), 1)
+
+    def test_each_observer_notified_once(self):
+        """Test deduplication and unsubscribe / detach"""
+        observer = RecordingObserver()
+        self.service.attach(observer)
+        self.service.subscribe(observer, lecturer="Dr. A")
+        first = self.service.subscribe(observer, course_code="CS101")
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+        self.assertEqual(len(observer.events), 1)
+
+        self.service.detach(observer)
+        self.assertFalse(self.service.unsubscribe(first))
+        self.service.create_schedule(self.make("SCH002", "Dr. A", self.room1, 12))
+        self.assertEqual(len(observer.events), 1)
+        self.assertFalse(self.service.has_observers)
+
+
+class TestObserverRegistry(unittest.TestCase):
+    """Test the (type, id) keyed observer registry"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.subject = ScheduleSubject()
+
+    def test_same_key_replaces_in_place(self):
+        """Test that re-attaching a recipient updates it instead of duplicating"""
+        first = StudentObserver("STU001", "John", "john@email.com")
+        lecturer = LecturerObserver("STU001", "Dr. Smith", "smith@email.com")
+        self.assertTrue(self.subject.attach(first))
+        self.assertTrue(self.subject.attach(lecturer))
+
+        updated = StudentObserver("STU001", "John Doe", "john.doe@email.com")
+        self.assertFalse(self.subject.attach(updated))
+        self.assertEqual(list(self.subject._observers), [updated, lecturer])
+        self.assertIn(first, self.subject._observers)
+
+        self.assertTrue(self.subject.detach(first))
+        self.assertFalse(self.subject.detach(updated))
+        self.assertEqual(list(self.subject._observers), [lecturer])
+
+    def test_bulk_attach_and_detach(self):
+        """Test attach_many / detach_many counts and subscription cleanup"""
+        students = [StudentObserver(f"STU{i:03d}", f"Student {i}", f"s{i}@email.com")
+                    for i in range(100)]
+        self.assertEqual(self.subject.attach_many(students), 100)
+        self.assertEqual(self.subject.attach_many(students[:10]), 0)
+        self.assertEqual(len(self.subject._observers), 100)
+
+        for student in students[:50]:
+            self.subject.subscribe(student, krs_id="KRS001")
+        self.assertEqual(self.subject.detach_many(students[25:75]), 50)
+        self.assertEqual(len(self.subject._observers), 50)
+        self.assertEqual(len(self.subject._subscriptions), 25)
+
+    def test_notify_sees_changes_after_attach(self):
+        """Test that the notify snapshot is refreshed after registry changes"""
+        recorder = RecordingObserver()
+        self.subject.notify(EventType.SCHEDULE_CREATED, {'course_name': 'A'})
+        self.subject.attach(recorder)
+        self.subject.notify(EventType.SCHEDULE_CREATED, {'course_name': 'B'})
+        self.subject.detach(recorder)
+        self.subject.notify(EventType.SCHEDULE_CREATED, {'course_name': 'C'})
+        self.assertEqual([data['course_name'] for _, data in recorder.events], ['B'])
+
+
+class TestNotificationDigest(unittest.TestCase):
+    """Test per-recipient digests with window / count coalescing"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.now = 0.0
+        self.service = SchedulingService()
+        self.room = Room("R101", "Room 101", 40)
+        self.service.add_room(self.room)
+        self.recipient = RecordingObserver()
+        self.digest = DigestObserver(self.recipient, window=60, max_events=100,
+                                     auto_flush=False, clock=lambda: self.now)
+        self.service.subscribe(self.digest, lecturer="Dr. A")
+
+    def make(self, schedule_id, hour, lecturer="Dr. A"):
+        return Schedule(schedule_id, "Course", "CS101", lecturer, DayOfWeek.MONDAY,
+                        TimeSlot(time(hour, 0), time(hour + 2, 0)), self.room, 30)
+
+    def test_session_collapses_to_latest_state(self):
+        """Test that edits on one schedule become one entry with the latest data"""
+        self.service.create_schedule(self.make("SCH001", 8))
+        self.service.create_schedule(self.make("SCH002", 16))
+        for hour in (9, 10, 11):
+            self.now += 5
+            self.service.update_schedule("SCH001", self.make("SCH001", hour))
+        self.service.delete_schedule("SCH002")
+        self.assertEqual(self.recipient.events, [])
+
+        self.now += 60
+        self.service.update_schedule("SCH001", self.make("SCH001", 14))
+        self.assertEqual(len(self.recipient.events), 1)
+        event_type, data = self.recipient.events[0]
+        self.assertEqual(event_type, EventType.NOTIFICATION_DIGEST)
+        self.assertEqual(data['received'], 7)
+        self.assertEqual([(event['event_type'], event['data']['time_slot'])
+                          for event in data['events']],
+                         [("SCHEDULE_CREATED", "14:00-16:00")])
+        self.assertEqual(self.digest.delivered, 1)
+
+    def test_conflict_detected_then_resolved_cancels(self):
+        """Test that a conflict created and fixed inside the window is not reported"""
+        self.service.create_schedule(self.make("SCH001", 8))
+        self.digest.flush()
+        self.service.create_schedule(self.make("SCH002", 9))
+        self.service.update_schedule("SCH002", self.make("SCH002", 12))
+        self.digest.flush()
+
+        event_type, data = self.recipient.events[-1]
+        self.assertEqual(event_type, EventType.NOTIFICATION_DIGEST)
+        self.assertEqual(data['conflicts_detected'], 0)
+        self.assertEqual([event['event_type'] for event in data['events']], ["SCHEDULE_CREATED"])
+
+    def test_single_event_and_count_limit(self):
+        """Test plain delivery of a lone event and flushing at max_events"""
+        self.service.create_schedule(self.make("SCH001", 8))
+        self.digest.flush()
+        self.assertEqual(self.recipient.events[0][0], EventType.SCHEDULE_CREATED)
+
+        self.digest.max_events = 3
+        for index, hour in enumerate((10, 13, 16)):
+            self.service.create_schedule(self.make(f"SCH10{index}", hour, "Dr. A"))
+        self.assertEqual(len(self.recipient.events), 2)
+        self.assertEqual(self.digest.pending, 0)
+
+    def test_lone_batch_event_keeps_conflict_counts(self):
+        """Test that a one-schedule batch with new conflicts is not flattened"""
+        self.service.create_schedule(self.make("SCH001", 8, "Dr. B"))
+        self.service.create_schedule(self.make("SCH002", 8, "Dr. C"))
+        with self.service.batch():
+            self.service.create_schedule(self.make("SCH003", 8))
+        self.digest.flush()
+
+        self.assertEqual(len(self.recipient.events), 1)
+        event_type, data = self.recipient.events[0]
+        self.assertEqual(event_type, EventType.NOTIFICATION_DIGEST)
+        self.assertEqual(data['conflicts_detected'], 2)
+        self.assertEqual([event['data']['schedule_id'] for event in data['events']], ["SCH003"])
+
+    def test_timer_flushes_idle_window(self):
+        """Test that auto_flush delivers a window nobody adds to"""
+        recipient = RecordingObserver()
+        digest = DigestObserver(recipient, window=0.05)
+        digest.update(EventType.SCHEDULE_CREATED, {'schedule_id': 'SCH001'})
+        digest.update(EventType.SCHEDULE_UPDATED, {'schedule_id': 'SCH001'})
+        for _ in range(100):
+            if recipient.events:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(len(recipient.events), 1)
+        self.assertEqual(digest.key, recipient.key)
+
+
+class TestDeliveryChannels(unittest.TestCase):
+    """Test email/SMS/push channels against the local stand-ins"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.smtp = LocalSMTPServer().start()
+        self.gateway = LocalHTTPGateway().start()
+        self.email = EmailChannel("127.0.0.1", self.smtp.port, pool_size=2,
+                                  retry=RetryPolicy(attempts=3, base_delay=0))
+        self.sms = SMSChannel(self.gateway.url + "/sms", retry=RetryPolicy(base_delay=0))
+        self.push = PushChannel(self.gateway.url + "/push", retry=RetryPolicy(base_delay=0))
+
+    def tearDown(self):
+        """Close channels and servers"""
+        for closable in (self.email, self.sms, self.push, self.smtp, self.gateway):
+            (closable.stop if hasattr(closable, 'stop') else closable.close)()
+
+    def test_observer_emails_over_pooled_connection(self):
+        """Test that notifications are emailed and the SMTP connection is reused"""
+        service = SchedulingService()
+        room = Room("R101", "Room 101", 40)
+        service.add_room(room)
+        service.attach(StudentObserver("STU001", "John", "john@university.edu",
+                                       channels=[self.email]))
+        for hour in (8, 11, 14):
+            service.create_schedule(Schedule(
+                f"SCH{hour:03d}", "Algorithms", "CS201", "Dr. A", DayOfWeek.MONDAY,
+                TimeSlot(time(hour, 0), time(hour + 2, 0)), room, 30))
+
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(self.smtp.messages[0]['to'], ["<john@university.edu>"])
+        body = email.message_from_bytes(self.smtp.messages[0]['data'])
+        self.assertEqual(body.get_payload(decode=True), b"New schedule created: Algorithms")
+
+    def test_transient_errors_retried_permanent_not(self):
+        """Test retry on 4xx and immediate failure on 5xx"""
+        self.smtp.fail_next(2)
+        self.assertTrue(self.email.send("a@university.edu", "Subject", "Body"))
+        self.assertEqual(self.email.stats['retried'], 2)
+
+        self.smtp.fail_next(1, 550)
+        self.assertFalse(self.email.send("a@university.edu", "Subject", "Body"))
+        self.assertEqual(self.email.stats, {'sent': 1, 'failed': 1, 'retried': 2, 'skipped': 0})
+        self.smtp.fail_next(3)
+        self.assertFalse(self.email.send("a@university.edu", "Subject", "Body"))
+        self.assertEqual(len(self.smtp.messages), 1)
+
+    def test_failures_never_reach_the_service(self):
+        """Test that unexpected errors and rate limit waits fail the message, not the write"""
+        service = SchedulingService()
+        room = Room("R101", "Room 101", 40)
+        service.add_room(room)
+        # An address that cannot be encoded makes MIMEText/smtplib raise, not DeliveryError
+        service.attach(StudentObserver("STU001", "John", "jöhn\udcff@university.edu",
+                                       channels=[self.email]))
+        self.assertTrue(service.create_schedule(Schedule(
+            "SCH001", "Algorithms", "CS201", "Dr. A", DayOfWeek.MONDAY,
+            TimeSlot(time(8, 0), time(10, 0)), room, 30)))
+        self.assertEqual(self.email.stats['failed'], 1)
+        self.assertEqual(self.email.stats['retried'], 0)
+
+        now = [0.0]
+        limited = SMSChannel(self.gateway.url + "/sms", rate=1, rate_timeout=0.5)
+        limited.rate_limit = TokenBucket(rate=1, clock=lambda: now[0],
+                                         sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+        self.assertTrue(limited.send("+628111", "", "first"))
+        self.assertFalse(limited.send("+628111", "", "second"))
+        self.assertEqual(limited.stats, {'sent': 1, 'failed': 1, 'retried': 0, 'skipped': 0})
+        limited.close()
+
+    def test_sms_and_push_gateway(self):
+        """Test HTTP gateway payloads, 503 retry and skipping observers without an address"""
+        lecturer = LecturerObserver("LEC001", "Dr. Smith", "smith@university.edu",
+                                    phone="+628111", channels=[self.sms, self.push])
+        self.gateway.fail_next(1)
+        lecturer.update(EventType.SCHEDULE_DELETED, {'course_name': 'Algorithms'})
+
+        self.assertEqual(self.gateway.requests, [
+            {'path': '/sms', 'body': {'to': '+628111',
+                                      'message': 'Your class has been cancelled: Algorithms'}}])
+        self.assertEqual(self.sms.stats['retried'], 1)
+        self.assertEqual(self.push.stats['skipped'], 1)
+
+    def test_token_bucket_and_jittered_backoff(self):
+        """Test the rate limit with a fake clock and the backoff bounds"""
+        now = [0.0]
+        bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0],
+                             sleep=lambda seconds: now.__setitem__(0, now[0] + seconds))
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.acquire(timeout=0.05))
+        self.assertTrue(bucket.acquire())
+        self.assertAlmostEqual(now[0], 0.1)
+
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.5, rng=random.Random(1))
+        delays = [policy.delay(retry) for retry in range(6) for _ in range(50)]
+        self.assertTrue(all(0 <= delay <= 0.5 for delay in delays))
+        self.assertGreater(len(set(delays)), 250)
+
+
+class TestEventLog(unittest.TestCase):
+    """Test the segmented event log and offset-based replay"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.schedules = make_random_schedules(30, seed=31)
+        self.service = SchedulingService()
+        for schedule in self.schedules:
+            schedule.num_students = min(schedule.num_students, schedule.room.capacity)
+            self.service.add_room(schedule.room)
+
+    def open_log(self, **options):
+        log = EventLog(self.directory, sync_interval=0, **options).open()
+        self.addCleanup(log.close)
+        self.service.event_log = log
+        return log
+
+    def move(self, schedule, hour):
+        return Schedule(schedule.schedule_id, schedule.course_name, schedule.course_code,
+                        schedule.lecturer_name, DayOfWeek.SATURDAY,
+                        TimeSlot(time(hour, 0), time(hour + 1, 0)), schedule.room,
+                        schedule.num_students)
+
+    def test_offline_consumer_resumes_after_restart(self):
+        """Test that replay delivers exactly what live observers saw, then only new events"""
+        live = RecordingObserver()
+        self.service.attach(live)
+        log = self.open_log()
+        for schedule in self.schedules[:20]:
+            self.service.create_schedule(schedule)
+        with self.service.batch():
+            self.service.create_schedules_bulk(self.schedules[20:])
+        log.close()
+
+        log = self.open_log()
+        offline = RecordingObserver()
+        self.assertEqual(log.replay(offline, consumer="mobile"), len(live.events))
+        self.assertEqual(offline.events, live.events)
+
+        self.service.delete_schedule(self.schedules[0].schedule_id)
+        log.replay(offline, consumer="mobile")
+        self.assertEqual(offline.events, live.events)
+        self.assertEqual(EventLog(self.directory).open().committed("mobile"), log.next_offset)
+
+    def test_filter_limit_and_zero_copy_payload(self):
+        """Test event type filtering, partial replay commits and payload views"""
+        log = self.open_log()
+        for schedule in self.schedules:
+            self.service.create_schedule(schedule)
+        conflicts = list(log.read(event_types=[EventType.CONFLICT_DETECTED]))
+        self.assertEqual(len(conflicts), len(self.service.conflicts))
+        self.assertIsInstance(conflicts[0].payload, memoryview)
+        self.assertIn('schedule_1', conflicts[0].data)
+
+        recorder = RecordingObserver()
+        resume_at = log.replay(recorder, consumer="sms", limit=5)
+        self.assertEqual(len(recorder.events), 5)
+        self.assertEqual(log.committed("sms"), resume_at)
+        log.replay(recorder, consumer="sms")
+        self.assertEqual(len(recorder.events), log.next_offset)
+
+    def test_page_resumes_where_the_read_stopped(self):
+        """Test that read_page does not skip events appended while it read"""
+        log = self.open_log()
+        for schedule in self.schedules[:5]:
+            self.service.create_schedule(schedule)
+        head = log.next_offset
+        events, next_offset = log.read_page(0, 2)
+        self.assertEqual(next_offset, events[-1].offset + 1)
+
+        segment_class = type(log._segments[-1])
+        buffer = segment_class.buffer
+
+        def append_during_read(segment, size):
+            if log.next_offset == head:
+                self.service.delete_schedule(self.schedules[0].schedule_id)
+            return buffer(segment, size)
+
+        deleted = [EventType.SCHEDULE_DELETED]
+        with mock.patch.object(segment_class, 'buffer', append_during_read):
+            events, next_offset = log.read_page(0, 100, deleted)
+        self.assertEqual((events, next_offset), ([], head))
+        self.assertGreater(log.next_offset, head)
+        events, next_offset = log.read_page(next_offset, 100, deleted)
+        self.assertEqual([event.data['schedule_id'] for event in events],
+                         [self.schedules[0].schedule_id])
+        self.assertEqual(next_offset, log.next_offset)
+
+    def test_torn_tail_is_cut_on_open(self):
+        """Test that a partial record left by a crash is dropped"""
+        log = self.open_log()
+        for schedule in self.schedules[:3]:
+            self.service.create_schedule(schedule)
+        count = log.next_offset
+        log.close()
+        with open(log.segments()[-1], 'ab') as segment:
+            segment.write(b"\x00\x01partial record")
+
+        log = self.open_log()
+        self.assertEqual(len(list(log.read())), count)
+        self.assertEqual(log.append(EventType.SCHEDULE_DELETED, {'schedule_id': 'X'}), count)
+        log.close()
+        self.assertEqual(len(list(self.open_log().read())), count + 1)
+
+    def test_compaction_keeps_latest_state_and_truncate(self):
+        """Test compaction, sparse offsets and truncation behind consumers"""
+        log = self.open_log(segment_bytes=2048)
+        target = self.schedules[0]
+        self.service.create_schedule(target)
+        for hour in range(7, 19):
+            self.service.update_schedule(target.schedule_id, self.move(target, hour))
+        for schedule in self.schedules[1:]:
+            self.service.create_schedule(schedule)
+        self.assertGreater(len(log.segments()), 3)
+
+        stats = log.compact()
+        self.assertGreater(stats['events_removed'], 0)
+        events = list(log.read())
+        offsets = [event.offset for event in events]
+        self.assertEqual(offsets, sorted(set(offsets)))
+        about_target = [event for event in events
+                        if event.data.get('schedule_id') == target.schedule_id]
+        self.assertEqual(len(about_target), 1)
+        self.assertEqual(about_target[0].event_type, EventType.SCHEDULE_UPDATED)
+        self.assertEqual(about_target[0].data['time_slot'], "18:00-19:00")
+
+        log.commit("dashboard", offsets[len(offsets) // 2])
+        removed = log.truncate()
+        self.assertGreater(removed, 0)
+        self.assertLessEqual(log.first_offset, offsets[len(offsets) // 2])
+        self.assertGreater(log.first_offset, 0)
+
+    def test_failed_append_does_not_fail_the_write(self):
+        """Test that an event log IO error is logged while the change and delivery go through"""
+        live = RecordingObserver()
+        self.service.attach(live)
+        log = self.open_log()
+        with mock.patch.object(log, 'append', side_effect=OSError(5, "Input/output error")):
+            with self.assertLogs('schedule_system', 'ERROR'):
+                self.assertTrue(self.service.create_schedule(self.schedules[0]))
+        self.assertIn(self.schedules[0].schedule_id, self.service.schedules)
+        self.assertEqual([event_type for event_type, _ in live.events], [EventType.SCHEDULE_CREATED])
+
+        self.service.create_schedule(self.schedules[1])
+        self.assertEqual([event.data['schedule_id'] for event in log.read()],
+                         [self.schedules[1].schedule_id])
+
+
+class TestEventStream(unittest.TestCase):
+    """Test the SSE broadcaster behind GET /api/events/stream"""
+
+    def setUp(self):
+        """Setup test fixtures"""
+        self.service = SchedulingService()
+        self.room1 = Room("R101", "Room 101", 40)
+        self.room2 = Room("R102", "Room 102", 40)
+        self.service.add_room(self.room1)
+        self.service.add_room(self.room2)
+        self.broadcaster = EventBroadcaster(history=5, max_queue=10, heartbeat=0.01)
+        self.service.attach(self.broadcaster)
+
+    def make(self, schedule_id, lecturer, room, hour):
+        return Schedule(schedule_id, "Course", "CS101", lecturer, DayOfWeek.MONDAY,
+                        TimeSlot(time(hour, 0), time(hour + 1, 0)), room, 30)
+
+    @staticmethod
+    def parse(frames):
+        """(id, event, data) of every frame in a chunk of the stream"""
+        events = []
+        for block in b"".join(frames).decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines()
+                          if line and not line.startswith(":") and ": " in line)
+            if 'event' in fields:
+                events.append((parse_event_id(fields.get('id', '0'))[1], fields['event'],
+                               json.loads(fields['data'])))
+        return events
+
+    def test_filters_route_frames(self):
+        """Test room, lecturer and event type filters"""
+        by_room = self.broadcaster.connect(room_id="R102")
+        by_lecturer = self.broadcaster.connect(lecturer="dr. a",
+                                               event_types=[EventType.SCHEDULE_CREATED])
+        everything = self.broadcaster.connect()
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+        self.service.create_schedule(self.make("SCH002", "Dr. B", self.room2, 10))
+        self.service.delete_schedule("SCH001")
+
+        self.assertEqual([(event, data['schedule_id']) for _, event, data
+                          in self.parse(by_room.take(0))], [("SCHEDULE_CREATED", "SCH002")])
+        self.assertEqual([(event, data['schedule_id']) for _, event, data
+                          in self.parse(by_lecturer.take(0))], [("SCHEDULE_CREATED", "SCH001")])
+        self.assertEqual([event_id for event_id, _, _ in self.parse(everything.take(0))],
+                         [1, 2, 3])
+
+    def test_last_event_id_replay_and_resync(self):
+        """Test catching up after a reconnect and resync once history is gone"""
+        for index in range(4):
+            self.service.create_schedule(self.make(f"SCH00{index}", "Dr. A", self.room1, 8 + index))
+        epoch = self.broadcaster.epoch
+        resumed = self.broadcaster.connect(last_event_id=f"{epoch}-2")
+        self.assertEqual([event_id for event_id, _, _ in self.parse(resumed.take(0))], [3, 4])
+
+        for index in range(4, 10):
+            self.service.create_schedule(self.make(f"SCH00{index}", "Dr. A", self.room1, 8 + index))
+        stale = self.broadcaster.connect(last_event_id=f"{epoch}-2")
+        self.assertEqual([event for _, event, _ in self.parse(stale.take(0))], ["resync"])
+        ahead = self.broadcaster.connect(last_event_id=f"{epoch}-500")
+        self.assertEqual([event for _, event, _ in self.parse(ahead.take(0))], ["resync"])
+
+    def test_ids_from_another_process_resync(self):
+        """Test that ids of a restarted server (another epoch, or none) never replay"""
+        self.service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+        restarted = EventBroadcaster(history=5, max_queue=10)
+        self.assertNotEqual(restarted.epoch, self.broadcaster.epoch)
+        self.service.attach(restarted)
+        self.service.create_schedule(self.make("SCH002", "Dr. A", self.room1, 9))
+        self.assertEqual(restarted.last_event_id, f"{restarted.epoch}-1")
+
+        for last_event_id in (self.broadcaster.last_event_id, "1", "0"):
+            client = restarted.connect(last_event_id=last_event_id)
+            frames = self.parse(client.take(0))
+            self.assertEqual([(event, data['reason']) for _, event, data in frames],
+                             [("resync", "server restarted")])
+        with self.assertRaises(ValueError):
+            restarted.connect(last_event_id=f"{restarted.epoch}-x")
+
+    def test_slow_client_dropped_and_stream_ends(self):
+        """Test the bounded queue, heartbeats and cleanup when a stream ends"""
+        slow = self.broadcaster.connect()
+        stream = self.broadcaster.stream(slow)
+        self.assertEqual(next(stream), b"retry: 3000\n\n")
+        self.assertEqual(next(stream), b": keep-alive\n\n")
+        for index in range(11):
+            self.service.create_schedule(self.make(f"SCH{index:03d}", f"Dr. {index}",
+                                                   self.room1 if index % 2 else self.room2,
+                                                   7 + index))
+        self.assertTrue(slow.overflowed)
+        self.assertEqual(self.broadcaster.clients, 0)
+        self.assertEqual(len(self.parse([next(stream)])), 10)
+        self.assertEqual(list(stream), [])
+        self.assertEqual(self.broadcaster.stats['overflowed'], 1)
+
+    def test_inline_behind_async_dispatcher(self):
+        """Test that the broadcaster is fed in commit order even when observers are queued"""
+        dispatcher = AsyncDispatcher(workers=1)
+        self.addCleanup(dispatcher.close, 5)
+        service = SchedulingService(dispatcher=dispatcher)
+        service.add_room(self.room1)
+        gated = GatedObserver()
+        broadcaster = EventBroadcaster()
+        service.attach(gated)
+        service.attach(broadcaster)
+        client = broadcaster.connect()
+        service.create_schedule(self.make("SCH001", "Dr. A", self.room1, 8))
+
+        self.assertEqual(broadcaster.sequence, 1)
+        self.assertEqual(len(self.parse(client.take(0))), 1)
+        self.assertEqual(gated.events, [])
+        gated.gate.set()
+
+    def test_concurrent_subscribers(self):
+        """Test 200 concurrent streams each receiving every event in order"""
+        broadcaster = EventBroadcaster(max_queue=1000, heartbeat=0.05)
+        self.service.attach(broadcaster)
+        received = {}
+
+        def consume(name):
+            client = broadcaster.connect()
+            ids = received[name] = []
+            for chunk in broadcaster.stream(client):
+                ids.extend(event_id for event_id, _, _ in self.parse([chunk]))
+                if len(ids) >= 10:
+                    return
+
+        threads = [threading.Thread(target=consume, args=(index,)) for index in range(200)]
+        for thread in threads:
+            thread.start()
+        while broadcaster.clients < 200:
+            threading.Event().wait(0.01)
+        for index in range(10):
+            self.service.create_schedule(self.make(f"SCH{index:03d}", "Dr. A", self.room1, 7 + index))
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(len(received), 200)
+        self.assertTrue(all(ids == list(range(1, 11)) for ids in received.values()))
+        self.assertEqual(broadcaster.clients, 0)
+
+
+@unittest.skipIf(importlib.util.find_spec('flask') is None, "Flask is not installed")
+class TestEventStreamEndpoint(unittest.TestCase):
+    """Test GET /api/events/stream through Flask's test client"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.api = importlib.import_module('api')
+        cls.room = Room("R-SSE", "Stream Room", 40)
+        cls.api.service.add_room(cls.room)
+
+    def setUp(self):
+        self.client = self.api.app.test_client()
+
+    def create(self, schedule_id, hour):
+        self.assertTrue(self.api.service.create_schedule(Schedule(
+            schedule_id, "Course", "CS-SSE", f"Dr. {schedule_id}", DayOfWeek.SUNDAY,
+            TimeSlot(time(hour, 0), time(hour + 1, 0)), self.room, 10)))
+
+    def open_stream(self, *args, **kwargs):
+        response = self.client.get(*args, buffered=False, **kwargs)
+        self.addCleanup(response.close)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b"retry: 3000\n\n")
+        return response, chunks
+
+    def test_filtered_stream(self):
+        """Test that a filtered stream receives matching events and ends cleanly"""
+        clients = self.api.broadcaster.clients
+        response, chunks = self.open_stream(
+            '/api/events/stream?room_id=R-SSE&types=SCHEDULE_CREATED')
+        self.create("SSE001", 8)
+        frames = TestEventStream.parse([next(chunks)])
+        self.assertEqual([(event, data['schedule_id']) for _, event, data in frames],
+                         [("SCHEDULE_CREATED", "SSE001")])
+        response.close()
+        self.assertEqual(self.api.broadcaster.clients, clients)
+
+    def test_resume_from_dashboard_event_id(self):
+        """Test that the event_id of the dashboard summary resumes with nothing lost"""
+        summary = self.client.get('/api/dashboard/summary').get_json()['data']
+        self.create("SSE002", 10)  # committed before the dashboard connects
+        _, chunks = self.open_stream('/api/events/stream?room_id=R-SSE',
+                                     headers={'Last-Event-ID': summary['event_id']})
+        frames = TestEventStream.parse([next(chunks)])
+        self.assertEqual(frames[0][0], parse_event_id(summary['event_id'])[1] + 1)
+        self.assertEqual(frames[0][2]['schedule_id'], "SSE002")
+
+    def test_summary_does_not_wait_for_writers(self):
+        """Test that the summary and its event_id come from the snapshot, not the lock"""
+        self.create("SSE003", 12)
+        inside, release = threading.Event(), threading.Event()
+
+        def writer():
+            with self.api.service.lock.write_locked():
+                inside.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            self.assertTrue(inside.wait(5))
+            summary = self.client.get('/api/dashboard/summary').get_json()['data']
+            self.assertTrue(thread.is_alive())
+        finally:
+            release.set()
+            thread.join(5)
+        self.assertEqual(summary['event_id'], self.api.broadcaster.last_event_id)
+        self.assertEqual(summary['version'], self.api.service.version)
+
+    def test_invalid_query_rejected(self):
+        """Test the 400 responses for a bad event type or Last-Event-ID"""
+        self.assertEqual(self.client.get('/api/events/stream?types=BOGUS').status_code, 400)
+        self.assertEqual(self.client.get('/api/events/stream',
+                                         headers={'Last-Event-ID': 'x'}).status_code, 400)
+
+
 class TestObserverPattern(unittest.TestCase):
     """Test Observer Pattern Implementation"""
 
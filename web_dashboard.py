@@ -486,7 +486,10 @@ DASHBOARD_HTML = """
                 }
                 
                 const response = await fetch(`http://localhost:5000/api${endpoint}`, options);
-                return await response.json();
+                const result = await response.json();
+                // Snapshot version of list endpoints (see listSchedules)
+                result.version = Number(response.headers.get('X-Schedule-Version'));
+                return result;
             } catch (error) {
                 return { status: 'error', message: error.message };
             }
@@ -503,8 +506,10 @@ DASHBOARD_HTML = """
                 document.getElementById('stat-rate').textContent = data.conflict_rate;
                 
                 showResult('dashboard-result', JSON.stringify(data, null, 2), 'success');
+                return data;
             } else {
                 showResult('dashboard-result', 'Error: ' + result.message, 'error');
+                return null;
             }
         }
         
@@ -550,19 +555,30 @@ DASHBOARD_HTML = """
             
             const result = await apiCall('POST', '/schedules', data);
             showResult('schedules-result', JSON.stringify(result, null, 2), result.status);
-            listSchedules();
+            if (!streamConnected) {
+                listSchedules();
+            }
         }
         
         async function listSchedules() {
             const result = await apiCall('GET', '/schedules');
             if (result.status === 'success') {
-                let html = '<table><tr><th>Code</th><th>Course</th><th>Lecturer</th><th>Day</th><th>Time</th><th>Room</th><th>Students</th></tr>';
+                schedules.clear();
+                result.data.forEach(sched => schedules.set(sched.schedule_id, sched));
+                document.getElementById('stat-schedules').textContent = schedules.size;
+                let html = '<table id="schedules-rows"><tr><th>Code</th><th>Course</th><th>Lecturer</th><th>Day</th><th>Time</th><th>Room</th><th>Students</th></tr>';
                 result.data.forEach(sched => {
-                    html += `<tr><td>${sched.course_code}</td><td>${sched.course_name}</td><td>${sched.lecturer_name}</td><td>${sched.day}</td><td>${sched.time_slot}</td><td>${sched.room_id}</td><td>${sched.num_students}</td></tr>`;
+                    html += `<tr data-id="${sched.schedule_id}">${scheduleCells(sched)}</tr>`;
                 });
                 html += '</table>';
                 document.getElementById('schedules-table').innerHTML = html;
+                return result.version;
             }
+            return null;
+        }
+        
+        function scheduleCells(sched) {
+            return `<td>${sched.course_code}</td><td>${sched.course_name}</td><td>${sched.lecturer_name}</td><td>${sched.day}</td><td>${sched.time_slot}</td><td>${sched.room_id}</td><td>${sched.num_students}</td>`;
         }
         
         // Conflicts
@@ -602,11 +618,110 @@ DASHBOARD_HTML = """
             document.getElementById(elementId.replace('-result', '-content')).textContent = content;
         }
         
+        // Live updates: apply each change from the event stream to the
+        // page instead of re-fetching every table
+        const schedules = new Map();
+        let streamConnected = false;
+        let source = null;
+        
+        function setStreamStatus(connected) {
+            streamConnected = connected;
+            const status = document.getElementById('status');
+            status.textContent = connected ? '🟢 Live' : '🔴 Reconnecting...';
+            status.classList.toggle('error', !connected);
+        }
+        
+        function adjustStat(id, delta) {
+            const element = document.getElementById(id);
+            const value = parseInt(element.textContent);
+            if (!isNaN(value)) {
+                element.textContent = Math.max(value + delta, 0);
+            }
+        }
+        
+        function applyScheduleEvent(eventType, sched) {
+            const table = document.getElementById('schedules-rows');
+            const row = table && table.querySelector(`tr[data-id="${sched.schedule_id}"]`);
+            // Replaying a change the table already shows is harmless: rows are
+            // keyed by schedule id and the count is the number of rows
+            if (eventType === 'SCHEDULE_DELETED') {
+                schedules.delete(sched.schedule_id);
+                if (row) {
+                    row.remove();
+                }
+            } else {
+                schedules.set(sched.schedule_id, sched);
+                if (row) {
+                    row.innerHTML = scheduleCells(sched);
+                } else if (table) {
+                    const newRow = table.insertRow();
+                    newRow.dataset.id = sched.schedule_id;
+                    newRow.innerHTML = scheduleCells(sched);
+                }
+            }
+            document.getElementById('stat-schedules').textContent = schedules.size;
+        }
+        
+        function applyEvent(eventType, data) {
+            switch (eventType) {
+                case 'SCHEDULE_CREATED':
+                case 'SCHEDULE_UPDATED':
+                case 'SCHEDULE_DELETED':
+                    applyScheduleEvent(eventType, data);
+                    break;
+                case 'BATCH_APPLIED':
+                    data.events.forEach(event => applyScheduleEvent(event.event_type, event.data));
+                    adjustStat('stat-conflicts', data.conflicts_detected.total_conflicts - data.conflicts_resolved.total_conflicts);
+                    break;
+                case 'CONFLICT_DETECTED':
+                    adjustStat('stat-conflicts', 1);
+                    break;
+                case 'SCHEDULE_RESOLVED':
+                    adjustStat('stat-conflicts', -1);
+                    break;
+            }
+        }
+        
+        function connectStream(eventId) {
+            // Resume right after the summary that was loaded, so no change
+            // between loading it and connecting is lost
+            const query = eventId === null || eventId === undefined ? '' : `?last_event_id=${encodeURIComponent(eventId)}`;
+            source = new EventSource(`http://localhost:5000/api/events/stream${query}`);
+            const eventTypes = ['SCHEDULE_CREATED', 'SCHEDULE_UPDATED', 'SCHEDULE_DELETED',
+                                'CONFLICT_DETECTED', 'SCHEDULE_RESOLVED', 'BATCH_APPLIED'];
+            eventTypes.forEach(eventType => {
+                source.addEventListener(eventType, message => applyEvent(eventType, JSON.parse(message.data)));
+            });
+            // Missed more than the server keeps, or the server restarted (the
+            // epoch part of the event ids changed): reload everything
+            source.addEventListener('resync', () => {
+                source.close();
+                startLiveUpdates();
+            });
+            source.onopen = () => setStreamStatus(true);
+            source.onerror = () => setStreamStatus(false);
+        }
+        
+        async function startLiveUpdates() {
+            const summary = await loadDashboard();
+            if (summary === null) {
+                connectStream(null);
+                return;
+            }
+            // The stream resumes after the summary's snapshot, so the table
+            // must be from that snapshot or a later one (replayed events that
+            // it already has are applied idempotently)
+            let version = await listSchedules();
+            while (version !== null && version < summary.version) {
+                version = await listSchedules();
+            }
+            connectStream(summary.event_id);
+        }
+        
         // Initial load
         window.addEventListener('load', () => {
-            loadDashboard();
             listRooms();
-            listSchedules();
+            startLiveUpdates();
         });
     </script>
 </body>